@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the per-access overhead of the property factories.
+
+Each property of a test instrument is read or written many times against a
+loopback communicator, and the average time per access is printed::
+
+    $ python doc/examples/ex_property_benchmark.py
+
+The timings are informational only, as they depend on the machine. The work
+done on each access is bounded deterministically by the unit tests in
+instruments/tests/test_property_factories/test_property_overhead.py.
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+from __future__ import print_function
+
+from enum import Enum
+from io import BytesIO
+import timeit
+
+import quantities as pq
+
+from instruments import Instrument
+from instruments.util_fns import (
+    bool_property, enum_property, int_property, string_property,
+    unitful_property, unitless_property
+)
+
+# CONSTANTS ##################################################################
+
+# Number of accesses timed for each property.
+ACCESSES = 2000
+
+# BENCHMARKS #################################################################
+
+
+class BenchMode(Enum):
+    a = "A"
+    b = "B"
+
+
+class BenchInstrument(Instrument):
+    boolean = bool_property("BOOL", "1", "0")
+    enum = enum_property("ENUM", BenchMode)
+    integer = int_property("INT")
+    unitless = unitless_property("UNITLESS")
+    unitful = unitful_property("UNITFUL", pq.volt)
+    string = string_property("STRING")
+
+
+# Property names, and the reply the instrument gives when each is queried.
+GET_BENCHMARKS = [
+    ("boolean", b"1"),
+    ("enum", b"A"),
+    ("integer", b"3"),
+    ("unitless", b"1.5"),
+    ("unitful", b"+1.500000E+00"),
+    ("string", b'"foo"'),
+]
+
+# Property names, and the value written to each.
+SET_BENCHMARKS = [
+    ("integer", 3),
+    ("unitful", 1 * pq.volt),
+]
+
+
+def time_get(prop, reply, accesses=ACCESSES):
+    """
+    Returns the average time, in seconds, taken to read the property ``prop``
+    of a `BenchInstrument` attached to a `LoopbackCommunicator`.
+    """
+    stdin = BytesIO((reply + b"\n") * accesses)
+    inst = BenchInstrument.open_test(stdin, BytesIO())
+    return timeit.timeit(
+        lambda: getattr(inst, prop), number=accesses
+    ) / accesses
+
+
+def time_set(prop, value, accesses=ACCESSES):
+    """
+    Returns the average time, in seconds, taken to write ``value`` to the
+    property ``prop`` of a `BenchInstrument` attached to a
+    `LoopbackCommunicator`.
+    """
+    inst = BenchInstrument.open_test(BytesIO(), BytesIO())
+    return timeit.timeit(
+        lambda: setattr(inst, prop, value), number=accesses
+    ) / accesses
+
+
+if __name__ == "__main__":
+    for name, reply in GET_BENCHMARKS:
+        elapsed = time_get(name, reply)
+        print("get {:<10} {:8.2f} us".format(name, elapsed * 1e6))
+    for name, val in SET_BENCHMARKS:
+        elapsed = time_set(name, val)
+        print("set {:<10} {:8.2f} us".format(name, elapsed * 1e6))
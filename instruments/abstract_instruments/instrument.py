@@ -14,6 +14,7 @@ from __future__ import unicode_literals
 
 import os
 import collections
+import contextlib
 import socket
 
 from builtins import map
@@ -44,6 +45,8 @@ from instruments.abstract_instruments.comm import (
     USBTMCCommunicator, VXI11Communicator, serial_manager
 )
 from instruments.errors import AcknowledgementError, PromptError
+from instruments.error_policy import ErrorCheckMode, ErrorPolicy
+from instruments.property_cache import PropertyCache
 
 # CONSTANTS ###################################################################
 
@@ -66,6 +69,10 @@ class Instrument(object):
     connections via the supported hardware channels.
     """
 
+    #: How errors are checked for by default, see `Instrument.error_policy`.
+    #: Drivers which implement `Instrument._error_check` may change this.
+    _default_error_check_mode = ErrorCheckMode.disabled
+
     def __init__(self, filelike):
         # Check to make sure filelike is a subclass of AbstractCommunicator
         if isinstance(filelike, AbstractCommunicator):
@@ -80,6 +87,10 @@ class Instrument(object):
 
         self._prompt = None
         self._terminator = "\n"
+        self._property_cache = PropertyCache()
+        self._raw_numeric = False
+        self._error_policy = ErrorPolicy(self._default_error_check_mode)
+        self._proxy_instances = {}
 
     # COMMAND-HANDLING METHODS #
 
@@ -93,6 +104,8 @@ class Instrument(object):
         :param str cmd: String containing the command to
             be sent.
         """
+        if str(cmd).lstrip().upper().startswith(("*RST", "*RCL")):
+            self._settings_reset()
         self._file.sendcmd(str(cmd))
         ack_expected_list = self._ack_expected(cmd)
         if not isinstance(ack_expected_list, (list, tuple)):
@@ -151,6 +164,179 @@ class Instrument(object):
                 )
         return value
 
+    def invalidate_cache(self, name=None):
+        """
+        Discard the cached value of a property, so that it is queried from the
+        instrument the next time it is read. This is needed after a setting
+        has been changed outside of InstrumentKit, for example from the front
+        panel.
+
+        :param str name: Name of the property, or the command name it was
+            created with. If `None`, all cached values are discarded.
+        """
+        if name is not None:
+            prop = getattr(type(self), name, None)
+            if isinstance(prop, property):
+                name = getattr(prop.fget, "cache_key", name)
+        self._property_cache.invalidate(name)
+
+    def _settings_reset(self):
+        """
+        Discards cached settings, as is needed whenever the instrument
+        returns to its default or saved settings. This is done automatically
+        when ``*RST`` or ``*RCL`` is sent with `Instrument.sendcmd`, and
+        should be called by drivers whose reset methods use other commands.
+        """
+        self._property_cache.reset()
+
+    # ERROR CHECKING #
+
+    def _error_check(self):
+        """
+        Checks the instrument for errors, raising an exception if any are
+        found. Drivers supporting `Instrument.error_policy` override this
+        method. By default, instruments are taken not to report errors, so
+        there is nothing to check.
+        """
+
+    def _error_pending(self):
+        """
+        Returns whether the instrument reports that an error has occurred,
+        using a cheaper query than a full check, such as a status byte.
+        Drivers supporting `~instruments.error_policy.ErrorCheckMode.status`
+        override this method. By default, `True` is returned, such that a
+        full check is made.
+
+        :rtype: `bool`
+        """
+        return True
+
+    def _command_checked(self, cmd):
+        """
+        Records that a command whose errors should be checked for has been
+        sent, and checks for errors if the error policy says they are due.
+
+        :param str cmd: The command that was sent.
+        """
+        policy = self._error_policy
+        if not policy.record(cmd):
+            return
+        if policy.mode is ErrorCheckMode.status:
+            policy.checking = True
+            try:
+                error_pending = self._error_pending()
+            finally:
+                policy.checking = False
+            if not error_pending:
+                policy.pending = []
+                return
+        self.check_errors()
+
+    def check_errors(self):
+        """
+        Checks the instrument for errors now, regardless of the error policy.
+        If an error is found, the exception raised has the commands sent
+        since the last check in its ``commands`` attribute, such that the
+        error can be attributed to the commands that may have caused it. The
+        first of these, which is the earliest command that may have caused
+        the error, is also given by its ``command`` attribute, or is `None`
+        if no commands were sent since the last check.
+
+        Instruments whose drivers do not support checking for errors are
+        taken to have none.
+        """
+        policy = self._error_policy
+        commands, policy.pending = policy.pending, []
+        policy.checking = True
+        try:
+            self._error_check()
+        except Exception as err:
+            err.commands = commands
+            err.command = commands[0] if commands else None
+            raise
+        finally:
+            policy.checking = False
+
+    @contextlib.contextmanager
+    def deferred_error_checking(self):
+        """
+        Context manager which defers checking for errors until the end of a
+        block of commands, restoring the previous error policy afterwards.
+        If the block raises an exception, errors are not checked for and the
+        commands awaiting a check are discarded, so that they are not blamed
+        for a later error.
+
+        Example usage:
+
+        >>> with inst.deferred_error_checking(): # doctest: +SKIP
+        ...     for position in positions:
+        ...         inst.axis[0].move(position)
+        """
+        policy = self._error_policy
+        previous = policy.mode
+        policy.mode = ErrorCheckMode.deferred
+        completed = False
+        try:
+            yield self
+            completed = True
+        finally:
+            policy.mode = previous
+            if not completed:
+                policy.pending = []
+        if policy.pending:
+            self.check_errors()
+
+    @contextlib.contextmanager
+    def raw_numeric_mode(self):
+        """
+        Context manager which puts the instrument into raw numeric mode for
+        the duration of a block, restoring the previous mode afterwards.
+        See `Instrument.raw_numeric`.
+
+        Example usage:
+
+        >>> with inst.raw_numeric_mode(): # doctest: +SKIP
+        ...     samples = [inst.voltage for _ in range(1000)]
+        """
+        previous = self._raw_numeric
+        self._raw_numeric = True
+        try:
+            yield self
+        finally:
+            self._raw_numeric = previous
+
+    def property_units(self, name):
+        """
+        Gets the units of a property created by
+        `~instruments.util_fns.unitful_property`, which are the units of the
+        bare magnitudes returned by that property in raw numeric mode.
+
+        :param str name: Name of the property.
+        :rtype: `~quantities.UnitQuantity`
+        :raises ValueError: If ``name`` is not a readable unitful property.
+        """
+        prop = getattr(type(self), name, None)
+        units = getattr(getattr(prop, "fget", None), "units", None)
+        if units is None:
+            raise ValueError("{} is not a readable unitful "
+                             "property.".format(name))
+        return units
+
+    def _measured(self, value, units):
+        """
+        Attaches units to a value measured by a driver method, unless the
+        instrument is in raw numeric mode, in which case ``value`` is
+        returned unchanged. Drivers which must query the instrument to find
+        the units should skip that query in raw numeric mode, passing `None`
+        as ``units`` instead.
+
+        :param value: Magnitude, or sequence of magnitudes, that was measured.
+        :param units: Units of ``value``.
+        """
+        if self._raw_numeric:
+            return value
+        return value * units
+
     def read(self, size=-1):
         """
         Read the last line.
@@ -165,6 +351,84 @@ class Instrument(object):
 
     # PROPERTIES #
 
+    @property
+    def property_cache(self):
+        """
+        Gets the cache of property values for this instrument. When enabled,
+        reading a property created by one of the property factories returns
+        its last known value instead of querying the instrument, unless the
+        property was declared as
+        `~instruments.property_cache.CacheMode.volatile`.
+
+        Cached settings are discarded when the instrument is reset, for
+        example by a ``*RST`` command, when they expire, or when invalidated
+        with `Instrument.invalidate_cache`.
+
+        Example usage:
+
+        >>> inst.property_cache.enabled = True # doctest: +SKIP
+        >>> inst.property_cache.ttl = 10 * pq.second # doctest: +SKIP
+
+        :rtype: `~instruments.property_cache.PropertyCache`
+        """
+        return self._property_cache
+
+    @property
+    def error_policy(self):
+        """
+        Gets the policy determining when this instrument is checked for
+        errors. Checks are scheduled by the policy only for drivers which
+        support it, which for example check after every command by default.
+        Deferring or sampling checks reduces the traffic to the instrument.
+
+        Example usage:
+
+        >>> inst.error_policy.mode = ErrorCheckMode.sampled # doctest: +SKIP
+
+        :rtype: `~instruments.error_policy.ErrorPolicy`
+        """
+        return self._error_policy
+
+    @property
+    def proxy_instances(self):
+        """
+        Gets the proxy objects of this instrument which are constructed once
+        and then reused, keyed by proxy class and key. These are kept by
+        `~instruments.util_fns.ProxyList` for proxy classes which are
+        cached, and are discarded with
+        `~instruments.util_fns.ProxyList.invalidate`.
+
+        :rtype: `dict`
+        """
+        return self._proxy_instances
+
+    @property
+    def raw_numeric(self):
+        """
+        Gets/sets whether the instrument is in raw numeric mode. In this
+        mode, properties created by `~instruments.util_fns.unitful_property`
+        return bare `float` magnitudes instead of
+        `~quantities.Quantity` objects, avoiding the cost of constructing
+        quantities when polling at high rates. The units of these magnitudes
+        are given by `Instrument.property_units`. Values being set are
+        validated as usual.
+
+        Measurement methods of drivers, such as ``measure`` and ``fetch``,
+        likewise return bare magnitudes, in the units they would otherwise
+        be given in. Where these units depend on the measurement mode, the
+        mode is not queried.
+
+        :type: `bool`
+        """
+        return self._raw_numeric
+
+    @raw_numeric.setter
+    def raw_numeric(self, newval):
+        if not isinstance(newval, bool):
+            raise TypeError("Raw numeric mode must be specified with a "
+                            "boolean value.")
+        self._raw_numeric = newval
+
     @property
     def timeout(self):
         """
@@ -256,7 +520,7 @@ class Instrument(object):
         """
         self._file.write(msg)
 
-    def binblockread(self, data_width, fmt=None):
+    def binblockread(self, data_width, fmt=None, count=None):
         """"
         Read a binary data block from attached instrument.
         This requires that the instrument respond in a particular manner
@@ -265,6 +529,10 @@ class Instrument(object):
         The format is as follows:
         #{number of following digits:1-9}{num of bytes to be read}{data bytes}
 
+        Indefinite length blocks, of the form ``#0{data bytes}`` followed by
+        the termination character, are also supported if the number of data
+        points is given by ``count``.
+
         :param int data_width: Specify the number of bytes wide each data
             point is. One of [1,2,4].
 
@@ -272,6 +540,9 @@ class Instrument(object):
             or `None` to choose a format automatically based on the data
             width. Typically you can just specify `data_width` and leave this
             default.
+
+        :param int count: Number of data points contained in an indefinite
+            length block. Not required for definite length blocks.
         """
         # This needs to be a # symbol for valid binary block
         symbol = self._file.read_raw(1)
@@ -284,7 +555,14 @@ class Instrument(object):
             digits = int(self._file.read_raw(1))
 
             # Read in the num of bytes to be read
-            num_of_bytes = int(self._file.read_raw(digits))
+            if digits == 0:
+                if count is None:
+                    raise IOError("The number of data points must be "
+                                  "specified to read an indefinite length "
+                                  "binary block.")
+                num_of_bytes = count * data_width
+            else:
+                num_of_bytes = int(self._file.read_raw(digits))
 
             # Make or use the required format string.
             if fmt is None:
@@ -292,21 +570,34 @@ class Instrument(object):
 
             # Read in the data bytes, and pass them to numpy using the specified
             # data type (format).
-            # This is looped in case a communication timeout occurs midway
-            # through transfer and multiple reads are required
-            tries = 3
-            data = self._file.read_raw(num_of_bytes)
-            while len(data) < num_of_bytes:
-                old_len = len(data)
-                data += self._file.read_raw(num_of_bytes - old_len)
-                if old_len == len(data):
-                    tries -= 1
-                if tries == 0:
-                    raise IOError("Did not read in the required number of bytes"
-                                  "during binblock read. Got {}, expected "
-                                  "{}".format(len(data), num_of_bytes))
+            data = self._read_raw_exactly(num_of_bytes)
+            if digits == 0:
+                self._file.read()  # Indefinite blocks end with the terminator
             return np.frombuffer(data, dtype=fmt)
 
+    def _read_raw_exactly(self, num_of_bytes):
+        """
+        Read exactly ``num_of_bytes`` bytes from the attached instrument.
+
+        This is looped in case a communication timeout occurs midway
+        through transfer and multiple reads are required.
+
+        :param int num_of_bytes: Number of bytes to be read.
+        :rtype: `bytes`
+        """
+        tries = 3
+        data = self._file.read_raw(num_of_bytes)
+        while len(data) < num_of_bytes:
+            old_len = len(data)
+            data += self._file.read_raw(num_of_bytes - old_len)
+            if old_len == len(data):
+                tries -= 1
+            if tries == 0:
+                raise IOError("Did not read in the required number of bytes"
+                              "during binblock read. Got {}, expected "
+                              "{}".format(len(data), num_of_bytes))
+        return data
+
     # CLASS METHODS #
 
     URI_SCHEMES = ["serial", "tcpip", "gpib+usb",
@@ -88,8 +88,7 @@ class Agilent34410a(SCPIMultimeter):  # pylint: disable=abstract-method
 
         :rtype: `~quantities.quantity.Quantity` with `numpy.array`
         """
-        mode = self.mode
-        units = UNITS[mode]
+        units = None if self.raw_numeric else UNITS[self.mode]
         if not isinstance(count, int):
             raise TypeError('Parameter "count" must be an integer')
         if count == 0:
@@ -99,7 +98,7 @@ class Agilent34410a(SCPIMultimeter):  # pylint: disable=abstract-method
         self.sendcmd('FORM:DATA REAL,64')
         self.sendcmd(msg)
         data = self.binblockread(8, fmt=">d")
-        return data * units
+        return self._measured(data, units)
 
     # DATA READING METHODS #
 
@@ -117,8 +116,9 @@ class Agilent34410a(SCPIMultimeter):  # pylint: disable=abstract-method
 
         :rtype: `list` of `~quantities.quantity.Quantity` elements
         """
-        units = UNITS[self.mode]
-        return list(map(float, self.query('FETC?').split(','))) * units
+        units = None if self.raw_numeric else UNITS[self.mode]
+        data = list(map(float, self.query('FETC?').split(',')))
+        return self._measured(data, units)
 
     def read_data(self, sample_count):
         """
@@ -138,10 +138,10 @@ class Agilent34410a(SCPIMultimeter):  # pylint: disable=abstract-method
 
         if sample_count == -1:
             sample_count = self.data_point_count
-        units = UNITS[self.mode]
+        units = None if self.raw_numeric else UNITS[self.mode]
         self.sendcmd('FORM:DATA ASC')
         data = self.query('DATA:REM? {}'.format(sample_count)).split(',')
-        return list(map(float, data)) * units
+        return self._measured(list(map(float, data)), units)
 
     def read_data_nvmem(self):
         """
@@ -149,9 +149,9 @@ class Agilent34410a(SCPIMultimeter):  # pylint: disable=abstract-method
 
         :rtype: `list` of `~quantities.quantity.Quantity` elements
         """
-        units = UNITS[self.mode]
+        units = None if self.raw_numeric else UNITS[self.mode]
         data = list(map(float, self.query('DATA:DATA? NVMEM').split(',')))
-        return data * units
+        return self._measured(data, units)
 
     def read_last_data(self):
         """
@@ -189,9 +189,8 @@ class Agilent34410a(SCPIMultimeter):  # pylint: disable=abstract-method
 
         :rtype: `~quantities.Quantity`
         """
-        mode = self.mode
-        units = UNITS[mode]
-        return float(self.query('READ?')) * units
+        units = None if self.raw_numeric else UNITS[self.mode]
+        return self._measured(float(self.query('READ?')), units)
 
 # UNITS #######################################################################
 
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing the scheduling of error checks of an instrument
+"""
+
+# IMPORTS #####################################################################
+
+from __future__ import absolute_import
+from __future__ import division
+
+from enum import Enum
+
+# CLASSES #####################################################################
+
+
+class ErrorCheckMode(Enum):
+    """
+    Enum containing the ways in which an `ErrorPolicy` may schedule checking
+    an instrument for errors.
+    """
+    #: Errors are never checked for automatically.
+    disabled = "disabled"
+    #: Errors are checked for after every command.
+    immediate = "immediate"
+    #: Errors are checked for at the end of a batch of commands, see
+    #: `~instruments.Instrument.deferred_error_checking`, or when
+    #: `~instruments.Instrument.check_errors` is called.
+    deferred = "deferred"
+    #: Errors are checked for after every `ErrorPolicy.interval` commands.
+    sampled = "sampled"
+    #: A cheap status query is made after every command, and errors are only
+    #: checked for if it reports that an error has occurred.
+    status = "status"
+
+
+class ErrorPolicy(object):
+    """
+    Schedules checking an instrument for errors. Checking for errors after
+    every command can double the traffic to an instrument, so the policy
+    allows checks to be deferred or sampled instead. Commands sent since the
+    last check are remembered, such that an exception raised by a later check
+    is attributed to the commands which may have caused it, in the
+    ``commands`` attribute of the exception.
+
+    Each `~instruments.Instrument` has its own policy, which can be changed
+    with:
+
+    >>> inst.error_policy.mode = ErrorCheckMode.sampled # doctest: +SKIP
+    >>> inst.error_policy.interval = 10 # doctest: +SKIP
+
+    :param mode: How checks are scheduled.
+    :type mode: `ErrorCheckMode`
+    :param int interval: Number of commands between checks in
+        `ErrorCheckMode.sampled` mode.
+    """
+
+    def __init__(self, mode=ErrorCheckMode.disabled, interval=10):
+        self.mode = mode
+        self.interval = interval
+        #: Commands sent since errors were last checked for.
+        self.pending = []
+        self.checking = False
+
+    @property
+    def mode(self):
+        """
+        Gets/sets how checks are scheduled.
+
+        :type: `ErrorCheckMode`
+        """
+        return self._mode
+
+    @mode.setter
+    def mode(self, newval):
+        self._mode = ErrorCheckMode(newval)
+
+    @property
+    def interval(self):
+        """
+        Gets/sets the number of commands between checks in
+        `ErrorCheckMode.sampled` mode.
+
+        :type: `int`
+        """
+        return self._interval
+
+    @interval.setter
+    def interval(self, newval):
+        if newval < 1:
+            raise ValueError("Error check interval must be at least 1.")
+        self._interval = int(newval)
+
+    def record(self, cmd):
+        """
+        Records that a command has been sent, and returns whether errors
+        should now be checked for.
+
+        :param str cmd: The command that was sent.
+        :rtype: `bool`
+        """
+        if self._mode is ErrorCheckMode.disabled or self.checking:
+            return False
+        self.pending.append(cmd)
+        if self._mode is ErrorCheckMode.immediate or \
+                self._mode is ErrorCheckMode.status:
+            return True
+        if self._mode is ErrorCheckMode.sampled:
+            return len(self.pending) >= self._interval
+        return False
@@ -40,6 +40,17 @@ class SCPIInstrument(Instrument):
     def __init__(self, filelike):
         super(SCPIInstrument, self).__init__(filelike)
 
+    # COMMAND-HANDLING METHODS #
+
+    def sendcmd(self, cmd):
+        super(SCPIInstrument, self).sendcmd(cmd)
+        self._command_checked(cmd)
+
+    def query(self, cmd, size=-1):
+        resp = super(SCPIInstrument, self).query(cmd, size)
+        self._command_checked(cmd)
+        return resp
+
     # PROPERTIES #
 
     @property
@@ -245,6 +256,16 @@ class SCPIInstrument(Instrument):
         request_control_event = -700
         operation_complete = -800
 
+    def _error_check(self):
+        errors = self.check_error_queue()
+        if errors:
+            raise IOError("Instrument reported errors: {}".format(
+                ", ".join(map(str, errors))))
+
+    def _error_pending(self):
+        # Bit 2 of the status byte is set while the error queue is not empty.
+        return bool(int(self.query("*STB?")) & 0b100)
+
     def check_error_queue(self):
         """
         Checks and clears the error queue for this device, returning a list of
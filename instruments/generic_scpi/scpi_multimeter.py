@@ -395,7 +395,7 @@ class SCPIMultimeter(SCPIInstrument, Multimeter):
                             "value, got {} instead.".format(type(mode)))
         # pylint: disable=no-member
         value = float(self.query('MEAS:{}?'.format(mode.value)))
-        return value * UNITS[mode]
+        return self._measured(value, UNITS[mode])
 
     # INTERNAL FUNCTIONS ##
 
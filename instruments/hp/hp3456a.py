@@ -42,7 +42,9 @@ from enum import Enum, IntEnum
 import quantities as pq
 
 from instruments.abstract_instruments import Multimeter
-from instruments.util_fns import assume_units, bool_property, enum_property
+from instruments.util_fns import (
+    assume_units, bool_property, enum_property, poll_until
+)
 
 # CLASSES #####################################################################
 
@@ -72,6 +74,10 @@ class HP3456a(Multimeter):
         self.sendcmd("HO0T4SO1")
         self._null = False
 
+    #: Maximum time to wait for a register recall in `HP3456a` register
+    #: properties to complete.
+    settle_timeout = 5 * pq.second
+
     # ENUMS ##
 
     class MathMode(IntEnum):
@@ -521,8 +527,7 @@ class HP3456a(Multimeter):
             units = 1
 
         value = self.query("", size=-1)
-        values = [float(x) * units for x in value.split(",")]
-        return values
+        return [self._measured(float(x), units) for x in value.split(",")]
 
     def measure(self, mode=None):
         """Instruct the HP3456a to perform a one time measurement. The
@@ -560,7 +565,7 @@ class HP3456a(Multimeter):
         self.sendcmd("{}W1STNT3".format(modevalue))
 
         value = self.query("", size=-1)
-        return float(value) * units
+        return self._measured(float(value), units)
 
     def _register_read(self, name):
         """
@@ -579,9 +584,14 @@ class HP3456a(Multimeter):
                             "HP3456a.Register, got {} "
                             "instead.".format(name))
         self.sendcmd("RE{}".format(name.value))
-        if not self._testing:  # pragma: no cover
-            time.sleep(.1)
-        return float(self.query("", size=-1))
+
+        def _read_value():
+            try:
+                return float(self.query("", size=-1))
+            except ValueError:  # Register recall has not completed yet
+                return None
+
+        return poll_until(_read_value, timeout=self.settle_timeout)
 
     def _register_write(self, name, value):
         """
@@ -606,6 +616,8 @@ class HP3456a(Multimeter):
         ]:
             raise ValueError("register {} is read only".format(name))
         self.sendcmd("W{}ST{}".format(value, name.value))
+        # Register writes are not acknowledged, so give the instrument time
+        # to store the value before it is sent anything else.
         if not self._testing:  # pragma: no cover
             time.sleep(.1)
 
@@ -37,12 +37,14 @@ from __future__ import division
 from builtins import range
 
 from enum import Enum, IntEnum
+import numpy as np
 import quantities as pq
 
 from instruments.generic_scpi.scpi_instrument import SCPIInstrument
 from instruments.hp.hp6652a import HP6652a
 from instruments.util_fns import (unitful_property, unitless_property,
-                                  bool_property, enum_property, int_property)
+                                  bool_property, enum_property, int_property,
+                                  assume_units, CacheMode)
 
 # CLASSES #####################################################################
 
@@ -75,6 +77,18 @@ class HP6632b(SCPIInstrument, HP6652a):
     >>> psu.trigger()                # Send trigger
     >>> psu.voltage
     array(10.0) * V
+
+    Sweeps can be uploaded to the instrument as a list, and then stepped
+    through by the instrument itself on each trigger:
+
+    >>> psu.configure_list(voltage=[1, 2, 3], dwell=0.1, count=2)
+    >>> psu.init_output_trigger()
+    >>> psu.trigger()
+
+    Load transients can be captured with the built-in digitizer, which
+    returns the whole waveform in a single transfer:
+
+    >>> current = psu.measure_current_array(points=1024, interval=50e-6)
     """
 
     def __init__(self, filelike):
@@ -229,6 +243,28 @@ class HP6632b(SCPIInstrument, HP6652a):
         curr_or_volt_fetch_incompat_with_last_acq = 603
         measurement_overrange = 604
 
+    class ListStep(Enum):
+        """
+        Enum containing valid list stepping modes for the hp6632b.
+        """
+        #: Step through the list once per trigger, with each point lasting
+        #: for its dwell time.
+        auto = 'AUTO'
+        #: Step to the next point of the list on each trigger.
+        once = 'ONCE'
+
+    class OutputMode(Enum):
+        """
+        Enum containing valid modes for how the hp6632b responds to output
+        triggers.
+        """
+        #: Output is unaffected by triggers.
+        fixed = 'FIX'
+        #: Output is set to the triggered level on a trigger.
+        step = 'STEP'
+        #: Output is stepped through the uploaded list on a trigger.
+        list = 'LIST'
+
     class RemoteInhibit(Enum):
         """
         Enum containing vlaid remote inhibit modes for the hp6632b.
@@ -286,6 +322,47 @@ class HP6632b(SCPIInstrument, HP6652a):
         """
     )
 
+    voltage_mode = enum_property(
+        "VOLT:MODE",
+        OutputMode,
+        doc="""
+        Get/set how the output voltage responds to output triggers.
+
+        :type: `~HP6632b.OutputMode`
+        """
+    )
+
+    current_mode = enum_property(
+        "CURR:MODE",
+        OutputMode,
+        doc="""
+        Get/set how the output current responds to output triggers.
+
+        :type: `~HP6632b.OutputMode`
+        """
+    )
+
+    list_count = int_property(
+        "LIST:COUN",
+        doc="""
+        Get/set the number of times the list is executed before it is
+        completed.
+
+        :type: `int`
+        """
+    )
+
+    list_step = enum_property(
+        "LIST:STEP",
+        ListStep,
+        doc="""
+        Get/set whether the list is stepped through on a single trigger using
+        the dwell times, or one point per trigger.
+
+        :type: `~HP6632b.ListStep`
+        """
+    )
+
     init_output_continuous = bool_property(
         "INIT:CONT:SEQ1",
         "1",
@@ -366,9 +443,11 @@ class HP6632b(SCPIInstrument, HP6652a):
         valid_set=range(0, 8),
         doc="""
         Get/set digital in+out port to data. Data can be an integer from 0-7.
+        The inputs are driven externally, so this is never cached.
 
         :type: `int`
-        """
+        """,
+        cache=CacheMode.volatile
     )
 
     sense_sweep_points = unitless_property(
@@ -431,6 +510,113 @@ class HP6632b(SCPIInstrument, HP6652a):
         """
         self.sendcmd('ABORT')
 
+    def configure_list(self, voltage=None, current=None, dwell=None, count=1,
+                       step=ListStep.auto):
+        """
+        Upload a list of output setpoints to the instrument, and put the
+        output in list mode. Each list is sent in a single command, after
+        which the instrument steps through the setpoints by itself when
+        triggered, using `~HP6632b.init_output_trigger` and
+        `~HP6632b.trigger`.
+
+        Each of ``voltage``, ``current`` and ``dwell`` may be a single value
+        or an array. Single values are applied to all points of the list;
+        arrays must all have the same length.
+
+        :param voltage: Voltage setpoints, or `None` to leave the voltage out
+            of list mode.
+        :type voltage: `~quantities.Quantity` or array of `float`, assumed to
+            be in volts
+        :param current: Current setpoints, or `None` to leave the current out
+            of list mode.
+        :type current: `~quantities.Quantity` or array of `float`, assumed to
+            be in amps
+        :param dwell: Time that each point of the list lasts. Only used if
+            ``step`` is `HP6632b.ListStep.auto`. If `None`, the dwell list
+            is left unchanged.
+        :type dwell: `~quantities.Quantity` or array of `float`, assumed to be
+            in seconds
+        :param int count: Number of times the list is executed.
+        :param step: Whether the list is stepped through on a single trigger,
+            or one point per trigger.
+        :type step: `~HP6632b.ListStep`
+        """
+        if voltage is None and current is None:
+            raise ValueError("At least one of voltage or current must be "
+                             "specified.")
+
+        lists = [
+            (name, np.atleast_1d(
+                assume_units(value, units).rescale(units).magnitude
+            ))
+            for name, value, units in (
+                ("VOLT", voltage, pq.volt),
+                ("CURR", current, pq.amp),
+                ("DWEL", dwell, pq.second)
+            )
+            if value is not None
+        ]
+        lengths = set(len(values) for _, values in lists) - {1}
+        if len(lengths) > 1:
+            raise ValueError("Voltage, current and dwell lists must have the "
+                             "same length, got lengths {}.".format(
+                                 sorted(lengths)))
+
+        for name, values in lists:
+            self.sendcmd("LIST:{} {}".format(
+                name, ",".join("{:e}".format(value) for value in values)))
+        self.list_count = count
+        self.list_step = step
+        if voltage is not None:
+            self.voltage_mode = self.OutputMode.list
+        if current is not None:
+            self.current_mode = self.OutputMode.list
+
+    def _measure_array(self, name, units, points, interval):
+        if points is not None:
+            if not 1 <= points <= 4096:
+                raise ValueError("The number of points must be between 1 and "
+                                 "4096, got {}.".format(points))
+            self.sense_sweep_points = points
+        if interval is not None:
+            self.sense_sweep_interval = interval
+        values = self.query("MEAS:ARR:{}?".format(name)).split(",")
+        return self._measured(np.array(values, dtype=float), units)
+
+    def measure_current_array(self, points=None, interval=None):
+        """
+        Digitize the output current, and return the whole waveform from a
+        single array query. The acquisition is started immediately.
+
+        :param int points: Number of points to acquire, between 1 and 4096.
+            If `None`, `~HP6632b.sense_sweep_points` is left unchanged.
+        :param interval: Time between points. If `None`,
+            `~HP6632b.sense_sweep_interval` is left unchanged.
+        :type interval: `~quantities.Quantity` or `float`, assumed to be in
+            seconds
+
+        :units: :math:`\\text{A}` (amps)
+        :rtype: `~quantities.Quantity` array
+        """
+        return self._measure_array("CURR", pq.amp, points, interval)
+
+    def measure_voltage_array(self, points=None, interval=None):
+        """
+        Digitize the output voltage, and return the whole waveform from a
+        single array query. The acquisition is started immediately.
+
+        :param int points: Number of points to acquire, between 1 and 4096.
+            If `None`, `~HP6632b.sense_sweep_points` is left unchanged.
+        :param interval: Time between points. If `None`,
+            `~HP6632b.sense_sweep_interval` is left unchanged.
+        :type interval: `~quantities.Quantity` or `float`, assumed to be in
+            seconds
+
+        :units: :math:`\\text{V}` (volts)
+        :rtype: `~quantities.Quantity` array
+        """
+        return self._measure_array("VOLT", pq.volt, points, interval)
+
     # SCPIInstrument commands that need local overrides
 
     @property
@@ -9,13 +9,13 @@ Driver for the Keithley 195 digital multimeter
 from __future__ import absolute_import
 from __future__ import division
 
-import time
 import struct
 from enum import Enum, IntEnum
 
 import quantities as pq
 
 from instruments.abstract_instruments import Multimeter
+from instruments.util_fns import poll_until
 
 # CLASSES #####################################################################
 
@@ -41,6 +41,10 @@ class Keithley195(Multimeter):
         self.sendcmd('YX')  # Removes the termination CRLF
         self.sendcmd('G1DX')  # Disable returning prefix and suffix
 
+    #: Maximum time to wait for the instrument to settle after a mode
+    #: change in `Keithley195.measure`.
+    settle_timeout = 5 * pq.second
+
     # ENUMS ##
 
     class Mode(IntEnum):
@@ -239,9 +243,11 @@ class Keithley195(Multimeter):
         instrument value and appropriate units.
 
         With the 195, it is HIGHLY recommended that you seperately set the
-        mode and let the instrument settle into the new mode. This can sometimes
-        take longer than the 2 second delay added in this method. In our testing
-        the 2 seconds seems to be sufficient but we offer no guarentee.
+        mode and let the instrument settle into the new mode. When the mode is
+        changed by this method, readings are taken until one can be parsed,
+        for up to `Keithley195.settle_timeout`. An overflowed reading is
+        returned as it is reported by the instrument. In our testing this is
+        sufficient but we offer no guarentee.
 
         Example usage:
 
@@ -261,12 +267,27 @@ class Keithley195(Multimeter):
             current_mode = self.mode
             if mode != current_mode:
                 self.mode = mode
-                if not self._testing:
-                    time.sleep(2)  # Gives the instrument a moment to settle
-        else:
+                # The status word reports the new mode straight away, so
+                # wait for the readings themselves to settle instead.
+                value = poll_until(self._settled_reading,
+                                   timeout=self.settle_timeout)
+                return self._measured(value, UNITS2[mode])
+        elif not self.raw_numeric:
             mode = self.mode
-        value = self.query('')
-        return float(value) * UNITS2[mode]
+        value = float(self.query(''))
+        return self._measured(value, None if mode is None else UNITS2[mode])
+
+    def _settled_reading(self):
+        """
+        Takes a reading, returning `None` if it could not be parsed, as
+        happens while the 195 is still settling into a new measurement mode.
+
+        :rtype: `float` or `None`
+        """
+        try:
+            return float(self.query(''))
+        except ValueError:
+            return None
 
     def get_status_word(self):
         """
@@ -303,7 +324,10 @@ class Keithley195(Multimeter):
 
         (trigger, function, input_range, eoi, buf, rate, srqmode, relative,
          delay, multiplex, selftest, data_fmt, data_ctrl, filter_mode,
-         terminator) = struct.unpack('@4c2s3c2s5c2s', statusword[4:])
+         terminator) = [
+             field.decode('ascii') for field in
+             struct.unpack('@4c2s3c2s5c2s', statusword[4:].encode('ascii'))
+         ]
 
         return {'trigger': Keithley195.TriggerMode(int(trigger)),
                 'mode': Keithley195.Mode(int(function)),
@@ -32,7 +32,9 @@ class Keithley2182(SCPIMultimeter):
     >>> meter = ik.keithley.Keithley2182.open_gpibusb("/dev/ttyUSB0", 10)
     >>> print meter.measure(meter.Mode.voltage_dc)
 
-
+    For low resistance measurements, the 2182 can be driven in hardware by a
+    `~instruments.keithley.Keithley6220` current source using its delta
+    modes. See `Keithley6220.configure_delta`.
     """
 
     def __init__(self, filelike):
@@ -104,8 +106,10 @@ class Keithley2182(SCPIMultimeter):
                 raise NotImplementedError
             self._parent.sendcmd('SENS:CHAN {}'.format(self._idx))
             value = float(self._parent.query('SENS:DATA:FRES?'))
-            unit = self._parent.units
-            return value * unit
+            unit = None if self._parent.raw_numeric else self._parent.units
+            return self._parent._measured(  # pylint: disable=protected-access
+                value, unit
+            )
 
     # ENUMS #
 
@@ -221,7 +225,8 @@ class Keithley2182(SCPIMultimeter):
         :return: Measurement readings from the instrument output buffer.
         :rtype: `list` of `~quantities.quantity.Quantity` elements
         """
-        return list(map(float, self.query("FETC?").split(","))) * self.units
+        values = list(map(float, self.query("FETC?").split(",")))
+        return self._measured(values, None if self.raw_numeric else self.units)
 
     def measure(self, mode=None):
         """
@@ -241,5 +246,5 @@ class Keithley2182(SCPIMultimeter):
             raise TypeError("Mode must be specified as a Keithley2182.Mode "
                             "value, got {} instead.".format(mode))
         value = float(self.query("MEAS:{}?".format(mode.value)))
-        unit = self.units
-        return value * unit
+        unit = None if self.raw_numeric else self.units
+        return self._measured(value, unit)
@@ -35,7 +35,6 @@ Kit project.
 
 from __future__ import absolute_import
 from __future__ import division
-import time
 import struct
 
 from enum import IntEnum
@@ -43,6 +42,7 @@ from enum import IntEnum
 import quantities as pq
 
 from instruments.abstract_instruments import Instrument
+from instruments.util_fns import poll_until
 
 # CLASSES #####################################################################
 
@@ -65,6 +65,9 @@ class Keithley580(Instrument):
         super(Keithley580, self).__init__(filelike)
         self.sendcmd('Y:X')  # Removes the termination CRLF characters
 
+    #: Maximum time to wait for the instrument to return a valid status word.
+    settle_timeout = 5 * pq.second
+
     # ENUMS #
 
     class Polarity(IntEnum):
@@ -331,20 +334,24 @@ class Keithley580(Instrument):
     def get_status_word(self):
         """
         The keithley will not always respond with the statusword when asked. We
-        use a simple heuristic here: request it up to 5 times, using a 1s
-        delay to allow the keithley some thinking time.
+        use a simple heuristic here: keep requesting it, backing off between
+        attempts to allow the keithley some thinking time, until a valid
+        status word is returned or `Keithley580.settle_timeout` has elapsed.
 
         :rtype: `str`
         """
-        tries = 5
-        statusword = ''
-        while statusword[:3] != '580' and tries != 0:
-            tries -= 1
+        def _status_word():
             self.sendcmd('U0X')
-            time.sleep(1)
             statusword = self.query('')
+            return statusword if statusword[:3] == '580' else None
 
-        if statusword is None:
+        try:
+            statusword = poll_until(
+                _status_word,
+                timeout=self.settle_timeout,
+                interval=0.05
+            )
+        except IOError:
             raise IOError('could not retrieve status word')
 
         return statusword[:-1]
@@ -418,7 +425,8 @@ class Keithley580(Instrument):
         :rtype: `~quantities.quantity.Quantity`
         """
         self.trigger()
-        return self.parse_measurement(self.query(''))['resistance']
+        resistance = self.parse_measurement(self.query(''))['resistance']
+        return float(resistance) if self.raw_numeric else resistance
 
     @staticmethod
     def parse_measurement(measurement):
@@ -9,11 +9,14 @@ Provides support for the Keithley 6220 constant current supply
 from __future__ import absolute_import
 from __future__ import division
 
+import numpy as np
 import quantities as pq
 
 from instruments.abstract_instruments import PowerSupply
 from instruments.generic_scpi import SCPIInstrument
-from instruments.util_fns import bounded_unitful_property
+from instruments.util_fns import (
+    assume_units, bool_property, bounded_unitful_property, int_property
+)
 
 # CLASSES #####################################################################
 
@@ -33,8 +36,23 @@ class Keithley6220(SCPIInstrument, PowerSupply):
     >>> ccs = ik.keithley.Keithley6220.open_gpibusb("/dev/ttyUSB0", 10)
     >>> ccs.current = 10 * pq.milliamp # Sets current to 10mA
     >>> ccs.disable() # Turns off the output and sets the current to 0A
+
+    Low resistance measurements can be made in hardware using the delta mode
+    of the 6220, with a Keithley 2182 nanovoltmeter attached through its
+    RS-232 and Trigger Link ports:
+
+    >>> ccs.configure_delta(1 * pq.milliamp, count=1000)
+    >>> ccs.start_delta()
+    >>> readings, timestamps = ccs.read_delta()
     """
 
+    #: Layout of a single buffer element when transferred with
+    #: ``FORM:DATA REAL,64`` and swapped (little-endian) byte order.
+    DELTA_DTYPE = np.dtype([
+        ('reading', '<f8'),
+        ('timestamp', '<f8')
+    ])
+
     # PROPERTIES ##
 
     @property
@@ -79,6 +97,29 @@ class Keithley6220(SCPIInstrument, PowerSupply):
         """
     )
 
+    nanovoltmeter_present = bool_property(
+        "SOUR:DELT:NVPR",
+        inst_true="1",
+        inst_false="0",
+        readonly=True,
+        doc="""
+        Gets whether a Keithley 2182 nanovoltmeter is attached to the 6220,
+        as is required for the delta measurement modes.
+
+        :type: `bool`
+        """
+    )
+
+    buffer_count = int_property(
+        "TRAC:POIN:ACT",
+        readonly=True,
+        doc="""
+        Gets the number of readings currently stored in the buffer.
+
+        :rtype: `int`
+        """
+    )
+
     # METHODS #
 
     def disable(self):
@@ -86,3 +127,222 @@ class Keithley6220(SCPIInstrument, PowerSupply):
         Set the output current to zero and disable the output.
         """
         self.sendcmd("SOUR:CLE:IMM")
+
+    def _check_delta_current(self, current):
+        current = assume_units(current, pq.amp).rescale(pq.amp).item()
+        if abs(current) > 0.105:
+            raise ValueError("Delta mode current must be between -105mA and "
+                             "+105mA, got {}.".format(current))
+        return current
+
+    def _prepare_delta(self, count):
+        if not self.nanovoltmeter_present:
+            raise IOError("A Keithley 2182 nanovoltmeter must be attached to "
+                          "the 6220 to use the delta measurement modes.")
+        if not 1 <= count <= 65536:
+            raise ValueError("Delta mode count must be between 1 and 65536, "
+                             "got {}.".format(count))
+
+    def configure_delta(self, high, low=None, delay=2 * pq.millisecond,
+                        count=1000, compliance_abort=False):
+        """
+        Configures and arms the delta measurement mode. In this mode the 6220
+        alternates its output between the ``high`` and ``low`` currents, and
+        triggers the attached Keithley 2182 after each step. Each delta
+        reading is averaged from three consecutive voltage readings by the
+        instrument, and stored in the 6220's buffer.
+
+        Once armed, the measurement is started with
+        `~Keithley6220.start_delta`.
+
+        :param high: Current for the high step. Must be between -105mA and
+            +105mA.
+        :type high: `~quantities.Quantity` or `float`, assumed to be in amps
+        :param low: Current for the low step. If `None`, the instrument default
+            of ``-high`` is used.
+        :type low: `~quantities.Quantity` or `float`, assumed to be in amps
+        :param delay: Time between a current step and the triggering of the
+            nanovoltmeter.
+        :type delay: `~quantities.Quantity` or `float`, assumed to be in
+            seconds
+        :param int count: Number of delta readings to take, between 1 and
+            65536.
+        :param bool compliance_abort: If `True`, the measurement is aborted if
+            the source goes into compliance.
+        """
+        high = self._check_delta_current(high)
+        delay = assume_units(delay, pq.second).rescale(pq.second).item()
+        self._prepare_delta(count)
+
+        self.sendcmd("SOUR:DELT:HIGH {:e}".format(high))
+        if low is not None:
+            low = self._check_delta_current(low)
+            self.sendcmd("SOUR:DELT:LOW {:e}".format(low))
+        self.sendcmd("SOUR:DELT:DEL {:e}".format(delay))
+        self.sendcmd("SOUR:DELT:COUN {:d}".format(count))
+        self.sendcmd("SOUR:DELT:CAB {}".format(
+            "ON" if compliance_abort else "OFF"))
+        self.sendcmd("TRAC:POIN {:d}".format(count))
+        self.sendcmd("SOUR:DELT:ARM")
+
+    def configure_pulse_delta(self, high, low=0, width=110 * pq.microsecond,
+                              source_delay=16 * pq.microsecond, count=1000,
+                              interval=5):
+        """
+        Configures and arms the pulse delta measurement mode. In this mode the
+        6220 outputs pulses of the ``high`` current on top of the ``low``
+        current, and the attached Keithley 2182 measures the voltage during
+        and between pulses. This keeps the power dissipated in the device
+        under test low.
+
+        Once armed, the measurement is started with
+        `~Keithley6220.start_delta`.
+
+        :param high: Current for the pulses. Must be between -105mA and
+            +105mA.
+        :type high: `~quantities.Quantity` or `float`, assumed to be in amps
+        :param low: Current between pulses.
+        :type low: `~quantities.Quantity` or `float`, assumed to be in amps
+        :param width: Width of each pulse, between 50us and 12ms.
+        :type width: `~quantities.Quantity` or `float`, assumed to be in
+            seconds
+        :param source_delay: Time between the start of a pulse and the
+            triggering of the nanovoltmeter.
+        :type source_delay: `~quantities.Quantity` or `float`, assumed to be in
+            seconds
+        :param int count: Number of pulse delta readings to take, between 1
+            and 65536.
+        :param int interval: Number of power line cycles between pulses.
+        """
+        high = self._check_delta_current(high)
+        low = self._check_delta_current(low)
+        width = assume_units(width, pq.second).rescale(pq.second).item()
+        source_delay = assume_units(
+            source_delay, pq.second).rescale(pq.second).item()
+        self._prepare_delta(count)
+
+        self.sendcmd("SOUR:PDEL:HIGH {:e}".format(high))
+        self.sendcmd("SOUR:PDEL:LOW {:e}".format(low))
+        self.sendcmd("SOUR:PDEL:WIDT {:e}".format(width))
+        self.sendcmd("SOUR:PDEL:SDEL {:e}".format(source_delay))
+        self.sendcmd("SOUR:PDEL:COUN {:d}".format(count))
+        self.sendcmd("SOUR:PDEL:INT {:d}".format(interval))
+        self.sendcmd("TRAC:POIN {:d}".format(count))
+        self.sendcmd("SOUR:PDEL:ARM")
+
+    def configure_list_sweep(self, current, delay, compliance=None, count=1):
+        """
+        Uploads a list of output currents and the delay at each point, and
+        arms the sweep. Each list is sent in a single command, after which
+        the instrument steps through the setpoints by itself once started
+        with `~Keithley6220.init_output_trigger`.
+
+        Each of ``delay`` and ``compliance`` may be a single value, which is
+        applied to all points of the sweep, or an array of the same length as
+        ``current``.
+
+        :param current: Current setpoints, at most 100 points. Each must be
+            between -105mA and +105mA.
+        :type current: `~quantities.Quantity` or array of `float`, assumed to
+            be in amps
+        :param delay: Time that each point of the sweep lasts.
+        :type delay: `~quantities.Quantity` or array of `float`, assumed to be
+            in seconds
+        :param compliance: Voltage compliance at each point, or `None` to use
+            the present compliance setting.
+        :type compliance: `~quantities.Quantity` or array of `float`, assumed
+            to be in volts
+        :param int count: Number of times the sweep is executed.
+        """
+        current = np.atleast_1d(
+            assume_units(current, pq.amp).rescale(pq.amp).magnitude)
+        if len(current) > 100:
+            raise ValueError("List sweeps are limited to 100 points, "
+                             "got {}.".format(len(current)))
+        if np.any(np.abs(current) > 0.105):
+            raise ValueError("List sweep currents must be between -105mA and "
+                             "+105mA.")
+
+        lists = [("CURR", current)]
+        for name, value, units in (("DEL", delay, pq.second),
+                                   ("COMP", compliance, pq.volt)):
+            if value is not None:
+                value = np.atleast_1d(
+                    assume_units(value, units).rescale(units).magnitude)
+                if len(value) == 1:
+                    value = np.repeat(value, len(current))
+                elif len(value) != len(current):
+                    raise ValueError("Sweep lists must have the same length "
+                                     "as the current list.")
+                lists.append((name, value))
+
+        self.sendcmd("SOUR:SWE:SPAC LIST")
+        for name, values in lists:
+            self.sendcmd("SOUR:LIST:{} {}".format(
+                name, ",".join("{:e}".format(value) for value in values)))
+        self.sendcmd("SOUR:SWE:COUN {:d}".format(count))
+        self.sendcmd("SOUR:SWE:ARM")
+
+    def init_output_trigger(self):
+        """
+        Starts an armed list sweep, delta or pulse delta measurement.
+        """
+        self.sendcmd("INIT:IMM")
+
+    def abort_output_trigger(self):
+        """
+        Stops a running list sweep, delta or pulse delta measurement, and
+        disarms it.
+        """
+        self.sendcmd("SOUR:SWE:ABOR")
+
+    def start_delta(self):
+        """
+        Starts a delta or pulse delta measurement that was armed by
+        `~Keithley6220.configure_delta` or
+        `~Keithley6220.configure_pulse_delta`.
+        """
+        self.init_output_trigger()
+
+    def stop_delta(self):
+        """
+        Stops a running delta or pulse delta measurement, and disarms it.
+        """
+        self.abort_output_trigger()
+
+    def read_delta(self, count=None):
+        """
+        Transfers the delta readings stored in the buffer using a single
+        binary transfer.
+
+        The data format, elements and byte order in use before the transfer
+        are restored afterwards.
+
+        :param int count: Number of readings stored in the buffer. If `None`,
+            `Keithley6220.buffer_count` is queried first.
+
+        :return: The delta readings and their timestamps.
+        :rtype: `tuple` of two `~quantities.Quantity` arrays, in volts and
+            seconds respectively
+        """
+        if count is None:
+            count = self.buffer_count
+        formats = [
+            (cmd, self.query("{}?".format(cmd)))
+            for cmd in ("FORM:ELEM", "FORM:BORD", "FORM:DATA")
+        ]
+        try:
+            self.sendcmd("FORM:ELEM READ,TST")
+            self.sendcmd("FORM:BORD SWAP")
+            self.sendcmd("FORM:DATA REAL,64")
+            self.sendcmd("TRAC:DATA?")
+            data = self.binblockread(
+                self.DELTA_DTYPE.itemsize,
+                fmt=self.DELTA_DTYPE,
+                count=count
+            )
+        finally:
+            for cmd, value in formats:
+                self.sendcmd("{} {}".format(cmd, value))
+        return (self._measured(data["reading"], pq.volt),
+                self._measured(data["timestamp"], pq.second))
@@ -8,15 +8,16 @@ Provides support for the Keithley 6514 electrometer
 
 from __future__ import absolute_import
 from __future__ import division
-from builtins import map
+from builtins import map, range
 
 from enum import Enum
 
+import numpy as np
 import quantities as pq
 
 from instruments.abstract_instruments import Electrometer
 from instruments.generic_scpi import SCPIInstrument
-from instruments.util_fns import bool_property, enum_property
+from instruments.util_fns import bool_property, enum_property, int_property
 
 # CLASSES #####################################################################
 
@@ -65,6 +66,15 @@ class Keithley6514(SCPIInstrument, Electrometer):
         nstest = 'NST'
         manual = 'MAN'
 
+    class TraceFeed(Enum):
+        """
+        Enum containing valid sources of readings for the Keithley 6514
+        reading buffer
+        """
+        sense = 'SENS'
+        calculate = 'CALC'
+        none = 'NONE'
+
     class ValidRange(Enum):
         """
         Enum containing valid measurement ranges for the Keithley 6514
@@ -84,6 +94,14 @@ class Keithley6514(SCPIInstrument, Electrometer):
         Mode.charge: pq.coulomb
     }
 
+    #: Layout of a single buffer element when transferred with
+    #: ``FORM:DATA REAL,32`` and swapped (little-endian) byte order.
+    BUFFER_DTYPE = np.dtype([
+        ('reading', '<f4'),
+        ('timestamp', '<f4'),
+        ('status', '<f4')
+    ])
+
     # PRIVATE METHODS #
 
     def _valid_range(self, mode):
@@ -101,7 +119,9 @@ class Keithley6514(SCPIInstrument, Electrometer):
     def _parse_measurement(self, ascii):
         # TODO: don't assume ASCII data format # pylint: disable=fixme
         vals = list(map(float, ascii.split(',')))
-        reading = vals[0] * self.unit
+        reading = self._measured(
+            vals[0], None if self.raw_numeric else self.unit
+        )
         timestamp = vals[1]
         status = vals[2]
         return reading, timestamp, status
@@ -154,6 +174,39 @@ class Keithley6514(SCPIInstrument, Electrometer):
         """
     )
 
+    buffer_feed = enum_property(
+        'TRACE:FEED',
+        TraceFeed,
+        doc="""
+        Gets/sets the source of readings stored in the reading buffer of the
+        Keithley 6514.
+
+        :type: `Keithley6514.TraceFeed`
+        """
+    )
+
+    buffer_points = int_property(
+        'TRACE:POINTS',
+        valid_set=range(1, 2501),
+        doc="""
+        Gets/sets the size of the reading buffer of the Keithley 6514. Valid
+        sizes are 1 to 2500 readings.
+
+        :type: `int`
+        """
+    )
+
+    buffer_count = int_property(
+        'TRACE:POINTS:ACTUAL',
+        readonly=True,
+        doc="""
+        Gets the number of readings currently stored in the reading buffer of
+        the Keithley 6514.
+
+        :rtype: `int`
+        """
+    )
+
     @property
     def unit(self):
         return self._MODE_UNITS[self.mode]
@@ -232,3 +285,75 @@ class Keithley6514(SCPIInstrument, Electrometer):
         raw = self.query('READ?')
         reading, timestamp, _ = self._parse_measurement(raw)
         return reading, timestamp
+
+    def clear_buffer(self):
+        """
+        Clears all readings from the reading buffer.
+        """
+        self.sendcmd('TRACE:CLEAR')
+
+    def configure_buffer(self, points, feed=TraceFeed.sense):
+        """
+        Clears the reading buffer and configures it to store the next
+        ``points`` readings. The trigger count is set to match, so that
+        one initiation of the trigger model fills the buffer.
+
+        Example usage:
+
+        >>> import instruments as ik
+        >>> inst = ik.keithley.Keithley6514.open_gpibusb('/dev/ttyUSB0', 12)
+        >>> inst.configure_buffer(1000)
+        >>> inst.sendcmd('INIT')
+        >>> data = inst.read_buffer()
+
+        :param int points: Number of readings to store in the buffer.
+        :param feed: Source of the readings to be stored.
+        :type feed: `Keithley6514.TraceFeed`
+        """
+        self.clear_buffer()
+        self.buffer_points = points
+        self.sendcmd('TRIG:COUN {:d}'.format(points))
+        self.buffer_feed = feed
+        self.sendcmd('TRACE:FEED:CONTROL NEXT')
+
+    def read_buffer(self, points=None):
+        """
+        Transfers the contents of the reading buffer using a single binary
+        transfer. Each element contains the reading, its timestamp and the
+        status word, transferred in single precision floating point format.
+
+        The readings are in units of `Keithley6514.unit` for the mode in
+        which the buffer was filled.
+
+        The data format, elements and byte order in use before the transfer
+        are restored afterwards, so that `~Keithley6514.fetch` and
+        `~Keithley6514.read_measurements` continue to work.
+
+        :param int points: Number of readings stored in the buffer. If `None`,
+            `Keithley6514.buffer_count` is queried first.
+
+        :return: Structured array with the fields ``reading``, ``timestamp``
+            and ``status``.
+        :rtype: `numpy.ndarray` with dtype `Keithley6514.BUFFER_DTYPE`
+        """
+        if points is None:
+            points = self.buffer_count
+        formats = [
+            (cmd, self.query('{}?'.format(cmd)))
+            for cmd in ('FORM:ELEM', 'FORM:BORD', 'FORM:DATA')
+        ]
+        try:
+            self.sendcmd('FORM:ELEM READ,TIME,STAT')
+            self.sendcmd('FORM:BORD SWAP')
+            self.sendcmd('FORM:DATA REAL,32')
+            self.sendcmd('TRACE:DATA?')
+            # The 6514 sends REAL data as an indefinite length (#0) block.
+            data = self.binblockread(
+                self.BUFFER_DTYPE.itemsize,
+                fmt=self.BUFFER_DTYPE,
+                count=points
+            )
+        finally:
+            for cmd, value in formats:
+                self.sendcmd('{} {}'.format(cmd, value))
+        return data
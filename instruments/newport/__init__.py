@@ -8,5 +8,6 @@ from __future__ import absolute_import
 
 from .errors import NewportError
 from .newportesp301 import (
-    NewportESP301, NewportESP301Axis, NewportESP301HomeSearchMode
+    NewportESP301, NewportESP301Axis, NewportESP301GroupMove,
+    NewportESP301HomeSearchMode
 )
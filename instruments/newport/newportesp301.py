@@ -19,11 +19,14 @@ from contextlib import contextmanager
 from builtins import range, map
 from enum import IntEnum
 
+import numpy as np
 import quantities as pq
 
 from instruments.abstract_instruments import Instrument
 from instruments.newport.errors import NewportError
-from instruments.util_fns import assume_units, ProxyList
+from instruments.util_fns import (
+    assume_units, ErrorCheckMode, ProxyList, poll_until
+)
 
 # ENUMS #######################################################################
 
@@ -79,6 +82,63 @@ class NewportESP301MotorType(IntEnum):
     commutated_stepper_motor = 3
     commutated_brushless_servo = 4
 
+# FUNCTIONS ###################################################################
+
+
+def _unitful(power=0):
+    """
+    Returns a function converting a response from the controller to a
+    quantity in units of the axis units per second to the given power.
+    """
+    def _convert(resp, units):
+        return assume_units(
+            float(resp), units / (pq.s**power) if power else units
+        )
+    return _convert
+
+
+# Queries used by `NewportESP301Axis.read_setup` and
+# `NewportESP301Axis.get_status`, as tuples of the name of the value, the
+# query command and a function converting the response given the axis units.
+# The conversions match those of the corresponding axis properties.
+_SETUP_QUERIES = (
+    ('motor_type', "QM?",
+     lambda resp, units: NewportESP301MotorType(int(resp))),
+    ('feedback_configuration', "ZB?",
+     lambda resp, units: int(resp[:-2], 16)),
+    ('full_step_resolution', "FR?", _unitful()),
+    ('position_display_resolution', "FP?", lambda resp, units: int(resp)),
+    ('current', "QI?", lambda resp, units: assume_units(float(resp), pq.A)),
+    ('max_velocity', "VU?", _unitful(1)),
+    ('encoder_resolution', "SU?", _unitful()),
+    ('acceleration', "AC?", _unitful(2)),
+    ('deceleration', "AG?", _unitful(2)),
+    ('velocity', "VA?", _unitful(1)),
+    ('max_acceleration', "AU?", _unitful(2)),
+    ('homing_velocity', "OH?", _unitful(1)),
+    ('jog_high_velocity', "JH?", _unitful(1)),
+    ('jog_low_velocity', "JW?", _unitful(1)),
+    ('estop_deceleration', "AE?", _unitful(2)),
+    ('jerk', "JK?", _unitful(3)),
+    ('proportional_gain', "KP?", lambda resp, units: float(resp[:-1])),
+    ('derivative_gain', "KD?", lambda resp, units: float(resp)),
+    ('integral_gain', "KI?", lambda resp, units: float(resp)),
+    ('integral_saturation_gain', "KS?", lambda resp, units: float(resp)),
+    ('home', "DH?", _unitful()),
+    ('microstep_factor', "QS?", lambda resp, units: int(resp)),
+    ('acceleration_feed_forward', "AF?", lambda resp, units: float(resp)),
+    ('trajectory', "TJ?", lambda resp, units: int(resp)),
+    ('hardware_limit_configuration', "ZH?",
+     lambda resp, units: int(resp[:-2])),
+)
+
+_STATUS_QUERIES = (
+    ('position', "TP?", _unitful()),
+    ('desired_position', "DP?", _unitful()),
+    ('desired_velocity', "DV?", _unitful(1)),
+    ('is_motion_done', "MD?", lambda resp, units: bool(int(resp))),
+)
+
 # CLASSES #####################################################################
 
 # pylint: disable=too-many-lines
@@ -95,11 +155,21 @@ class NewportESP301(Instrument):
     .. _user's guide: http://assets.newport.com/webDocuments-EN/images/14294.pdf
     """
 
+    #: Number of axes supported by the controller.
+    max_axes = 3
+
+    #: Maximum length of a line of commands accepted by the controller.
+    max_line_length = 80
+
+    _default_error_check_mode = ErrorCheckMode.immediate
+
     def __init__(self, filelike):
         super(NewportESP301, self).__init__(filelike)
         self._execute_immediately = True
         self._command_list = []
         self._bulk_query_resp = ""
+        self._axis_info = None
+        self._units_generation = 0
         self.terminator = "\r"
 
     # PROPERTIES ##
@@ -118,11 +188,65 @@ class NewportESP301(Instrument):
         used in the Newport ESP-301 user's manual, and so care must
         be taken when converting examples.
 
+        Only the axes found by `NewportESP301.discover_axes` are included,
+        so that iterating over all axes only addresses motors which are
+        actually fitted.
+
         :type: :class:`NewportESP301Axis`
         """
+        return ProxyList(self, NewportESP301Axis, self.installed_axes)
 
-        return ProxyList(self, NewportESP301Axis, range(100))
-        # return _AxisList(self)
+    @property
+    def installed_axes(self):
+        """
+        Gets the zero-based indices of the axes which have a motor fitted.
+        The controller is queried for these the first time they are needed,
+        see `NewportESP301.discover_axes`.
+
+        :rtype: `list` of `int`
+        """
+        if self._axis_info is None:
+            self.discover_axes()
+        return sorted(self._axis_info)
+
+    # AXIS DISCOVERY ##
+
+    def discover_axes(self):
+        """
+        Queries the motor type and units of every axis of the controller in
+        a single transaction, and records which axes have a motor fitted.
+        The units found are used by the axes returned by
+        `NewportESP301.axis`, so that they do not need to query their units
+        when first accessed.
+
+        This is done automatically the first time the axes are accessed, but
+        should be repeated if motors are connected or reconfigured afterwards.
+
+        :return: The zero-based indices of the axes with a motor fitted.
+        :rtype: `list` of `int`
+        """
+        queries = []
+        for axis_id in range(1, self.max_axes + 1):
+            queries += ["{}QM?".format(axis_id), "{}SN?".format(axis_id)]
+        resp = self._execute_cmd(";".join(queries))
+        try:
+            values = list(map(int, resp.split(",")))
+        except ValueError:
+            values = []
+        if len(values) != 2 * self.max_axes:
+            raise IOError("Unexpected response to axis discovery: "
+                          "{}".format(resp))
+
+        self._axis_info = {}
+        for idx in range(self.max_axes):
+            motor_type = NewportESP301MotorType(values[2 * idx])
+            if motor_type != NewportESP301MotorType.undefined:
+                self._axis_info[idx] = (
+                    motor_type, NewportESP301Units(values[2 * idx + 1])
+                )
+        self._units_generation += 1
+        ProxyList(self, NewportESP301Axis, range(self.max_axes)).invalidate()
+        return sorted(self._axis_info)
 
     # LOW-LEVEL COMMAND METHODS ##
 
@@ -140,7 +264,8 @@ class NewportESP301(Instrument):
         :param bool errcheck: If `False`, suppresses the standard error
             checking. Note that since error-checking is unsupported
             during device programming, ``errcheck`` must be `False`
-            during ``PGM`` mode.
+            during ``PGM`` mode. Otherwise, errors are checked for as
+            scheduled by `~instruments.Instrument.error_policy`.
         """
         query_resp = None
         if isinstance(target, NewportESP301Axis):
@@ -180,16 +305,19 @@ class NewportESP301(Instrument):
             self.sendcmd(raw_cmd)
 
         if errcheck:
-            err_resp = self.query('TB?')
-
-            # pylint: disable=unused-variable
-            code, timestamp, msg = err_resp.split(",")
-            code = int(code)
-            if code != 0:
-                raise NewportError(code)
+            self._command_checked(raw_cmd)
 
         return query_resp
 
+    def _error_check(self):
+        err_resp = self.query('TB?')
+
+        # pylint: disable=unused-variable
+        code, timestamp, msg = err_resp.split(",")
+        code = int(code)
+        if code != 0:
+            raise NewportError(code)
+
     # SPECIFIC COMMANDS ##
 
     def _home(self, axis, search_mode, errcheck=True):
@@ -228,6 +356,11 @@ class NewportESP301(Instrument):
         for more information.
         """
         self._newport_cmd("RS", errcheck=False)
+        # The units of each axis revert to their saved values, so any units
+        # recorded by the axes or by axis discovery can no longer be trusted.
+        self._axis_info = None
+        self._units_generation += 1
+        self._settings_reset()
 
     # USER PROGRAMS ##
 
@@ -282,6 +415,159 @@ class NewportESP301(Instrument):
         self._command_list = []
         self._execute_immediately = True
 
+    def upload_trajectory(self, program_id, axes, positions, velocities=None,
+                          dwell=None):
+        """
+        Stores a trajectory as a program on the controller, such that it can
+        be run at the speed of the controller with
+        `NewportESP301.run_program`, rather than at the rate at which the
+        host can send commands.
+
+        At each point of the trajectory, all of the axes are moved to their
+        positions for that point, optionally at the given velocities. The
+        program then waits for the axes to stop, and for the dwell time, before
+        moving to the next point. The program is sent in as few lines as the
+        controller's line length allows, without waiting for replies.
+
+        For instance, to upload and run a raster scan:
+
+        >>> controller = NewportESP301.open_serial("COM3")
+        >>> xs, ys = np.meshgrid(np.linspace(0, 1, 100), np.linspace(0, 1, 10))
+        >>> controller.upload_trajectory(
+        ...     1, [0, 1], np.column_stack([xs.ravel(), ys.ravel()]) * pq.mm,
+        ...     dwell=10 * pq.ms
+        ... )
+        >>> controller.run_program(1)
+
+        :param int program_id: An integer label for the new program.
+            Must be in ``range(1, 101)``.
+        :param axes: Axes to move, given either as `NewportESP301Axis`
+            objects or as their zero-based indices.
+        :type axes: `list`, `NewportESP301Axis` or `int`
+        :param positions: Absolute positions of the trajectory, with one row
+            per point and one column per axis. A one-dimensional array may be
+            given for a single axis. Assumed to be in the units of each axis
+            if not specified.
+        :type positions: `~numpy.ndarray` or `~quantities.Quantity`
+        :param velocities: Velocities at which to move to each point, of the
+            same shape as ``positions`` or a single velocity for all points.
+            If `None`, the current velocities of the axes are used. Assumed to
+            be in units of each axis per second if not specified.
+        :type velocities: `~numpy.ndarray`, `~quantities.Quantity` or `None`
+        :param dwell: Time to wait at each point, either one per point or a
+            single time for all points. Assumed to be in units of seconds if
+            not specified.
+        :type dwell: `~numpy.ndarray`, `~quantities.Quantity` or `None`
+        :return: The lines sent to the controller as the program.
+        :rtype: `list` of `str`
+        """
+        if program_id not in range(1, 101):
+            raise ValueError("Invalid program ID. Must be an integer from "
+                             "1 to 100 (inclusive).")
+        if not isinstance(axes, (list, tuple)):
+            axes = [axes]
+        axes = [
+            axis if isinstance(axis, NewportESP301Axis) else self.axis[axis]
+            for axis in axes
+        ]
+
+        # pylint: disable=protected-access
+        if not isinstance(positions, pq.Quantity):
+            positions = np.asarray(positions, dtype=float)
+        if positions.ndim == 1:
+            positions = positions.reshape((-1, 1))
+        if positions.shape[1] != len(axes):
+            raise ValueError("Positions must have one column per axis.")
+        n_points = positions.shape[0]
+        columns = [
+            assume_units(positions[:, idx], axis._units).rescale(
+                axis._units).magnitude
+            for idx, axis in enumerate(axes)
+        ]
+
+        if velocities is not None:
+            velocities = [
+                np.broadcast_to(assume_units(
+                    velocities if np.ndim(velocities) < 2
+                    else velocities[:, idx],
+                    axis._units / pq.s
+                ).rescale(axis._units / pq.s).magnitude, (n_points,))
+                for idx, axis in enumerate(axes)
+            ]
+        if dwell is not None:
+            dwell = np.broadcast_to(
+                assume_units(dwell, pq.s).rescale(pq.ms).magnitude,
+                (n_points,)
+            )
+
+        axis_ids = [axis.axis_id for axis in axes]
+        cmds = []
+        for point in range(n_points):
+            cmds.extend(self._trajectory_point_commands(
+                axis_ids,
+                [column[point] for column in columns],
+                None if velocities is None
+                else [velocity[point] for velocity in velocities],
+                None if dwell is None else dwell[point]
+            ))
+
+        lines = self._join_commands(cmds)
+        self._newport_cmd("XX", target=program_id)
+        self._newport_cmd("EP", target=program_id, errcheck=False)
+        try:
+            for line in lines:
+                self.sendcmd(line)
+        finally:
+            self._newport_cmd("QP")
+        return lines
+
+    @staticmethod
+    def _trajectory_point_commands(axis_ids, positions, velocities=None,
+                                   dwell=None):
+        """
+        Returns the program commands which move the given axes to one point
+        of a trajectory, then wait for them to stop and for the dwell time.
+
+        :param axis_ids: IDs of the axes to move.
+        :param positions: Position of each axis, in the units of the axis.
+        :param velocities: Velocity of each axis, in the units of the axis
+            per second, or `None` to keep the current velocities.
+        :param dwell: Time to wait at the point in milliseconds, or `None`.
+        :rtype: `list` of `str`
+        """
+        cmds = []
+        for idx, axis_id in enumerate(axis_ids):
+            if velocities is not None:
+                cmds.append("{}VA{:.10g}".format(
+                    axis_id, float(velocities[idx])))
+            cmds.append("{}PA{:.10g}".format(axis_id, float(positions[idx])))
+        cmds.extend("{}WS".format(axis_id) for axis_id in axis_ids)
+        if dwell is not None and dwell > 0:
+            cmds.append("WT{}".format(int(round(dwell))))
+        return cmds
+
+    def _join_commands(self, cmds):
+        """
+        Joins commands into as few lines as possible, each of which is no
+        longer than `NewportESP301.max_line_length`.
+        """
+        lines = []
+        line = ""
+        for cmd in cmds:
+            if len(cmd) > self.max_line_length:
+                raise ValueError("Command {} is longer than the maximum line "
+                                 "length.".format(cmd))
+            if not line:
+                line = cmd
+            elif len(line) + 1 + len(cmd) <= self.max_line_length:
+                line += ";" + cmd
+            else:
+                lines.append(line)
+                line = cmd
+        if line:
+            lines.append(line)
+        return lines
+
     def run_program(self, program_id):
         """
         Runs a previously defined user program with a given program ID.
@@ -293,6 +579,167 @@ class NewportESP301(Instrument):
                              "1 to 100 (inclusive).")
         self._newport_cmd("EX", target=program_id)
 
+    # MOTION ##
+
+    def move_group(self, targets, absolute=True):
+        """
+        Starts moving several axes at once. All of the moves are sent to the
+        controller in a single transmission, along with queries of the
+        current position and velocity of each axis which are used to estimate
+        when the moves will be complete.
+
+        For instance:
+
+        >>> controller = NewportESP301.open_serial("COM3")
+        >>> move = controller.move_group({0: 1 * pq.mm, 1: 2 * pq.mm})
+        >>> positions = move.result(timeout=10 * pq.s)
+
+        :param dict targets: Positions to move to, keyed by the axes to move,
+            given either as `NewportESP301Axis` objects or as their
+            zero-based indices.
+        :param bool absolute: If `True`, the positions are interpreted as
+            relative to the zero-point of the encoder of each axis. If
+            `False`, they are interpreted as relative to the current position
+            of each axis.
+        :return: Object which can be used to wait for the moves to complete.
+        :rtype: `NewportESP301GroupMove`
+        """
+        moves = []
+        for key, position in targets.items():
+            if isinstance(key, NewportESP301Axis):
+                axis = key
+            else:
+                axis = self.axis[key]
+            # pylint: disable=protected-access
+            position = float(assume_units(position, axis._units).rescale(
+                axis._units).magnitude)
+            moves.append((axis, position))
+        if not moves:
+            raise ValueError("No axes were given to move.")
+        moves.sort(key=lambda move: move[0].axis_id)
+
+        cmds = []
+        for axis, _ in moves:
+            cmds.append("{}TP?".format(axis.axis_id))
+            cmds.append("{}VA?".format(axis.axis_id))
+        for axis, position in moves:
+            cmds.append("{}{}{}".format(
+                axis.axis_id, "PA" if absolute else "PR", position
+            ))
+        values = list(map(float, self._execute_cmd(";".join(cmds)).split(",")))
+        if len(values) != 2 * len(moves):
+            raise IOError("Expected {} values from the controller, got "
+                          "{}.".format(2 * len(moves), len(values)))
+
+        duration = 0
+        for idx, (_, position) in enumerate(moves):
+            current, velocity = values[2 * idx], values[2 * idx + 1]
+            distance = abs(position - current) if absolute else abs(position)
+            if velocity > 0:
+                duration = max(duration, distance / velocity)
+
+        return NewportESP301GroupMove(
+            self, [axis for axis, _ in moves], duration
+        )
+
+
+class NewportESP301GroupMove(object):
+
+    """
+    Represents moves of several axes of an ESP-301 controller, in the manner
+    of a future. This class should not be instantiated by the user directly,
+    but is returned by `NewportESP301.move_group`.
+
+    Whether all of the axes have stopped is checked with a single query of
+    the controller. When waiting, the moves are not checked until shortly
+    before they are expected to complete, after which they are checked with
+    an increasing interval.
+    """
+
+    #: Fraction of the expected duration of the moves which is waited for
+    #: before checking whether they are complete.
+    settle_fraction = 0.9
+
+    def __init__(self, controller, axes, expected_duration):
+        self._controller = controller
+        self._axes = axes
+        self._expected_end = time() + expected_duration
+        self._done = False
+
+    @property
+    def axes(self):
+        """
+        Gets the axes being moved.
+
+        :type: `list` of `NewportESP301Axis`
+        """
+        return list(self._axes)
+
+    def done(self):
+        """
+        Returns whether all of the axes have stopped moving.
+
+        :rtype: `bool`
+        """
+        if not self._done:
+            # pylint: disable=protected-access
+            resp = self._controller._execute_cmd(";".join(
+                "{}MD?".format(axis.axis_id) for axis in self._axes
+            ))
+            self._done = all(bool(int(value)) for value in resp.split(","))
+        return self._done
+
+    def wait(self, timeout=None):
+        """
+        Blocks until all of the axes have stopped moving.
+
+        :param timeout: Maximum amount of time to wait before raising an
+            `IOError`. If `None`, this method will wait indefinitely. Assumed
+            to be in units of seconds if not specified.
+        :type timeout: `~quantities.Quantity`, `float` or `None`
+        """
+        if self._done:
+            return
+        if timeout is None:
+            timeout = float("inf")
+        else:
+            timeout = float(assume_units(timeout, pq.s).rescale(
+                pq.s).magnitude)
+        start = time()
+        # pylint: disable=protected-access
+        if not self._controller._testing:
+            settle = self.settle_fraction * (self._expected_end - start)
+            if settle > 0:
+                sleep(min(settle, timeout))
+        poll_until(
+            self.done,
+            timeout=max(timeout - (time() - start), 0),
+            interval=0.005,
+            max_interval=0.1
+        )
+
+    def result(self, timeout=None):
+        """
+        Blocks until all of the axes have stopped moving, then returns their
+        positions.
+
+        :param timeout: Maximum amount of time to wait before raising an
+            `IOError`. If `None`, this method will wait indefinitely. Assumed
+            to be in units of seconds if not specified.
+        :type timeout: `~quantities.Quantity`, `float` or `None`
+        :return: Positions of the axes, keyed by their zero-based indices.
+        :rtype: `dict` of `~quantities.Quantity`
+        """
+        self.wait(timeout)
+        # pylint: disable=protected-access
+        resp = self._controller._execute_cmd(";".join(
+            "{}TP?".format(axis.axis_id) for axis in self._axes
+        ))
+        return dict(
+            (axis.axis_id - 1, assume_units(float(value), axis._units))
+            for axis, value in zip(self._axes, resp.split(","))
+        )
+
 
 # pylint: disable=too-many-public-methods,too-many-instance-attributes
 class NewportESP301Axis(object):
@@ -303,6 +750,11 @@ class NewportESP301Axis(object):
     instantiated by the user directly, but is
     returned by `NewportESP301.axis`.
     """
+    # Axes track their units locally, refreshing them lazily after the
+    # controller is reset, so are reused between accesses of
+    # `NewportESP301.axis` to keep that state.
+    cache_proxy = True
+
     # quantities micro inch
     micro_inch = pq.UnitQuantity('micro-inch', pq.inch / 1e6, symbol='uin')
 
@@ -334,7 +786,11 @@ class NewportESP301Axis(object):
         self._controller = controller
         self._axis_id = axis_id + 1
 
-        self._units = self.units
+        # The units of the axis are tracked locally, and only change when
+        # set through this class. They are read from the controller when
+        # first needed, unless already known from axis discovery.
+        self._unit_num = None
+        self._unit_generation = None
 
     # CONTEXT MANAGERS ##
 
@@ -344,31 +800,86 @@ class NewportESP301Axis(object):
         Sets the units for the corresponding axis to a those given by an integer
         label (see `NewportESP301Units`), ensuring that the units are properly
         reset at the completion of the context manager.
+
+        No commands are sent if the axis is already using the given units.
         """
         old_units = self._get_units()
+        if NewportESP301Units(int(units)) == old_units:
+            yield
+            return
         self._set_units(units)
-        yield
-        self._set_units(old_units)
+        try:
+            yield
+        finally:
+            self._set_units(old_units)
 
     # PRIVATE METHODS ##
 
-    def _get_units(self):
+    def _record_units(self, unit_num):
+        """
+        Records the units in use by this axis, as known by the controller
+        at the time of the call.
+
+        :param NewportESP301Units unit_num: Units now in use by the axis.
+        """
+        # pylint: disable=protected-access
+        self._unit_num = NewportESP301Units(int(unit_num))
+        self._unit_generation = self._controller._units_generation
+
+        # Keep the units found by axis discovery up to date.
+        axis_info = self._controller._axis_info
+        if axis_info is not None and self.axis_id - 1 in axis_info:
+            axis_info[self.axis_id - 1] = (
+                axis_info[self.axis_id - 1][0],
+                self._unit_num
+            )
+
+    def _get_units(self, refresh=False):
         """
         Returns the integer label for the current units set for this axis.
 
+        The locally recorded units are returned if they are still valid;
+        otherwise they are taken from axis discovery, or read from the
+        controller.
+
+        :param bool refresh: If `True`, the units are always read from the
+            controller.
+
         .. seealso::
             NewportESP301Units
         """
-        return NewportESP301Units(
-            int(self._newport_cmd("SN?", target=self.axis_id))
-        )
+        # pylint: disable=protected-access
+        controller = self._controller
+        if (not refresh and self._unit_num is not None and
+                self._unit_generation == controller._units_generation):
+            return self._unit_num
+
+        axis_info = controller._axis_info
+        if not refresh and axis_info is not None and \
+                self.axis_id - 1 in axis_info:
+            self._record_units(axis_info[self.axis_id - 1][1])
+        else:
+            self._record_units(
+                int(self._newport_cmd("SN?", target=self.axis_id))
+            )
+        return self._unit_num
 
     def _set_units(self, new_units):
-        return self._newport_cmd(
+        resp = self._newport_cmd(
             "SN",
             target=self.axis_id,
             params=[int(new_units)]
         )
+        self._record_units(new_units)
+        return resp
+
+    @property
+    def _units(self):
+        """
+        Gets the units of the axis as a `~quantities.Quantity`, as tracked
+        by `NewportESP301Axis._get_units`.
+        """
+        return self._get_pq_unit(self._get_units())
 
     # PROPERTIES ##
 
@@ -693,7 +1204,7 @@ class NewportESP301Axis(object):
         :type: `~quantities.Quantity` or `float`
         """
         return assume_units(
-            float(self._newport_cmd("DP?", target=self.axis_id)),
+            float(self._newport_cmd("DV?", target=self.axis_id)),
             self._units / pq.s
         )
 
@@ -725,21 +1236,22 @@ class NewportESP301Axis(object):
         """
         Get the units that all commands are in reference to.
 
+        The units are tracked locally, so that reading them does not
+        normally require communicating with the controller. If the units
+        may have been changed by other means, such as the front panel, use
+        `NewportESP301Axis.refresh_units`.
+
         :type: `~quantities.Quantity` with units corresponding to
             units of axis connected  or int which corresponds to Newport
             unit number
         """
-        self._units = self._get_pq_unit(self._get_units())
         return self._units
 
     @units.setter
     def units(self, newval):
         if newval is None:
             return
-        if isinstance(newval, int):
-            self._units = self._get_pq_unit(NewportESP301Units(int(newval)))
-        elif isinstance(newval, pq.Quantity):
-            self._units = newval
+        if isinstance(newval, pq.Quantity):
             newval = self._get_unit_num(newval)
         self._set_units(newval)
 
@@ -1125,10 +1637,7 @@ class NewportESP301Axis(object):
         if wait:
             self.wait_for_position(position)
             if block:
-                sleep(0.003)
-                mot = self.is_motion_done
-                while not mot:
-                    mot = self.is_motion_done
+                self.wait_for_motion()
 
     def move_to_hardware_limit(self):
         """
@@ -1194,8 +1703,9 @@ class NewportESP301Axis(object):
         #        be ignored.
         poll_interval = float(assume_units(poll_interval, pq.s).rescale(
             pq.s).magnitude)
-        max_wait = float(assume_units(max_wait, pq.s).rescale(
-            pq.s).magnitude)
+        if max_wait is not None:
+            max_wait = float(assume_units(max_wait, pq.s).rescale(
+                pq.s).magnitude)
         tic = time()
         while True:
             if self.is_motion_done:
@@ -1300,6 +1810,52 @@ class NewportESP301Axis(object):
         self._newport_cmd("SM")
         return self.read_setup()
 
+    def _read_bulk(self, queries):
+        """
+        Reads the units of the axis and several other values using as few
+        transactions with the controller as possible, rather than one
+        transaction (and error check) per value. The queries are joined into
+        lines of at most `NewportESP301.max_line_length` characters.
+
+        :param queries: Tuples of the name of each value, the query command
+            for it, and a function converting the response to that command
+            given the units of the axis.
+        :return: Dictionary of the values read, including the units.
+        :rtype: `dict`
+        """
+        cmds = ["{}SN?".format(self.axis_id)] + [
+            "{}{}".format(self.axis_id, cmd) for _, cmd, _ in queries
+        ]
+        values = []
+        # pylint: disable=protected-access
+        for line in self._controller._join_commands(cmds):
+            resp = self._controller._execute_cmd(line)
+            line_values = [value.strip() for value in resp.split(",")]
+            expected = line.count(";") + 1
+            if len(line_values) != expected:
+                raise IOError("Expected {} values from the controller, got "
+                              "{}.".format(expected, len(line_values)))
+            values.extend(line_values)
+
+        self._record_units(int(values[0]))
+        units = self._units
+        result = {'units': units}
+        for (name, _, convert), value in zip(queries, values[1:]):
+            result[name] = convert(value, units)
+        return result
+
+    def refresh_units(self):
+        """
+        Reads the units of this axis from the controller, replacing the
+        locally tracked units. This is only needed if the units have been
+        changed other than through this class, for instance from the front
+        panel of the controller.
+
+        :return: The units of the axis.
+        :rtype: `~quantities.Quantity`
+        """
+        return self._get_pq_unit(self._get_units(refresh=True))
+
     def read_setup(self):
         """
         Returns dictionary containing:
@@ -1330,40 +1886,12 @@ class NewportESP301Axis(object):
             'trajectory'
             'hardware_limit_configuration'
 
+        The values are read with as few transactions with the controller as
+        the maximum line length allows.
+
         :rtype: dict of `quantities.Quantity`, float and int
         """
-
-        config = dict()
-        config['units'] = self.units
-        config['motor_type'] = self.motor_type
-        config['feedback_configuration'] = self.feedback_configuration
-        config['full_step_resolution'] = self.full_step_resolution
-        config[
-            'position_display_resolution'] = self.position_display_resolution
-        config['current'] = self.current
-        config['max_velocity'] = self.max_velocity
-        config['encoder_resolution'] = self.encoder_resolution
-        config['acceleration'] = self.acceleration
-        config['deceleration'] = self.deceleration
-        config['velocity'] = self.velocity
-        config['max_acceleration'] = self.max_acceleration
-        config['homing_velocity'] = self.homing_velocity
-        config['jog_high_velocity'] = self.jog_high_velocity
-        config['jog_low_velocity'] = self.jog_low_velocity
-        config['estop_deceleration'] = self.estop_deceleration
-        config['jerk'] = self.jerk
-        # config['error_threshold'] = self.error_threshold
-        config['proportional_gain'] = self.proportional_gain
-        config['derivative_gain'] = self.derivative_gain
-        config['integral_gain'] = self.integral_gain
-        config['integral_saturation_gain'] = self.integral_saturation_gain
-        config['home'] = self.home
-        config['microstep_factor'] = self.microstep_factor
-        config['acceleration_feed_forward'] = self.acceleration_feed_forward
-        config['trajectory'] = self.trajectory
-        config[
-            'hardware_limit_configuration'] = self.hardware_limit_configuration
-        return config
+        return self._read_bulk(_SETUP_QUERIES)
 
     def get_status(self):
         """
@@ -1374,16 +1902,12 @@ class NewportESP301Axis(object):
             'desired_velocity'
             'is_motion_done'
 
+        The values are read with as few transactions with the controller as
+        the maximum line length allows.
+
         :rtype: dict
         """
-        status = dict()
-        status['units'] = self.units
-        status['position'] = self.position
-        status['desired_position'] = self.desired_position
-        status['desired_velocity'] = self.desired_velocity
-        status['is_motion_done'] = self.is_motion_done
-
-        return status
+        return self._read_bulk(_STATUS_QUERIES)
 
     @staticmethod
     def _get_pq_unit(num):
@@ -544,3 +544,4 @@ class LM(Instrument):
         Reset the laser controller.
         """
         self.sendcmd("reset")
+        self._settings_reset()
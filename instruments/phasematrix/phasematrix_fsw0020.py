@@ -41,6 +41,7 @@ class PhaseMatrixFSW0020(SingleChannelSG):
         :math:`5 \mu\text{s}`.
         """
         self.sendcmd('0E.')
+        self._settings_reset()
 
     @property
     def frequency(self):
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing the cache of the property values of an instrument
+"""
+
+# IMPORTS #####################################################################
+
+from __future__ import absolute_import
+from __future__ import division
+
+import time
+
+from enum import Enum
+import quantities as pq
+
+# CLASSES #####################################################################
+
+
+class CacheMode(Enum):
+    """
+    Enum containing the ways in which the value of a property created by the
+    property factories may be cached by a `PropertyCache`.
+    """
+    #: The value can change at any time, for example a measurement, and is
+    #: never cached.
+    volatile = "volatile"
+    #: The value only changes when set through InstrumentKit. It is cached
+    #: until the instrument is reset, the cache entry expires, or it is
+    #: invalidated.
+    settable = "settable"
+    #: The value never changes, for example a serial number. It is cached
+    #: until it is explicitly invalidated.
+    static = "static"
+
+
+class PropertyCache(object):
+    """
+    Stores the last known values of the properties of an instrument that
+    were created by the property factories, so that reading them does not
+    require a round trip to the instrument. Getters return the cached value
+    if present, and setters write through to both the instrument and the
+    cache.
+
+    The cache can also be used to suppress writes which would not change
+    the state of the instrument. When enabled, a setter compares the command
+    it would send, after unit rescaling and formatting, against the last
+    command sent for that property, or the command which would set the value
+    last read from the instrument, and skips the transmission if they are
+    the same. This is useful in sweep loops which re-assert the same range
+    or mode at every step.
+
+    Both are disabled by default, as they assume that settings are not
+    changed by front-panel interaction or by other programs. Each
+    `~instruments.Instrument` has its own cache, which can be enabled with:
+
+    >>> inst.property_cache.enabled = True # doctest: +SKIP
+    >>> inst.property_cache.suppress_writes = True # doctest: +SKIP
+
+    Caching can also be enabled for only some properties, by adding their
+    command names to `PropertyCache.enabled_keys`.
+
+    :param bool enabled: Whether values are cached.
+    :param ttl: Time after which `CacheMode.settable` entries expire, or
+        `None` if they never expire. Assumed to be in units of seconds if
+        not specified.
+    :type ttl: `~quantities.Quantity`, `float` or `None`
+    :param bool suppress_writes: Whether writes which would not change the
+        state of the instrument are skipped.
+    """
+
+    def __init__(self, enabled=False, ttl=None, suppress_writes=False):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.suppress_writes = suppress_writes
+        #: Number of writes that have been skipped because they would not
+        #: have changed the state of the instrument.
+        self.suppressed_writes = 0
+        #: Command names of the properties whose values are cached even if
+        #: caching is not enabled for all properties.
+        self.enabled_keys = set()
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        try:
+            self.lookup(key)
+        except KeyError:
+            return False
+        return True
+
+    def caches(self, key):
+        """
+        Returns whether values of the given key are cached, which is the
+        case if caching is enabled for all properties or for this key.
+
+        :param str key: Command name of the property.
+        :rtype: `bool`
+        """
+        return self.enabled or key in self.enabled_keys
+
+    def tracks(self, key):
+        """
+        Returns whether the cache is keeping track of the state of the
+        given key, which is the case if either its values are cached or
+        suppression of writes is enabled.
+
+        :param str key: Command name of the property.
+        :rtype: `bool`
+        """
+        return self.suppress_writes or self.caches(key)
+
+    @property
+    def ttl(self):
+        """
+        Gets/sets the time after which `CacheMode.settable` entries expire,
+        or `None` if they never expire.
+
+        :units: As specified, or assumed to be of units seconds
+        :type: `~quantities.Quantity` or `None`
+        """
+        return None if self._ttl is None else self._ttl * pq.second
+
+    @ttl.setter
+    def ttl(self, newval):
+        if newval is not None and not isinstance(newval, pq.Quantity):
+            newval = pq.Quantity(newval, pq.second)
+        self._ttl = None if newval is None else \
+            float(newval.rescale(pq.second).magnitude)
+
+    def lookup(self, key):
+        """
+        Gets the cached value for the given key.
+
+        :param str key: Command name of the property.
+        :raises KeyError: If there is no valid cached value for ``key``.
+        """
+        return self._entry(key)[0]
+
+    def last_command(self, key):
+        """
+        Gets the command that would set the given key to its last known
+        value, which is either the last command sent or the command matching
+        the last value read, or `None` if it is not known.
+
+        :param str key: Command name of the property.
+        :rtype: `str` or `None`
+        """
+        try:
+            return self._entry(key)[3]
+        except KeyError:
+            return None
+
+    def update(self, key, value, mode=CacheMode.settable, command=None):
+        """
+        Stores a new value for the given key.
+
+        :param str key: Command name of the property.
+        :param value: The last known value of the property.
+        :param mode: How the value may be cached.
+        :type mode: `CacheMode`
+        :param str command: The command which sets the value, or `None` if
+            it is not known.
+        """
+        if mode is not CacheMode.volatile:
+            self._entries[key] = (value, mode, time.time(), command)
+
+    def _entry(self, key):
+        entry = self._entries[key]
+        if entry[1] is CacheMode.settable and self._ttl is not None and \
+                time.time() - entry[2] > self._ttl:
+            del self._entries[key]
+            raise KeyError(key)
+        return entry
+
+    def invalidate(self, key=None):
+        """
+        Removes the cached value for the given key, or all cached values if
+        ``key`` is `None`.
+
+        :param str key: Command name of the property.
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def reset(self):
+        """
+        Removes all `CacheMode.settable` values, as is needed after the
+        instrument has been reset to its default settings.
+        `CacheMode.static` values are kept.
+        """
+        for key, entry in list(self._entries.items()):
+            if entry[1] is CacheMode.settable:
+                del self._entries[key]
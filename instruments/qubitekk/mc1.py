@@ -17,7 +17,7 @@ import quantities as pq
 
 from instruments.abstract_instruments import Instrument
 from instruments.util_fns import (
-    int_property, enum_property, unitful_property, assume_units
+    int_property, enum_property, unitful_property, assume_units, CacheMode
 )
 
 # CLASSES #####################################################################
@@ -199,7 +199,8 @@ class MC1(Instrument):
         doc="""
         Get the motor controller type.
         """,
-        readonly=True
+        readonly=True,
+        cache=CacheMode.static
     )
 
     @property
@@ -9,6 +9,7 @@ Provides support for the SRS CTC-100 cryogenic temperature controller.
 from __future__ import absolute_import
 from __future__ import division
 from contextlib import contextmanager
+import time
 from builtins import range
 
 from enum import Enum
@@ -18,7 +19,8 @@ import numpy as np
 
 
 from instruments.generic_scpi import SCPIInstrument
-from instruments.util_fns import ProxyList
+from instruments.error_policy import ErrorCheckMode
+from instruments.util_fns import ProxyList, assume_units
 
 # CLASSES #####################################################################
 
@@ -28,11 +30,20 @@ class SRSCTC100(SCPIInstrument):
     """
     Communicates with a Stanford Research Systems CTC-100 cryogenic temperature
     controller.
+
+    Errors are checked for after every command by default. This can be
+    changed through `~instruments.Instrument.error_policy`.
     """
 
+    _default_error_check_mode = ErrorCheckMode.immediate
+
     def __init__(self, filelike):
         super(SRSCTC100, self).__init__(filelike)
         self._do_errcheck = True
+        self._channel_cache_ttl = None
+        self._channel_names_cache = None
+        self._channel_units_cache = None
+        self._channel_cache_time = None
 
     # DICTIONARIES #
 
@@ -111,6 +122,7 @@ class SRSCTC100(SCPIInstrument):
             # TODO: check for errors!
             self._chan_name = newval
             self._rem_name = newval.replace(" ", "")
+            self._ctc.refresh_channels()
 
         # BASICS #
 
@@ -242,11 +254,29 @@ class SRSCTC100(SCPIInstrument):
             ]
             return pq.Quantity(point[0], 'ms'), pq.Quantity(point[1], units)
 
-        def get_log(self):
+        def get_log(self, start=0, block_size=8, progress=None):
             """
             Gets all of the log data points currently saved in the instrument
             memory.
 
+            Points are requested in blocks of ``block_size``, with each block
+            being sent to the instrument before any of the replies are read,
+            and errors are only checked for once all points have been read.
+            The block size is kept small by default so that the queued
+            requests fit in the input buffer of the instrument.
+
+            The log can only be stepped through from its first point, so
+            ``start`` does not allow an interrupted transfer to be resumed
+            with less traffic: the points before it are still read from the
+            instrument, and are only left out of the returned arrays.
+
+            :param int start: Index of the first log point to return. Points
+                before it are read from the instrument and discarded.
+            :param int block_size: Number of log points requested from the
+                instrument at a time.
+            :param callable progress: If not `None`, called after each block
+                has been read with the number of points read so far and the
+                total number of points in the log.
             :return: Tuple of all the log data points. First value is time,
                 second is the measurement value.
             :rtype: Tuple of 2x `~quantities.Quantity`, each comprised of
@@ -258,27 +288,52 @@ class SRSCTC100(SCPIInstrument):
             # Find out how many points there are.
             n_points = int(
                 self._ctc.query('getLog.xy? {}'.format(self._chan_name)))
+            if start < 0 or start > n_points:
+                raise ValueError("Start index must be between 0 and the "
+                                 "number of log points, {}.".format(n_points))
+            if block_size < 1:
+                raise ValueError("Block size must be at least 1.")
 
-            # Make an empty quantity that size for the times and for the channel
+            # Make empty arrays of that size for the times and for the channel
             # values.
-            ts = pq.Quantity(np.empty((n_points,)), 'ms')
-            temps = pq.Quantity(np.empty((n_points,)), units)
+            ts = np.empty((n_points - start,))
+            temps = np.empty((n_points - start,))
 
-            # Reset the position to the first point, then save it.
+            # Position at the first point, then read the rest in order.
             # pylint: disable=protected-access
             with self._ctc._error_checking_disabled():
-                ts[0], temps[0] = self.get_log_point('first', units)
-                for idx in range(1, n_points):
-                    ts[idx], temps[idx] = self.get_log_point('next', units)
+                for block_start in range(0, n_points, block_size):
+                    block_end = min(block_start + block_size, n_points)
+                    for idx in range(block_start, block_end):
+                        self._ctc.sendcmd('getLog.xy {}, {}'.format(
+                            self._chan_name, 'first' if idx == 0 else 'next'))
+                    for idx in range(block_start, block_end):
+                        point = self._ctc.read().split(',')
+                        if idx >= start:
+                            ts[idx - start] = float(point[0])
+                            temps[idx - start] = float(point[1])
+                    if progress is not None:
+                        progress(block_end, n_points)
 
             # Do an actual error check now.
             if self._ctc.error_check_toggle:
                 self._ctc.errcheck()
 
-            return ts, temps
+            return pq.Quantity(ts, 'ms'), pq.Quantity(temps, units)
 
     # PRIVATE METHODS ##
 
+    def _channel_cache_valid(self):
+        """
+        Returns `True` if the cached channel names and units may be used.
+        """
+        if self._channel_cache_time is None:
+            return False
+        if self._channel_cache_ttl is None:
+            return True
+        age = time.time() - self._channel_cache_time
+        return age <= float(self._channel_cache_ttl.magnitude)
+
     def _channel_names(self):
         """
         Returns the names of valid channels, using the ``getOutput.names``
@@ -287,8 +342,21 @@ class SRSCTC100(SCPIInstrument):
 
         Note that ``getOutput`` also lists input channels, confusingly enough.
 
+        The names are cached, see `SRSCTC100.refresh_channels`.
+
         .. _CTC-100 manual: http://www.thinksrs.com/downloads/PDFs/Manuals/CTC100m.pdf
         """
+        if not self._channel_cache_valid():
+            self.refresh_channels()
+        if self._channel_names_cache is None:
+            self._channel_names_cache = self._query_channel_names()
+            self._channel_cache_time = time.time()
+        return list(self._channel_names_cache)
+
+    def _query_channel_names(self):
+        """
+        Queries the instrument for the names of valid channels.
+        """
         # We need to split apart the comma-separated list and make sure that
         # no newlines or other whitespace gets carried along for the ride.
         # Note that we do NOT strip spaces here, as this is done inside
@@ -311,16 +379,38 @@ class SRSCTC100(SCPIInstrument):
         are presented the same way by the instrument, and so both are reported
         using `pq.dimensionless`.
 
+        The units are cached along with the channel names, see
+        `SRSCTC100.refresh_channels`.
+
         :rtype: `dict` with channel names as keys and units as values
         """
-        unit_strings = [
-            unit_str.strip()
-            for unit_str in self.query('getOutput.units?').split(',')
-        ]
-        return dict(
-            (chan_name, self._UNIT_NAMES[unit_str])
-            for chan_name, unit_str in zip(self._channel_names(), unit_strings)
-        )
+        names = self._channel_names()
+        if self._channel_units_cache is None:
+            unit_strings = [
+                unit_str.strip()
+                for unit_str in self.query('getOutput.units?').split(',')
+            ]
+            self._channel_units_cache = dict(
+                (chan_name, self._UNIT_NAMES[unit_str])
+                for chan_name, unit_str in zip(names, unit_strings)
+            )
+        return dict(self._channel_units_cache)
+
+    def refresh_channels(self):
+        """
+        Discards the cached channel names and units, such that they are
+        queried from the instrument the next time they are needed. This is
+        done automatically when a channel is renamed through
+        `SRSCTC100.Channel.name`, but must be done by hand if channels are
+        renamed or their units are changed in any other way, unless
+        `SRSCTC100.channel_cache_ttl` is set.
+        """
+        self._channel_names_cache = None
+        self._channel_units_cache = None
+        self._channel_cache_time = None
+
+    def _error_check(self):
+        self.errcheck()
 
     def errcheck(self):
         """
@@ -330,7 +420,8 @@ class SRSCTC100(SCPIInstrument):
 
         :return: Nothing
         """
-        errs = super(SRSCTC100, self).query('geterror?').strip()
+        with self._error_checking_disabled():
+            errs = self.query('geterror?').strip()
         err_code, err_descript = errs.split(',')
         err_code = int(err_code)
         if err_code == 0:
@@ -342,8 +433,10 @@ class SRSCTC100(SCPIInstrument):
     def _error_checking_disabled(self):
         old = self._do_errcheck
         self._do_errcheck = False
-        yield
-        self._do_errcheck = old
+        try:
+            yield
+        finally:
+            self._do_errcheck = old
 
     # PROPERTIES ##
     @property
@@ -356,14 +449,31 @@ class SRSCTC100(SCPIInstrument):
         can change by the user.
 
         The list of current valid channel names can be accessed by the
-        `SRSCTC100._channel_names()` function.
+        `SRSCTC100._channel_names()` function. These names are cached, see
+        `SRSCTC100.refresh_channels`.
 
         :type: `SRSCTC100.Channel`
         """
-        # Note that since the names can change, we need to query channel names
-        # each time. This is inefficient, but alas.
         return ProxyList(self, self.Channel, self._channel_names())
 
+    @property
+    def channel_cache_ttl(self):
+        """
+        Gets/sets how long cached channel names and units are used for before
+        they are queried from the instrument again. If `None`, the cache does
+        not expire, and is only discarded by `SRSCTC100.refresh_channels`.
+
+        :units: As specified, or assumed to be of units seconds.
+        :type: `~quantities.Quantity` or `None`
+        """
+        return self._channel_cache_ttl
+
+    @channel_cache_ttl.setter
+    def channel_cache_ttl(self, newval):
+        if newval is not None:
+            newval = assume_units(newval, pq.second).rescale(pq.second)
+        self._channel_cache_ttl = newval
+
     @property
     def display_figures(self):
         """
@@ -398,18 +508,11 @@ class SRSCTC100(SCPIInstrument):
 
     # OVERRIDEN METHODS #
 
-    # We override sendcmd() and query() to do error checking after each
-    # command.
-    def sendcmd(self, cmd):
-        super(SRSCTC100, self).sendcmd(cmd)
-        if self._do_errcheck:
-            self.errcheck()
-
-    def query(self, cmd, size=-1):
-        resp = super(SRSCTC100, self).query(cmd, size)
+    # We override _command_checked() so that error checking can be turned
+    # off entirely with error_check_toggle.
+    def _command_checked(self, cmd):
         if self._do_errcheck:
-            self.errcheck()
-        return resp
+            super(SRSCTC100, self)._command_checked(cmd)
 
     # LOGGING COMMANDS #
 
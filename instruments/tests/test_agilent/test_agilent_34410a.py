@@ -78,6 +78,20 @@ def test_agilent34410a_fetch():
         unit_eq(data[1], 5.27150000E-03 * pq.volt)
 
 
+def test_agilent34410a_fetch_raw_numeric():
+    with expected_protocol(
+        ik.agilent.Agilent34410a,
+        [
+            "FETC?"
+        ], [
+            "+4.27150000E-03,5.27150000E-03"
+        ]
+    ) as dmm:
+        with dmm.raw_numeric_mode():
+            data = dmm.fetch()
+        assert data == [4.27150000E-03, 5.27150000E-03]
+
+
 def test_agilent34410a_read_data():
     with expected_protocol(
         ik.agilent.Agilent34410a,
@@ -19,6 +19,7 @@ from nose.tools import raises
 import mock
 
 import numpy as np
+import quantities as pq
 
 import instruments as ik
 from instruments.tests import expected_protocol
@@ -29,6 +30,7 @@ from instruments.abstract_instruments.comm import (
     USBTMCCommunicator, VXI11Communicator, serial_manager, SerialCommunicator
 )
 from instruments.errors import AcknowledgementError, PromptError
+from instruments.util_fns import unitful_property
 
 # TESTS ######################################################################
 
@@ -74,6 +76,28 @@ def test_instrument_binblockread_too_many_reads():
     _ = inst.binblockread(2)
 
 
+def test_instrument_binblockread_indefinite_length():
+    with expected_protocol(
+        ik.Instrument,
+        [],
+        [
+            b"#0\x00\x00\x00\x01\x00\x02\x00\x03\x00\x04",
+        ],
+        sep="\n"
+    ) as inst:
+        np.testing.assert_array_equal(
+            inst.binblockread(2, fmt=">h", count=5), [0, 1, 2, 3, 4]
+        )
+
+
+@raises(IOError)
+def test_instrument_binblockread_indefinite_length_no_count():
+    inst = ik.Instrument.open_test()
+    inst._file.read_raw = mock.MagicMock(side_effect=[b"#", b"0"])
+
+    _ = inst.binblockread(2)
+
+
 @raises(IOError)
 def test_instrument_binblockread_bad_block_start():
     inst = ik.Instrument.open_test()
@@ -784,3 +808,212 @@ def test_instrument_prompt():
 
     inst.prompt = None
     assert inst.prompt is None
+
+
+def test_instrument_raw_numeric_mode():
+    class RawInstrument(ik.Instrument):
+        voltage = unitful_property("VOLT", pq.volt)
+
+    with expected_protocol(
+        RawInstrument,
+        [
+            "VOLT?",
+            "VOLT?",
+            "VOLT?"
+        ],
+        [
+            "1.5",
+            "2.5",
+            "3.5"
+        ]
+    ) as inst:
+        assert not inst.raw_numeric
+        assert inst.voltage == 1.5 * pq.volt
+        with inst.raw_numeric_mode():
+            assert inst.raw_numeric
+            value = inst.voltage
+            assert isinstance(value, float)
+            assert value == 2.5
+        assert not inst.raw_numeric
+        inst.raw_numeric = True
+        assert inst.voltage == 3.5
+        assert inst.property_units("voltage") == pq.volt
+
+
+@raises(TypeError)
+def test_instrument_raw_numeric_wrong_type():
+    inst = ik.Instrument.open_test()
+    inst.raw_numeric = 1
+
+
+@raises(ValueError)
+def test_instrument_property_units_not_unitful():
+    inst = ik.Instrument.open_test()
+    _ = inst.property_units("timeout")
+
+
+class ErrorCheckedInstrument(ik.Instrument):
+
+    def _error_check(self):
+        code = int(self.query("ERR?"))
+        if code != 0:
+            raise IOError("Error {}".format(code))
+
+    def _error_pending(self):
+        return self.query("STAT?") == "1"
+
+    def sendcmd(self, cmd):
+        super(ErrorCheckedInstrument, self).sendcmd(cmd)
+        self._command_checked(cmd)
+
+
+def test_instrument_error_policy_disabled_by_default():
+    with expected_protocol(
+        ErrorCheckedInstrument,
+        [
+            "A"
+        ],
+        []
+    ) as inst:
+        assert inst.error_policy.mode is ik.util_fns.ErrorCheckMode.disabled
+        inst.sendcmd("A")
+
+
+def test_instrument_error_policy_immediate():
+    with expected_protocol(
+        ErrorCheckedInstrument,
+        [
+            "A",
+            "ERR?",
+            "B",
+            "ERR?"
+        ],
+        [
+            "0",
+            "0"
+        ]
+    ) as inst:
+        inst.error_policy.mode = "immediate"
+        inst.sendcmd("A")
+        inst.sendcmd("B")
+
+
+def test_instrument_error_policy_sampled():
+    with expected_protocol(
+        ErrorCheckedInstrument,
+        [
+            "A",
+            "B",
+            "ERR?",
+            "C"
+        ],
+        [
+            "0"
+        ]
+    ) as inst:
+        inst.error_policy.mode = ik.util_fns.ErrorCheckMode.sampled
+        inst.error_policy.interval = 2
+        inst.sendcmd("A")
+        inst.sendcmd("B")
+        inst.sendcmd("C")
+        assert inst.error_policy.pending == ["C"]
+
+
+def test_instrument_error_policy_status():
+    with expected_protocol(
+        ErrorCheckedInstrument,
+        [
+            "A",
+            "STAT?",
+            "B",
+            "STAT?",
+            "ERR?"
+        ],
+        [
+            "0",
+            "1",
+            "3"
+        ]
+    ) as inst:
+        inst.error_policy.mode = ik.util_fns.ErrorCheckMode.status
+        inst.sendcmd("A")
+        try:
+            inst.sendcmd("B")
+        except IOError as err:
+            assert err.commands == ["B"]
+        else:
+            assert False, "Error was not raised."
+
+
+def test_instrument_deferred_error_checking():
+    with expected_protocol(
+        ErrorCheckedInstrument,
+        [
+            "A",
+            "B",
+            "ERR?",
+            "C",
+            "ERR?"
+        ],
+        [
+            "2",
+            "0"
+        ]
+    ) as inst:
+        inst.error_policy.mode = ik.util_fns.ErrorCheckMode.immediate
+        try:
+            with inst.deferred_error_checking():
+                inst.sendcmd("A")
+                inst.sendcmd("B")
+        except IOError as err:
+            assert err.commands == ["A", "B"]
+            assert err.command == "A"
+        else:
+            assert False, "Error was not raised."
+        assert inst.error_policy.mode is ik.util_fns.ErrorCheckMode.immediate
+        inst.sendcmd("C")
+
+
+def test_instrument_deferred_error_checking_block_raises():
+    with expected_protocol(
+        ErrorCheckedInstrument,
+        [
+            "A"
+        ],
+        []
+    ) as inst:
+        try:
+            with inst.deferred_error_checking():
+                inst.sendcmd("A")
+                raise ValueError
+        except ValueError:
+            pass
+        else:
+            assert False, "Error was not raised."
+        assert inst.error_policy.pending == []
+
+
+def test_instrument_error_checking_unsupported():
+    class UncheckedInstrument(ik.Instrument):
+
+        def sendcmd(self, cmd):
+            super(UncheckedInstrument, self).sendcmd(cmd)
+            self._command_checked(cmd)
+
+    with expected_protocol(
+        UncheckedInstrument,
+        [
+            "A"
+        ],
+        []
+    ) as inst:
+        inst.error_policy.mode = ik.util_fns.ErrorCheckMode.status
+        with inst.deferred_error_checking():
+            inst.sendcmd("A")
+        inst.check_errors()
+
+
+@raises(ValueError)
+def test_instrument_error_policy_bad_interval():
+    inst = ik.Instrument.open_test()
+    inst.error_policy.interval = 0
@@ -222,6 +222,21 @@ def test_hp3456a_count():
         assert dmm.count == +10
 
 
+def test_hp3456a_register_read_retries():
+    with expected_protocol(
+        ik.hp.HP3456a,
+        [
+            "HO0T4SO1",
+            "REC",
+        ], [
+            "",
+            "+10.00000E+0"
+        ],
+        sep="\r"
+    ) as dmm:
+        assert dmm.count == +10
+
+
 def test_hp3456a_mean():
     with expected_protocol(
         ik.hp.HP3456a,
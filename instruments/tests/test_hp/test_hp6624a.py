@@ -74,6 +74,23 @@ def test_channel_voltage():
         hp.channel[0].voltage = 5 * pq.V
 
 
+def test_channel_voltage_raw_numeric():
+    with expected_protocol(
+        ik.hp.HP6624a,
+        [
+            "VSET? 1"
+        ],
+        [
+            "2"
+        ],
+        sep="\n"
+    ) as hp:
+        with hp.raw_numeric_mode():
+            value = hp.channel[0].voltage
+        assert value == 2
+        assert not isinstance(value, pq.Quantity)
+
+
 def test_channel_current():
     with expected_protocol(
         ik.hp.HP6624a,
@@ -8,7 +8,9 @@ Unit tests for the HP 6632b power supply
 
 from __future__ import absolute_import
 
+import numpy as np
 import quantities as pq
+from nose.tools import raises
 
 import instruments as ik
 from instruments.tests import expected_protocol, make_name_test, unit_eq
@@ -237,6 +239,45 @@ def test_hp6632b_sense_sweep_interval():
         psu.sense_sweep_interval = 1e-05 * pq.second
 
 
+def test_hp6632b_measure_current_array():
+    with expected_protocol(
+        ik.hp.HP6632b,
+        [
+            "SENS:SWE:POIN {:e}".format(3),
+            "SENS:SWE:TINT {:e}".format(5e-05),
+            "MEAS:ARR:CURR?"
+        ], [
+            "1.0e-03,2.0e-03,+3.0e-03"
+        ]
+    ) as psu:
+        data = psu.measure_current_array(
+            points=3,
+            interval=50 * pq.microsecond
+        )
+        assert data.units == pq.amp
+        np.testing.assert_array_almost_equal(data.magnitude, [1e-3, 2e-3, 3e-3])
+
+
+def test_hp6632b_measure_voltage_array():
+    with expected_protocol(
+        ik.hp.HP6632b,
+        [
+            "MEAS:ARR:VOLT?"
+        ], [
+            "1.5,2.5"
+        ]
+    ) as psu:
+        data = psu.measure_voltage_array()
+        assert data.units == pq.volt
+        np.testing.assert_array_almost_equal(data.magnitude, [1.5, 2.5])
+
+
+@raises(ValueError)
+def test_hp6632b_measure_current_array_too_many_points():
+    psu = ik.hp.HP6632b.open_test()
+    psu.measure_current_array(points=4097)
+
+
 def test_hp6632b_sense_window():
     with expected_protocol(
         ik.hp.HP6632b,
@@ -327,6 +368,53 @@ def test_hp6632b_abort_output_trigger():
         psu.abort_output_trigger()
 
 
+def test_hp6632b_voltage_mode():
+    with expected_protocol(
+        ik.hp.HP6632b,
+        [
+            "VOLT:MODE?",
+            "VOLT:MODE LIST"
+        ], [
+            "FIX"
+        ]
+    ) as psu:
+        assert psu.voltage_mode == psu.OutputMode.fixed
+        psu.voltage_mode = psu.OutputMode.list
+
+
+def test_hp6632b_configure_list():
+    with expected_protocol(
+        ik.hp.HP6632b,
+        [
+            "LIST:VOLT {:e},{:e},{:e}".format(1, 2, 3),
+            "LIST:CURR {:e}".format(0.5),
+            "LIST:DWEL {:e},{:e},{:e}".format(0.01, 0.02, 0.03),
+            "LIST:COUN 2",
+            "LIST:STEP AUTO",
+            "VOLT:MODE LIST",
+            "CURR:MODE LIST"
+        ], []
+    ) as psu:
+        psu.configure_list(
+            voltage=[1, 2, 3] * pq.volt,
+            current=500 * pq.milliamp,
+            dwell=[10, 20, 30] * pq.millisecond,
+            count=2
+        )
+
+
+@raises(ValueError)
+def test_hp6632b_configure_list_length_mismatch():
+    psu = ik.hp.HP6632b.open_test()
+    psu.configure_list(voltage=[1, 2, 3], current=[1, 2])
+
+
+@raises(ValueError)
+def test_hp6632b_configure_list_no_setpoints():
+    psu = ik.hp.HP6632b.open_test()
+    psu.configure_list(dwell=[1, 2, 3])
+
+
 def test_hp6632b_check_error_queue():
     with expected_protocol(
         ik.hp.HP6632b,
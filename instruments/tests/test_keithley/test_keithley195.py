@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the Keithley 195 digital multimeter
+"""
+
+# IMPORTS #####################################################################
+
+from __future__ import absolute_import
+
+import quantities as pq
+from nose.tools import raises, eq_
+
+import instruments as ik
+from instruments.tests import expected_protocol
+
+# TESTS #######################################################################
+
+
+def _status_word(mode):
+    return "195 0{}0000000000000000".format(mode)
+
+
+def test_measure_same_mode():
+    with expected_protocol(
+        ik.keithley.Keithley195,
+        [
+            "YX",
+            "G1DX",
+            "U0DX"
+        ], [
+            _status_word(2),
+            "+1.234500E+3"
+        ]
+    ) as dmm:
+        assert dmm.measure(dmm.Mode.resistance) == 1234.5 * pq.ohm
+
+
+def test_measure_waits_for_settled_reading():
+    with expected_protocol(
+        ik.keithley.Keithley195,
+        [
+            "YX",
+            "G1DX",
+            "U0DX",
+            "F2DX"
+        ], [
+            _status_word(0),
+            "",
+            "",
+            "+1.234500E+3"
+        ]
+    ) as dmm:
+        assert dmm.measure(dmm.Mode.resistance) == 1234.5 * pq.ohm
+
+
+def test_measure_returns_overflow():
+    with expected_protocol(
+        ik.keithley.Keithley195,
+        [
+            "YX",
+            "G1DX",
+            "U0DX",
+            "F2DX"
+        ], [
+            _status_word(0),
+            "+9.999990E+9"
+        ]
+    ) as dmm:
+        dmm.settle_timeout = 0
+        assert dmm.measure(dmm.Mode.resistance) == 9.99999e9 * pq.ohm
+
+
+@raises(IOError)
+def test_measure_settle_timeout():
+    with expected_protocol(
+        ik.keithley.Keithley195,
+        [
+            "YX",
+            "G1DX",
+            "U0DX",
+            "F2DX"
+        ], [
+            _status_word(0)
+        ]
+    ) as dmm:
+        dmm.settle_timeout = 0.01
+        dmm.measure(dmm.Mode.resistance)
+
+
+def test_measure_raw_numeric():
+    with expected_protocol(
+        ik.keithley.Keithley195,
+        [
+            "YX",
+            "G1DX"
+        ], [
+            "+1.234500E+3"
+        ]
+    ) as dmm:
+        with dmm.raw_numeric_mode():
+            eq_(dmm.measure(), 1234.5)
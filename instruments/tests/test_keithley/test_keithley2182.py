@@ -149,6 +149,20 @@ def test_fetch():
         )
 
 
+def test_fetch_raw_numeric():
+    with expected_protocol(
+        ik.keithley.Keithley2182,
+        [
+            "FETC?"
+        ],
+        [
+            "1.234,1,5.678"
+        ]
+    ) as inst:
+        inst.raw_numeric = True
+        assert inst.fetch() == [1.234, 1, 5.678]
+
+
 def test_measure():
     with expected_protocol(
         ik.keithley.Keithley2182,
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the Keithley 580 micro-ohmmeter
+"""
+
+# IMPORTS #####################################################################
+
+from __future__ import absolute_import
+
+from nose.tools import raises, eq_
+
+import instruments as ik
+from instruments.tests import expected_protocol
+
+# TESTS #######################################################################
+
+
+def test_get_status_word_retries():
+    with expected_protocol(
+        ik.keithley.Keithley580,
+        [
+            "Y:X:",
+            "U0X:",
+            ":",
+            "U0X:",
+            ":"
+        ], [
+            ":",
+            "5800123456:"
+        ]
+    ) as dmm:
+        eq_(dmm.get_status_word(), "580012345")
+
+
+@raises(IOError)
+def test_get_status_word_timeout():
+    with expected_protocol(
+        ik.keithley.Keithley580,
+        [
+            "Y:X:",
+            "U0X:",
+            ":"
+        ], [
+            "garbage:"
+        ]
+    ) as dmm:
+        dmm.settle_timeout = 0
+        dmm.get_status_word()
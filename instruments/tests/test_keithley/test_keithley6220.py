@@ -8,7 +8,11 @@ Unit tests for the Keithley 6220 constant current supply
 
 from __future__ import absolute_import
 
+import struct
+
+import numpy as np
 import quantities as pq
+from nose.tools import raises
 
 import instruments as ik
 from instruments.tests import expected_protocol
@@ -47,3 +51,163 @@ def test_disable():
         []
     ) as inst:
         inst.disable()
+
+
+def test_nanovoltmeter_present():
+    with expected_protocol(
+        ik.keithley.Keithley6220,
+        [
+            "SOUR:DELT:NVPR?"
+        ],
+        [
+            "1"
+        ]
+    ) as inst:
+        assert inst.nanovoltmeter_present is True
+
+
+def test_configure_delta():
+    with expected_protocol(
+        ik.keithley.Keithley6220,
+        [
+            "SOUR:DELT:NVPR?",
+            "SOUR:DELT:HIGH {:e}".format(0.001),
+            "SOUR:DELT:LOW {:e}".format(-0.002),
+            "SOUR:DELT:DEL {:e}".format(0.01),
+            "SOUR:DELT:COUN 100",
+            "SOUR:DELT:CAB ON",
+            "TRAC:POIN 100",
+            "SOUR:DELT:ARM"
+        ],
+        [
+            "1"
+        ]
+    ) as inst:
+        inst.configure_delta(
+            1 * pq.milliamp,
+            low=-2 * pq.milliamp,
+            delay=10 * pq.millisecond,
+            count=100,
+            compliance_abort=True
+        )
+
+
+@raises(IOError)
+def test_configure_delta_no_nanovoltmeter():
+    with expected_protocol(
+        ik.keithley.Keithley6220,
+        [
+            "SOUR:DELT:NVPR?"
+        ],
+        [
+            "0"
+        ]
+    ) as inst:
+        inst.configure_delta(1 * pq.milliamp)
+
+
+@raises(ValueError)
+def test_configure_delta_current_too_high():
+    inst = ik.keithley.Keithley6220.open_test()
+    inst.configure_delta(200 * pq.milliamp)
+
+
+def test_configure_pulse_delta():
+    with expected_protocol(
+        ik.keithley.Keithley6220,
+        [
+            "SOUR:DELT:NVPR?",
+            "SOUR:PDEL:HIGH {:e}".format(0.01),
+            "SOUR:PDEL:LOW {:e}".format(0),
+            "SOUR:PDEL:WIDT {:e}".format(110e-6),
+            "SOUR:PDEL:SDEL {:e}".format(16e-6),
+            "SOUR:PDEL:COUN 10",
+            "SOUR:PDEL:INT 5",
+            "TRAC:POIN 10",
+            "SOUR:PDEL:ARM"
+        ],
+        [
+            "1"
+        ]
+    ) as inst:
+        inst.configure_pulse_delta(10 * pq.milliamp, count=10)
+
+
+def test_configure_list_sweep():
+    with expected_protocol(
+        ik.keithley.Keithley6220,
+        [
+            "SOUR:SWE:SPAC LIST",
+            "SOUR:LIST:CURR {:e},{:e}".format(0.001, 0.002),
+            "SOUR:LIST:DEL {:e},{:e}".format(0.1, 0.1),
+            "SOUR:LIST:COMP {:e},{:e}".format(1, 2),
+            "SOUR:SWE:COUN 3",
+            "SOUR:SWE:ARM",
+            "INIT:IMM"
+        ],
+        []
+    ) as inst:
+        inst.configure_list_sweep(
+            [1, 2] * pq.milliamp,
+            100 * pq.millisecond,
+            compliance=[1, 2] * pq.volt,
+            count=3
+        )
+        inst.init_output_trigger()
+
+
+@raises(ValueError)
+def test_configure_list_sweep_length_mismatch():
+    inst = ik.keithley.Keithley6220.open_test()
+    inst.configure_list_sweep([0.001, 0.002], [0.1, 0.1, 0.1])
+
+
+@raises(ValueError)
+def test_configure_list_sweep_too_many_points():
+    inst = ik.keithley.Keithley6220.open_test()
+    inst.configure_list_sweep(np.zeros(101), 0.1)
+
+
+def test_start_stop_delta():
+    with expected_protocol(
+        ik.keithley.Keithley6220,
+        [
+            "INIT:IMM",
+            "SOUR:SWE:ABOR"
+        ],
+        []
+    ) as inst:
+        inst.start_delta()
+        inst.stop_delta()
+
+
+def test_read_delta():
+    data = struct.pack("<4d", 1e-6, 0.1, 2e-6, 0.2)
+    with expected_protocol(
+        ik.keithley.Keithley6220,
+        [
+            "TRAC:POIN:ACT?",
+            "FORM:ELEM?",
+            "FORM:BORD?",
+            "FORM:DATA?",
+            "FORM:ELEM READ,TST",
+            "FORM:BORD SWAP",
+            "FORM:DATA REAL,64",
+            "TRAC:DATA?",
+            "FORM:ELEM READ",
+            "FORM:BORD NORM",
+            "FORM:DATA ASC"
+        ],
+        [
+            "2",
+            "READ",
+            "NORM",
+            "ASC",
+            b"#0" + data
+        ]
+    ) as inst:
+        readings, timestamps = inst.read_delta()
+        assert readings.units == pq.volt
+        assert timestamps.units == pq.second
+        np.testing.assert_array_equal(readings.magnitude, [1e-6, 2e-6])
+        np.testing.assert_array_equal(timestamps.magnitude, [0.1, 0.2])
@@ -8,6 +8,9 @@ Unit tests for the Keithley 6514 electrometer
 
 from __future__ import absolute_import
 
+import struct
+
+import numpy as np
 import quantities as pq
 from nose.tools import raises
 
@@ -233,3 +236,109 @@ def test_read():
         reading, timestamp = inst.read_measurements()
         assert reading == 1.0 * pq.volt
         assert timestamp == 1234
+
+
+def test_buffer_points():
+    with expected_protocol(
+        ik.keithley.Keithley6514,
+        [
+            "TRACE:POINTS?",
+            "TRACE:POINTS 100"
+        ],
+        [
+            "2500"
+        ]
+    ) as inst:
+        assert inst.buffer_points == 2500
+        inst.buffer_points = 100
+
+
+@raises(ValueError)
+def test_buffer_points_invalid():
+    inst = ik.keithley.Keithley6514.open_test()
+    inst.buffer_points = 2501
+
+
+def test_buffer_count():
+    with expected_protocol(
+        ik.keithley.Keithley6514,
+        [
+            "TRACE:POINTS:ACTUAL?"
+        ],
+        [
+            "42"
+        ]
+    ) as inst:
+        assert inst.buffer_count == 42
+
+
+def test_configure_buffer():
+    with expected_protocol(
+        ik.keithley.Keithley6514,
+        [
+            "TRACE:CLEAR",
+            "TRACE:POINTS 10",
+            "TRIG:COUN 10",
+            "TRACE:FEED SENS",
+            "TRACE:FEED:CONTROL NEXT"
+        ],
+        []
+    ) as inst:
+        inst.configure_buffer(10)
+
+
+def test_read_buffer():
+    data = struct.pack("<6f", 1.5, 0.25, 0, -2.0, 0.5, 16)
+    with expected_protocol(
+        ik.keithley.Keithley6514,
+        [
+            "TRACE:POINTS:ACTUAL?",
+            "FORM:ELEM?",
+            "FORM:BORD?",
+            "FORM:DATA?",
+            "FORM:ELEM READ,TIME,STAT",
+            "FORM:BORD SWAP",
+            "FORM:DATA REAL,32",
+            "TRACE:DATA?",
+            "FORM:ELEM READ",
+            "FORM:BORD NORM",
+            "FORM:DATA ASC"
+        ],
+        [
+            "2",
+            "READ",
+            "NORM",
+            "ASC",
+            b"#0" + data
+        ]
+    ) as inst:
+        values = inst.read_buffer()
+        np.testing.assert_array_equal(values["reading"], [1.5, -2.0])
+        np.testing.assert_array_equal(values["timestamp"], [0.25, 0.5])
+        np.testing.assert_array_equal(values["status"], [0, 16])
+
+
+@raises(IOError)
+def test_read_buffer_bad_header():
+    with expected_protocol(
+        ik.keithley.Keithley6514,
+        [
+            "FORM:ELEM?",
+            "FORM:BORD?",
+            "FORM:DATA?",
+            "FORM:ELEM READ,TIME,STAT",
+            "FORM:BORD SWAP",
+            "FORM:DATA REAL,32",
+            "TRACE:DATA?",
+            "FORM:ELEM READ,TIME",
+            "FORM:BORD SWAP",
+            "FORM:DATA ASC"
+        ],
+        [
+            "READ,TIME",
+            "SWAP",
+            "ASC",
+            "1.0,1234,5678"
+        ]
+    ) as inst:
+        inst.read_buffer(1)
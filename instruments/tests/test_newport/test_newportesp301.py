@@ -8,24 +8,473 @@ Unit tests for the Newport ESP 301 axis controller
 
 from __future__ import absolute_import
 
+from nose.tools import raises, eq_
+import numpy as np
+import quantities as pq
+
 import instruments as ik
 from instruments.tests import expected_protocol
 
 # TESTS #######################################################################
 
+# pylint: disable=protected-access
+
+DISCOVERY_QUERY = "1QM?;1SN?;2QM?;2SN?;3QM?;3SN?"
+
 
 def test_axis_returns_axis_class():
     with expected_protocol(
         ik.newport.NewportESP301,
         [
-            "1SN?",
+            DISCOVERY_QUERY,
             "TB?"  # error check query
         ],
         [
-            "1",
+            "1,2,0,0,0,0",
             "0,0,0"
         ],
         sep="\r"
     ) as inst:
         axis = inst.axis[0]
         assert isinstance(axis, ik.newport.NewportESP301Axis) is True
+        eq_(axis._units, pq.mm)
+
+
+def test_axis_is_reused():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?"
+        ],
+        [
+            "1,2,2,3,0,0",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        axis = inst.axis[0]
+        assert inst.axis[0] is axis
+        second = inst.axis[1]
+        assert second is not axis
+        eq_(second._units, pq.um)
+        inst.axis.invalidate(1)
+        assert inst.axis[1] is not second
+        assert inst.axis[0] is axis
+
+
+def test_discover_axes():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            DISCOVERY_QUERY,
+            "TB?"
+        ],
+        [
+            "1,2,0,0,2,7",
+            "0,0,0",
+            "1,2,1,2,2,7",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        eq_(inst.installed_axes, [0, 2])
+        eq_([axis.axis_id for axis in inst.axis], [1, 3])
+        eq_(inst.axis[2]._units, pq.deg)
+        eq_(inst.discover_axes(), [0, 1, 2])
+        eq_(len(inst.axis), 3)
+
+
+@raises(IndexError)
+def test_axis_not_installed():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        _ = inst.axis[1]
+
+
+@raises(IOError)
+def test_discover_axes_bad_response():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?"
+        ],
+        [
+            "1,2",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.discover_axes()
+
+
+def test_deferred_error_checking():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            "RS",
+            "1QM0",
+            "1QM1",
+            "TB?"
+        ],
+        [
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.reset()
+        with inst.deferred_error_checking():
+            inst._newport_cmd("QM", target=1, params=[0])
+            inst._newport_cmd("QM", target=1, params=[1])
+
+
+def test_axis_get_status():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1SN?;1TP?;1DP?;1DV?;1MD?",
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0",
+            "2,1.5,2.0,0.5,1",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        status = inst.axis[0].get_status()
+        eq_(status, {
+            'units': pq.mm,
+            'position': 1.5 * pq.mm,
+            'desired_position': 2.0 * pq.mm,
+            'desired_velocity': 0.5 * pq.mm / pq.s,
+            'is_motion_done': True
+        })
+
+
+def test_axis_read_setup():
+    setup_lines = [
+        "1SN?;1QM?;1ZB?;1FR?;1FP?;1QI?;1VU?;1SU?;1AC?;1AG?;1VA?;1AU?;"
+        "1OH?;1JH?;1JW?;1AE?",
+        "1JK?;1KP?;1KD?;1KI?;1KS?;1DH?;1QS?;1AF?;1TJ?;1ZH?"
+    ]
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            setup_lines[0],
+            "TB?",
+            setup_lines[1],
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0",
+            "2,1,1AH,0.1,3,0.5,10,0.01,20,20,5,40,2,4,1,50",
+            "0,0,0",
+            "100,1.5x,0.2,0.3,0.4,0,8,0.0,2,24H",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        for line in setup_lines:
+            assert len(line) <= inst.max_line_length
+        setup = inst.axis[0].read_setup()
+        eq_(setup['units'], pq.mm)
+        eq_(setup['motor_type'], ik.newport.newportesp301.NewportESP301MotorType.dc_servo)
+        eq_(setup['feedback_configuration'], 0x1)
+        eq_(setup['full_step_resolution'], 0.1 * pq.mm)
+        eq_(setup['current'], 0.5 * pq.A)
+        eq_(setup['acceleration'], 20 * pq.mm / pq.s**2)
+        eq_(setup['jerk'], 100 * pq.mm / pq.s**3)
+        eq_(setup['proportional_gain'], 1.5)
+        eq_(setup['microstep_factor'], 8)
+        eq_(setup['hardware_limit_configuration'], 2)
+        eq_(len(setup), 26)
+
+
+def test_axis_get_status_max_line_length():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1SN?;1TP?",
+            "TB?",
+            "1DP?;1DV?",
+            "TB?",
+            "1MD?",
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0",
+            "2,1.5",
+            "0,0,0",
+            "2,0.5",
+            "0,0,0",
+            "1",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.max_line_length = 9
+        status = inst.axis[0].get_status()
+        eq_(status['units'], pq.mm)
+        eq_(len(status), 5)
+
+
+@raises(IOError)
+def test_axis_get_status_bad_response():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1SN?;1TP?;1DP?;1DV?;1MD?",
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0",
+            "2,1.5",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.axis[0].get_status()
+
+
+
+def test_axis_units_tracked_locally():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1SN3",
+            "TB?",
+            "1SN0",
+            "TB?",
+            "1TP?",
+            "TB?",
+            "1SN3",
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0",
+            "0,0,0",
+            "0,0,0",
+            "1234",
+            "0,0,0",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        axis = inst.axis[0]
+        eq_(axis.units, pq.mm)
+        axis.units = pq.um
+        eq_(axis.units, pq.um)
+        eq_(inst.axis[0].units, pq.um)
+        with axis._units_of(
+                ik.newport.newportesp301.NewportESP301Units.micrometer):
+            pass
+        eq_(axis.encoder_position, 1234 * pq.count)
+        eq_(axis.units, pq.um)
+
+
+def test_axis_refresh_units():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1SN?",
+            "TB?",
+            "RS",
+            "1SN?",
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0",
+            "3",
+            "0,0,0",
+            "7",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        axis = inst.axis[0]
+        eq_(axis.refresh_units(), pq.um)
+        eq_(axis.units, pq.um)
+        inst.reset()
+        eq_(axis.units, pq.deg)
+
+
+def test_move_group():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1TP?;1VA?;2TP?;2VA?;1PA1.0;2PA0.5",
+            "TB?",
+            "1MD?;2MD?",
+            "TB?",
+            "1MD?;2MD?",
+            "TB?",
+            "1TP?;2TP?",
+            "TB?"
+        ],
+        [
+            "1,2,1,2,0,0",
+            "0,0,0",
+            "0,10,1.5,5",
+            "0,0,0",
+            "1,0",
+            "0,0,0",
+            "1,1",
+            "0,0,0",
+            "1.0,0.5",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        move = inst.move_group({1: 500 * pq.um, inst.axis[0]: 1})
+        eq_([axis.axis_id for axis in move.axes], [1, 2])
+        assert not move.done()
+        eq_(move.result(timeout=1), {0: 1.0 * pq.mm, 1: 0.5 * pq.mm})
+        assert move.done()
+
+
+@raises(ValueError)
+def test_move_group_empty():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [],
+        [],
+        sep="\r"
+    ) as inst:
+        inst.move_group({})
+
+
+def test_axis_move_block():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1PA1.0",
+            "TB?",
+            "1WP1.0",
+            "TB?",
+            "1MD?",
+            "TB?",
+            "1MD?",
+            "TB?"
+        ],
+        [
+            "1,2,0,0,0,0",
+            "0,0,0",
+            "0,0,0",
+            "0,0,0",
+            "0",
+            "0,0,0",
+            "1",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.axis[0].move(1, wait=True, block=True)
+
+
+def test_upload_trajectory():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "1XX",
+            "TB?",
+            "1EP",
+            "1VA2;1PA1;2VA2;2PA0.5;1WS;2WS;WT10",
+            "1VA2;1PA2;2VA2;2PA1.5;1WS;2WS;WT10",
+            "QP",
+            "TB?"
+        ],
+        [
+            "1,2,1,2,0,0",
+            "0,0,0",
+            "0,0,0",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.max_line_length = 35
+        lines = inst.upload_trajectory(
+            1, [0, 1],
+            np.array([[1, 0.5], [2, 1.5]]) * pq.mm,
+            velocities=2,
+            dwell=10 * pq.ms
+        )
+        eq_(len(lines), 2)
+
+
+def test_upload_trajectory_single_axis():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?",
+            "2XX",
+            "TB?",
+            "2EP",
+            "1PA1000;1WS;1PA2000;1WS;WT5",
+            "QP",
+            "TB?"
+        ],
+        [
+            "1,3,0,0,0,0",
+            "0,0,0",
+            "0,0,0",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.upload_trajectory(2, 0, [1, 2] * pq.mm, dwell=[0, 0.005])
+
+
+@raises(ValueError)
+def test_upload_trajectory_wrong_shape():
+    with expected_protocol(
+        ik.newport.NewportESP301,
+        [
+            DISCOVERY_QUERY,
+            "TB?"
+        ],
+        [
+            "1,2,1,2,0,0",
+            "0,0,0"
+        ],
+        sep="\r"
+    ) as inst:
+        inst.upload_trajectory(1, [0, 1], [1, 2, 3])
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing tests for caching of property factory values
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+
+import time
+
+from enum import Enum
+from nose.tools import eq_
+import quantities as pq
+
+from instruments import Instrument
+from instruments.tests import expected_protocol
+from instruments.util_fns import (
+    CacheMode, PropertyCache, bool_property, enum_property, int_property,
+    string_property, unitful_property, unitless_property
+)
+from . import MockInstrument
+
+# TEST CASES #################################################################
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class CachedMock(MockInstrument):
+
+    def __init__(self, responses=None):
+        super(CachedMock, self).__init__(responses)
+        self._property_cache = PropertyCache(enabled=True)
+
+
+def test_property_cache_disabled_by_default():
+    class UnitfulMock(CachedMock):
+        unitful = unitful_property('MOCK', pq.volt)
+
+    mock_inst = UnitfulMock({'MOCK?': '1'})
+    mock_inst._property_cache.enabled = False
+
+    eq_(mock_inst.unitful, 1 * pq.volt)
+    eq_(mock_inst.unitful, 1 * pq.volt)
+    eq_(mock_inst.value, 'MOCK?\nMOCK?\n')
+
+
+def test_property_cache_getter():
+    class UnitfulMock(CachedMock):
+        unitful = unitful_property('MOCK', pq.volt)
+
+    mock_inst = UnitfulMock({'MOCK?': '1'})
+
+    eq_(mock_inst.unitful, 1 * pq.volt)
+    eq_(mock_inst.unitful, 1 * pq.volt)
+    eq_(mock_inst.value, 'MOCK?\n')
+
+
+def test_property_cache_setter_writes_through():
+    class Mode(Enum):
+        a = "A"
+        b = "B"
+
+    class CacheMock(CachedMock):
+        boolean = bool_property('BOOL', 'ON', 'OFF')
+        enum = enum_property('ENUM', Mode)
+        integer = int_property('INT')
+        unitless = unitless_property('UNITLESS')
+        unitful = unitful_property('UNITFUL', pq.volt)
+        string = string_property('STRING')
+
+    mock_inst = CacheMock()
+
+    mock_inst.boolean = True
+    mock_inst.enum = Mode.b
+    mock_inst.integer = 3
+    mock_inst.unitless = 2
+    mock_inst.unitful = 500 * pq.millivolt
+    mock_inst.string = 'foo'
+
+    eq_(mock_inst.boolean, True)
+    eq_(mock_inst.enum, Mode.b)
+    eq_(mock_inst.integer, 3)
+    eq_(mock_inst.unitless, 2.0)
+    eq_(mock_inst.unitful, 0.5 * pq.volt)
+    eq_(mock_inst.unitful.units, pq.volt)
+    eq_(mock_inst.string, 'foo')
+    eq_(mock_inst.value,
+        'BOOL ON\nENUM B\nINT 3\nUNITLESS {:e}\nUNITFUL {:e}\n'
+        'STRING "foo"\n'.format(2, 0.5))
+
+
+def test_property_cache_volatile():
+    class UnitfulMock(CachedMock):
+        unitful = unitful_property('MOCK', pq.volt, cache=CacheMode.volatile)
+        readonly = unitful_property('MEAS', pq.volt, readonly=True)
+
+    mock_inst = UnitfulMock({'MOCK?': '1', 'MEAS?': '2'})
+
+    mock_inst.unitful = 1 * pq.volt
+    eq_(mock_inst.unitful, 1 * pq.volt)
+    eq_(mock_inst.readonly, 2 * pq.volt)
+    eq_(mock_inst.readonly, 2 * pq.volt)
+    eq_(mock_inst.value, 'MOCK {:e}\nMOCK?\nMEAS?\nMEAS?\n'.format(1))
+
+
+def test_property_cache_static_readonly():
+    class IntMock(CachedMock):
+        serial = int_property('SER', readonly=True, cache=CacheMode.static)
+
+    mock_inst = IntMock({'SER?': '1234'})
+
+    eq_(mock_inst.serial, 1234)
+    mock_inst._property_cache.reset()
+    eq_(mock_inst.serial, 1234)
+    eq_(mock_inst.value, 'SER?\n')
+
+
+def test_property_cache_reset_keeps_static():
+    cache = PropertyCache(enabled=True)
+    cache.update('A', 1, CacheMode.settable)
+    cache.update('B', 2, CacheMode.static)
+    cache.update('C', 3, CacheMode.volatile)
+    eq_(len(cache), 2)
+
+    cache.reset()
+    assert 'A' not in cache
+    assert 'B' in cache
+
+    cache.invalidate()
+    eq_(len(cache), 0)
+
+
+def test_property_cache_ttl():
+    cache = PropertyCache(enabled=True, ttl=1 * pq.millisecond)
+    eq_(cache.ttl, 0.001 * pq.second)
+    cache.update('A', 1, CacheMode.settable)
+    cache.update('B', 2, CacheMode.static)
+    time.sleep(0.01)
+    assert 'A' not in cache
+    assert 'B' in cache
+
+
+def test_instrument_property_cache_reset_and_invalidate():
+    class CacheInstrument(Instrument):
+        unitful = unitful_property('MOCK', pq.volt)
+
+    with expected_protocol(
+        CacheInstrument,
+        [
+            "MOCK?",
+            "*RST",
+            "MOCK?",
+            "MOCK?"
+        ],
+        [
+            "1",
+            "2",
+            "3"
+        ]
+    ) as inst:
+        assert not inst.property_cache.enabled
+        inst.property_cache.enabled = True
+        eq_(inst.unitful, 1 * pq.volt)
+        eq_(inst.unitful, 1 * pq.volt)
+        inst.sendcmd("*RST")
+        eq_(inst.unitful, 2 * pq.volt)
+        inst.invalidate_cache("unitful")
+        eq_(inst.unitful, 3 * pq.volt)
+        eq_(inst.unitful, 3 * pq.volt)
+
+
+def test_instrument_property_cache_driver_reset():
+    class CacheInstrument(Instrument):
+        unitful = unitful_property('MOCK', pq.volt)
+
+        def reset(self):
+            self.sendcmd("RS")
+            self._settings_reset()
+
+    with expected_protocol(
+        CacheInstrument,
+        [
+            "MOCK?",
+            "RS",
+            "MOCK?",
+            "*RCL 1",
+            "MOCK?"
+        ],
+        [
+            "1",
+            "2",
+            "3"
+        ]
+    ) as inst:
+        inst.property_cache.enabled = True
+        eq_(inst.unitful, 1 * pq.volt)
+        inst.reset()
+        eq_(inst.unitful, 2 * pq.volt)
+        inst.sendcmd("*RCL 1")
+        eq_(inst.unitful, 3 * pq.volt)
+
+
+def test_property_cache_suppress_writes():
+    class Mode(Enum):
+        a = "A"
+        b = "B"
+
+    class CacheMock(CachedMock):
+        unitful = unitful_property('UNITFUL', pq.volt)
+        enum = enum_property('ENUM', Mode)
+
+    mock_inst = CacheMock()
+    mock_inst._property_cache.enabled = False
+    mock_inst._property_cache.suppress_writes = True
+
+    mock_inst.unitful = 1 * pq.volt
+    mock_inst.unitful = 1000 * pq.millivolt
+    mock_inst.unitful = 1
+    mock_inst.unitful = 2 * pq.volt
+    mock_inst.enum = Mode.a
+    mock_inst.enum = "a"
+    mock_inst.enum = Mode.b
+
+    eq_(mock_inst._property_cache.suppressed_writes, 3)
+    eq_(mock_inst.value,
+        'UNITFUL {:e}\nUNITFUL {:e}\nENUM A\nENUM B\n'.format(1, 2))
+
+
+def test_property_cache_suppress_writes_after_read():
+    class UnitfulMock(CachedMock):
+        unitful = unitful_property('MOCK', pq.volt)
+
+    mock_inst = UnitfulMock({'MOCK?': '2'})
+    mock_inst._property_cache.enabled = False
+    mock_inst._property_cache.suppress_writes = True
+
+    mock_inst.unitful = 1 * pq.volt
+    eq_(mock_inst.unitful, 2 * pq.volt)
+    mock_inst.unitful = 1 * pq.volt
+
+    eq_(mock_inst._property_cache.suppressed_writes, 0)
+    eq_(mock_inst.value, 'MOCK {:e}\nMOCK?\nMOCK {:e}\n'.format(1, 1))
+
+
+def test_property_cache_suppress_writes_of_read_value():
+    class UnitfulMock(CachedMock):
+        unitful = unitful_property('MOCK', pq.volt)
+
+    mock_inst = UnitfulMock({'MOCK?': '2'})
+    mock_inst._property_cache.enabled = False
+    mock_inst._property_cache.suppress_writes = True
+
+    eq_(mock_inst.unitful, 2 * pq.volt)
+    mock_inst.unitful = 2000 * pq.millivolt
+    mock_inst.unitful = 1 * pq.volt
+
+    eq_(mock_inst._property_cache.suppressed_writes, 1)
+    eq_(mock_inst.value, 'MOCK?\nMOCK {:e}\n'.format(1))
+
+
+def test_property_cache_suppress_writes_volatile():
+    class UnitfulMock(CachedMock):
+        unitful = unitful_property('MOCK', pq.volt, cache=CacheMode.volatile)
+
+    mock_inst = UnitfulMock()
+    mock_inst._property_cache.suppress_writes = True
+
+    mock_inst.unitful = 1 * pq.volt
+    mock_inst.unitful = 1 * pq.volt
+
+    eq_(mock_inst._property_cache.suppressed_writes, 0)
+    eq_(mock_inst.value, 'MOCK {:e}\nMOCK {:e}\n'.format(1, 1))
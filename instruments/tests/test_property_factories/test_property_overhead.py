@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing tests bounding the work done by the property factories on
+each access, as timed by doc/examples/ex_property_benchmark.py
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+
+from enum import Enum
+
+import mock
+from nose.tools import eq_
+import quantities as pq
+
+from instruments.util_fns import (
+    bool_property, enum_property, int_property, string_property,
+    unitful_property, unitless_property
+)
+from . import MockInstrument
+
+# TEST CASES #################################################################
+
+# pylint: disable=missing-docstring
+
+ACCESSES = 10
+
+
+class OverheadMode(Enum):
+    a = "A"
+
+
+class OverheadMock(MockInstrument):
+    boolean = bool_property("BOOL", "1", "0")
+    enum = enum_property("ENUM", OverheadMode)
+    integer = int_property("INT")
+    unitless = unitless_property("UNITLESS")
+    unitful = unitful_property("UNITFUL", pq.volt)
+    string = string_property("STRING")
+
+
+RESPONSES = {
+    "BOOL?": "1",
+    "ENUM?": "A",
+    "INT?": "3",
+    "UNITLESS?": "1.5",
+    "UNITFUL?": "+1.500000E+00",
+    "STRING?": '"foo"',
+}
+
+
+def test_property_getters_precomputed():
+    def check(prop, query):
+        mock_inst = OverheadMock(RESPONSES)
+        with mock.patch("instruments.util_fns._resolve_decoration") as \
+                resolve, \
+                mock.patch("instruments.util_fns.split_unit_str") as split:
+            for _ in range(ACCESSES):
+                getattr(mock_inst, prop)
+            assert not resolve.called
+            assert not split.called
+        # Exactly one round trip per access.
+        eq_(mock_inst.value, "{}\n".format(query) * ACCESSES)
+
+    for prop, query in [
+            ("boolean", "BOOL?"),
+            ("enum", "ENUM?"),
+            ("integer", "INT?"),
+            ("unitless", "UNITLESS?"),
+            ("unitful", "UNITFUL?"),
+            ("string", "STRING?")
+    ]:
+        check(prop, query)
+
+
+def test_property_setters_one_command():
+    def check(prop, value, cmd):
+        mock_inst = OverheadMock()
+        with mock.patch("instruments.util_fns._resolve_decoration") as resolve:
+            for _ in range(ACCESSES):
+                setattr(mock_inst, prop, value)
+            assert not resolve.called
+        eq_(mock_inst.value, "{}\n".format(cmd) * ACCESSES)
+
+    for prop, value, cmd in [
+            ("integer", 3, "INT 3"),
+            ("unitful", 1 * pq.volt, "UNITFUL {:e}".format(1))
+    ]:
+        check(prop, value, cmd)
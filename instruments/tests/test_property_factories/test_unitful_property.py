@@ -8,6 +8,7 @@ Module containing tests for the unitful property factories
 
 from __future__ import absolute_import
 
+import mock
 from nose.tools import raises, eq_
 import quantities as pq
 
@@ -242,3 +243,49 @@ def test_unitful_property_split_str():
     value = mock_inst.unitful_property
     assert value.magnitude == 1000
     assert value.units == pq.hertz
+
+
+def test_unitful_property_raw_numeric():
+    class UnitfulMock(MockInstrument):
+        unitful_property = unitful_property('MOCK', units=pq.volt)
+
+    mock_inst = UnitfulMock({'MOCK?': '500 mV'})
+    mock_inst._raw_numeric = True
+
+    value = mock_inst.unitful_property
+    assert isinstance(value, float)
+    eq_(value, 0.5)
+    eq_(UnitfulMock.unitful_property.fget.units, pq.volt)
+
+    mock_inst.unitful_property = 1000 * pq.millivolt
+    eq_(mock_inst.value, 'MOCK?\nMOCK {:e}\n'.format(1))
+
+
+@raises(ValueError)
+def test_unitful_property_raw_numeric_validates_setter():
+    class UnitfulMock(MockInstrument):
+        unitful_property = unitful_property('MOCK', units=pq.volt,
+                                            valid_range=(0, 10))
+
+    mock_inst = UnitfulMock()
+    mock_inst._raw_numeric = True
+    mock_inst.unitful_property = 11
+
+
+def test_unitful_property_numeric_reply_fast_path():
+    class UnitfulMock(MockInstrument):
+        unitful = unitful_property("MOCK", pq.volt)
+
+    mock_inst = UnitfulMock({"MOCK?": "+1.500000E+00"})
+    with mock.patch("instruments.util_fns.split_unit_str") as split:
+        eq_(mock_inst.unitful, 1.5 * pq.volt)
+        assert not split.called
+
+
+def test_unitful_property_unit_reply_slow_path():
+    class UnitfulMock(MockInstrument):
+        unitful = unitful_property("MOCK", pq.volt)
+
+    mock_inst = UnitfulMock({"MOCK?": "1500 mV"})
+    eq_(mock_inst.unitful, 1.5 * pq.volt)
+    eq_(mock_inst.unitful.units, pq.volt)
@@ -8,12 +8,13 @@ Module containing tests for the util_fns.split_unit_str utility function
 
 from __future__ import absolute_import
 
+import numpy as np
 import quantities as pq
 
 from nose.tools import raises, eq_
 
 from instruments.util_fns import (
-    split_unit_str
+    lookup_units, split_unit_str, split_unit_str_list
 )
 
 # TEST CASES #################################################################
@@ -148,3 +149,79 @@ def test_split_unit_str_only_units():
     I expect the function to raise a ValueError.
     """
     _ = split_unit_str("foobars")
+
+
+def test_split_unit_str_bare_float():
+    """
+    split_unit_str: Given a bare number, including special values, I expect
+    the output to be the number and the default units.
+    """
+    mag, units = split_unit_str(" +1.500000E+00\r", default_units="foobars")
+    eq_(mag, 1.5)
+    eq_(units, "foobars")
+    mag, units = split_unit_str("inf")
+    eq_(mag, float("inf"))
+    eq_(units, pq.dimensionless)
+
+
+def test_split_unit_str_list_bare_floats():
+    """
+    split_unit_str_list: Given a comma-separated list of numbers, I expect an
+    array of the numbers and the default units.
+    """
+    mag, units = split_unit_str_list("1,2.5,-3E1", default_units="foobars")
+    np.testing.assert_array_equal(mag, [1, 2.5, -30])
+    eq_(units, "foobars")
+
+
+def test_split_unit_str_list_with_units():
+    """
+    split_unit_str_list: Given a list of values with units, I expect an
+    array of the magnitudes and the units of the list.
+    """
+    mag, units = split_unit_str_list("1 foobars;2 foobars", sep=";")
+    np.testing.assert_array_equal(mag, [1, 2])
+    eq_(units, "foobars")
+
+
+def test_split_unit_str_list_mixed_units():
+    """
+    split_unit_str_list: Given a list of values in differing units, I expect
+    all magnitudes to be rescaled to the units of the first value.
+    """
+    mag, units = split_unit_str_list("1 V, 500 mV, 2", pq.volt)
+    np.testing.assert_array_almost_equal(mag, [1, 0.5, 2])
+    eq_(units, "V")
+    eq_(pq.Quantity(mag, units)[1], 0.5 * pq.volt)
+
+
+def test_split_unit_str_list_bare_and_unitful():
+    """
+    split_unit_str_list: Given a list mixing bare numbers and values with
+    units and no default units, I expect the bare numbers to be taken in the
+    units of the list.
+    """
+    mag, units = split_unit_str_list("2, 1 mV,3")
+    np.testing.assert_array_equal(mag, [2, 1, 3])
+    eq_(units, "mV")
+    mag, units = split_unit_str_list("2, 1 mV", lookup=lookup_units)
+    np.testing.assert_array_equal(mag, [2, 1])
+    eq_(units, pq.mV)
+
+
+@raises(ValueError)
+def test_split_unit_str_list_bad_item():
+    """
+    split_unit_str_list: Given a list containing an item without a number,
+    I expect the function to raise a ValueError.
+    """
+    _ = split_unit_str_list("1 V,foobars")
+
+
+@raises(ValueError)
+def test_split_unit_str_list_trailing_separator():
+    """
+    split_unit_str_list: Given a list ending with a separator, I expect the
+    function to raise a ValueError.
+    """
+    _ = split_unit_str_list("1 V,2 V,")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing tests for the SRS CTC-100
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+
+import time
+
+from nose.tools import eq_
+import quantities as pq
+
+import instruments as ik
+from instruments.tests import expected_protocol
+
+# TESTS ######################################################################
+
+# pylint: disable=protected-access
+
+
+def test_srsctc100_channel_names_cached():
+    with expected_protocol(
+        ik.srs.SRSCTC100,
+        [
+            "getOutput.names?",
+            "geterror?",
+            "In1.value?",
+            "geterror?",
+            "getOutput.units?",
+            "geterror?",
+            "Out1.value?",
+            "geterror?"
+        ],
+        [
+            "In 1, Out 1",
+            "0,NO ERROR",
+            "4.2",
+            "0,NO ERROR",
+            "\xb0C, W",
+            "0,NO ERROR",
+            "1.5",
+            "0,NO ERROR"
+        ]
+    ) as ctc:
+        eq_(ctc.channel["In 1"].value, pq.Quantity(4.2, pq.celsius))
+        eq_(ctc.channel["Out 1"].value, pq.Quantity(1.5, pq.watt))
+
+
+def test_srsctc100_channel_rename_refreshes():
+    with expected_protocol(
+        ik.srs.SRSCTC100,
+        [
+            "getOutput.names?",
+            "geterror?",
+            'In1.name = "Sample"',
+            "geterror?",
+            "getOutput.names?",
+            "geterror?"
+        ],
+        [
+            "In 1, Out 1",
+            "0,NO ERROR",
+            "0,NO ERROR",
+            "Sample, Out 1",
+            "0,NO ERROR"
+        ]
+    ) as ctc:
+        ctc.channel["In 1"].name = "Sample"
+        eq_(ctc._channel_names(), ["Sample", "Out 1"])
+
+
+def test_srsctc100_refresh_channels():
+    with expected_protocol(
+        ik.srs.SRSCTC100,
+        [
+            "getOutput.names?",
+            "geterror?",
+            "getOutput.names?",
+            "geterror?"
+        ],
+        [
+            "In 1",
+            "0,NO ERROR",
+            "In 2",
+            "0,NO ERROR"
+        ]
+    ) as ctc:
+        eq_(ctc._channel_names(), ["In 1"])
+        eq_(ctc._channel_names(), ["In 1"])
+        ctc.refresh_channels()
+        eq_(ctc._channel_names(), ["In 2"])
+
+
+def test_srsctc100_channel_cache_ttl():
+    with expected_protocol(
+        ik.srs.SRSCTC100,
+        [
+            "getOutput.names?",
+            "geterror?",
+            "getOutput.names?",
+            "geterror?"
+        ],
+        [
+            "In 1",
+            "0,NO ERROR",
+            "In 2",
+            "0,NO ERROR"
+        ]
+    ) as ctc:
+        eq_(ctc.channel_cache_ttl, None)
+        ctc.channel_cache_ttl = 1 * pq.millisecond
+        eq_(ctc.channel_cache_ttl, 0.001 * pq.second)
+        eq_(ctc._channel_names(), ["In 1"])
+        time.sleep(0.01)
+        eq_(ctc._channel_names(), ["In 2"])
+
+
+def test_srsctc100_channel_get_log():
+    progress = []
+    with expected_protocol(
+        ik.srs.SRSCTC100,
+        [
+            "getOutput.names?",
+            "geterror?",
+            "getOutput.units?",
+            "geterror?",
+            "getLog.xy? In 1",
+            "geterror?",
+            "getLog.xy In 1, first",
+            "getLog.xy In 1, next",
+            "getLog.xy In 1, next",
+            "geterror?"
+        ],
+        [
+            "In 1",
+            "0,NO ERROR",
+            "\xb0C",
+            "0,NO ERROR",
+            "3",
+            "0,NO ERROR",
+            "0, 4.0",
+            "1000, 4.5",
+            "2000, 5.0",
+            "0,NO ERROR"
+        ]
+    ) as ctc:
+        ts, temps = ctc.channel["In 1"].get_log(
+            block_size=2,
+            progress=lambda done, total: progress.append((done, total))
+        )
+        eq_(ts.units, pq.ms)
+        eq_(temps.units, pq.celsius)
+        eq_(list(ts.magnitude), [0, 1000, 2000])
+        eq_(list(temps.magnitude), [4.0, 4.5, 5.0])
+        eq_(progress, [(2, 3), (3, 3)])
+
+
+def test_srsctc100_channel_get_log_start():
+    with expected_protocol(
+        ik.srs.SRSCTC100,
+        [
+            "getOutput.names?",
+            "geterror?",
+            "getOutput.units?",
+            "geterror?",
+            "getLog.xy? In 1",
+            "geterror?",
+            "getLog.xy In 1, first",
+            "getLog.xy In 1, next",
+            "getLog.xy In 1, next",
+            "geterror?"
+        ],
+        [
+            "In 1",
+            "0,NO ERROR",
+            "\xb0C",
+            "0,NO ERROR",
+            "3",
+            "0,NO ERROR",
+            "0, 4.0",
+            "1000, 4.5",
+            "2000, 5.0",
+            "0,NO ERROR"
+        ]
+    ) as ctc:
+        ts, temps = ctc.channel["In 1"].get_log(start=2)
+        eq_(list(ts.magnitude), [2000])
+        eq_(list(temps.magnitude), [5.0])
+
+
+def test_srsctc100_sampled_error_checking():
+    with expected_protocol(
+        ik.srs.SRSCTC100,
+        [
+            "system.display.figures = 1",
+            "system.display.figures = 2",
+            "geterror?",
+            "system.display.figures = 3",
+            "geterror?"
+        ],
+        [
+            "0,NO ERROR",
+            "1,BAD VALUE"
+        ]
+    ) as ctc:
+        ctc.error_policy.mode = ik.util_fns.ErrorCheckMode.sampled
+        ctc.error_policy.interval = 2
+        ctc.display_figures = 1
+        ctc.display_figures = 2
+        try:
+            ctc.display_figures = 3
+            ctc.check_errors()
+        except IOError as err:
+            eq_(err.commands, ["system.display.figures = 3"])
+        else:
+            assert False, "Error was not raised."
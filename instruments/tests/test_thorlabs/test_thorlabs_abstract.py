@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing tests for the generic Thorlabs packet instrument
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+
+import struct
+
+from nose.tools import eq_, raises
+
+from instruments.thorlabs._abstract import ThorLabsInstrument
+from instruments.thorlabs._cmds import ThorLabsCommands
+from instruments.thorlabs._packets import ThorLabsPacket
+from instruments.tests import expected_protocol
+
+# TESTS ######################################################################
+
+# pylint: disable=protected-access
+
+
+def _header_packet(message_id, param1=0x01, param2=0x00):
+    return ThorLabsPacket(
+        message_id=message_id, param1=param1, param2=param2, dest=0x01,
+        source=0x50
+    ).pack()
+
+
+def _data_packet(message_id, data):
+    return ThorLabsPacket(
+        message_id=message_id, dest=0x01, source=0x50, data=data
+    ).pack()
+
+
+REQ_POS = ThorLabsPacket(
+    message_id=ThorLabsCommands.MOT_REQ_POSCOUNTER, param1=0x01, param2=0x00
+)
+
+
+def test_readpacket_framing():
+    with expected_protocol(
+        ThorLabsInstrument,
+        [],
+        [
+            _data_packet(ThorLabsCommands.MOT_GET_POSCOUNTER,
+                         struct.pack('<Hl', 1, -20)),
+            _header_packet(ThorLabsCommands.MOD_GET_CHANENABLESTATE, 2, 1)
+        ],
+        sep=""
+    ) as inst:
+        pkt = inst.readpacket()
+        eq_(pkt.message_id, ThorLabsCommands.MOT_GET_POSCOUNTER)
+        eq_(struct.unpack('<Hl', pkt.data), (1, -20))
+        pkt = inst.readpacket()
+        eq_(pkt.message_id, ThorLabsCommands.MOD_GET_CHANENABLESTATE)
+        eq_(pkt.parameters, (2, 1))
+        eq_(inst.readpacket(), None)
+
+
+def test_querypacket_skips_unsolicited_packets():
+    completed = _data_packet(ThorLabsCommands.MOT_MOVE_COMPLETED,
+                             struct.pack('<HlHHL', 2, 0, 0, 0, 0))
+    with expected_protocol(
+        ThorLabsInstrument,
+        [
+            REQ_POS.pack()
+        ],
+        [
+            completed,
+            _data_packet(ThorLabsCommands.MOT_GET_POSCOUNTER,
+                         struct.pack('<Hl', 2, 5)),
+            _data_packet(ThorLabsCommands.MOT_GET_POSCOUNTER,
+                         struct.pack('<Hl', 1, 10))
+        ],
+        sep=""
+    ) as inst:
+        pkt = inst.querypacket(
+            REQ_POS, expect=ThorLabsCommands.MOT_GET_POSCOUNTER, channel=1
+        )
+        eq_(struct.unpack('<Hl', pkt.data), (1, 10))
+        eq_(len(inst._packet_queue), 2)
+
+        # The unsolicited completion message is kept until waited for.
+        pkt = inst.waitpacket(ThorLabsCommands.MOT_MOVE_COMPLETED, channel=2)
+        eq_(pkt.pack(), completed)
+        eq_(len(inst._packet_queue), 1)
+
+
+def test_packet_callbacks():
+    received = []
+    with expected_protocol(
+        ThorLabsInstrument,
+        [
+            REQ_POS.pack()
+        ],
+        [
+            _data_packet(ThorLabsCommands.MOT_MOVE_COMPLETED,
+                         struct.pack('<HlHHL', 2, 0, 0, 0, 0)),
+            _data_packet(ThorLabsCommands.MOT_GET_POSCOUNTER,
+                         struct.pack('<Hl', 1, 10))
+        ],
+        sep=""
+    ) as inst:
+        inst.register_packet_callback(
+            ThorLabsCommands.MOT_MOVE_COMPLETED, received.append
+        )
+        inst.querypacket(REQ_POS, expect=ThorLabsCommands.MOT_GET_POSCOUNTER)
+        eq_(len(received), 1)
+        eq_(received[0].message_id, ThorLabsCommands.MOT_MOVE_COMPLETED)
+        eq_(len(inst._packet_queue), 0)
+
+        inst.unregister_packet_callback(
+            ThorLabsCommands.MOT_MOVE_COMPLETED, received.append
+        )
+        eq_(inst._packet_callbacks, {})
+
+
+def test_querypacket_no_response():
+    with expected_protocol(
+        ThorLabsInstrument,
+        [
+            REQ_POS.pack()
+        ],
+        [],
+        sep=""
+    ) as inst:
+        eq_(inst.querypacket(REQ_POS), None)
+
+
+@raises(IOError)
+def test_querypacket_missing_reply():
+    with expected_protocol(
+        ThorLabsInstrument,
+        [
+            REQ_POS.pack()
+        ],
+        [
+            _header_packet(ThorLabsCommands.MOD_GET_CHANENABLESTATE)
+        ],
+        sep=""
+    ) as inst:
+        inst.querypacket(REQ_POS, expect=ThorLabsCommands.MOT_GET_POSCOUNTER)
+
+
+@raises(IOError)
+def test_readpacket_truncated_data():
+    with expected_protocol(
+        ThorLabsInstrument,
+        [],
+        [
+            _data_packet(ThorLabsCommands.MOT_GET_POSCOUNTER,
+                         struct.pack('<Hl', 1, 10))[:-2]
+        ],
+        sep=""
+    ) as inst:
+        inst.readpacket()
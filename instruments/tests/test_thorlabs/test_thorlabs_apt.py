@@ -0,0 +1,441 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing tests for the Thorlabs APT controllers
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+
+import struct
+
+from nose.tools import eq_, raises
+import numpy as np
+import quantities as pq
+
+import instruments as ik
+from instruments.thorlabs._cmds import ThorLabsCommands
+from instruments.thorlabs._packets import ThorLabsPacket
+from instruments.tests import expected_protocol
+
+# TESTS ######################################################################
+
+# pylint: disable=protected-access
+
+
+def _hw_info(n_channels=2):
+    data = (
+        struct.pack('<L', 83000001) + b"BSC102\x00\x00" +
+        struct.pack('<H', 44) + bytearray([1, 2, 3, 0]) +
+        b"APT stepper".ljust(48, b"\x00") + b"\x00" * 12 +
+        struct.pack('<HHH', 3, 0, n_channels)
+    )
+    return ThorLabsPacket(
+        message_id=ThorLabsCommands.HW_GET_INFO, dest=0x01, source=0x50,
+        data=data
+    ).pack()
+
+
+REQ_INFO = ThorLabsPacket(
+    message_id=ThorLabsCommands.HW_REQ_INFO, param1=0x00, param2=0x00
+).pack()
+
+
+def _move_absolute(chan, pos):
+    return ThorLabsPacket(
+        message_id=ThorLabsCommands.MOT_MOVE_ABSOLUTE,
+        data=struct.pack('<Hl', chan, pos)
+    ).pack()
+
+
+def _move_completed(chan, pos):
+    return ThorLabsPacket(
+        message_id=ThorLabsCommands.MOT_MOVE_COMPLETED, dest=0x01,
+        source=0x50, data=struct.pack('<HllL', chan, pos, pos, 0)
+    ).pack()
+
+
+def test_apt_hardware_info():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        eq_(apt.serial_number, "c17af204")
+        eq_(apt.model_number, "BSC102")
+        eq_(apt._hw_type, "Brushless DC controller")
+        eq_(apt._fw_version, "1.2.3")
+        eq_(apt._notes, "APT stepper")
+        eq_(apt.n_channels, 2)
+        eq_(len(apt.channel), 2)
+
+
+def test_apt_motor_move_nonblocking():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _move_absolute(1, 1000)
+        ],
+        [
+            _hw_info(),
+            _move_completed(1, 1000)
+        ],
+        sep=""
+    ) as apt:
+        move = apt.channel[0].move(1000, wait=False)
+        eq_(move.done(), False)
+        eq_(move.result(), 1000 * pq.counts)
+        eq_(move.done(), True)
+        eq_(move.channel, apt.channel[0])
+
+
+def test_apt_motor_move_group():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _move_absolute(1, 1000),
+            _move_absolute(2, -500)
+        ],
+        [
+            _hw_info(),
+            _move_completed(2, -500),
+            _move_completed(1, 1000)
+        ],
+        sep=""
+    ) as apt:
+        group = apt.move_group({0: 1000, 1: -500}, wait=False)
+        eq_(group.done(), False)
+        eq_(group.result(), [1000 * pq.counts, -500 * pq.counts])
+        eq_(group.done(), True)
+
+
+def test_apt_motor_move_claims_earlier_completion():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _move_absolute(2, 10),
+            _move_absolute(1, 20),
+            _move_absolute(2, 30)
+        ],
+        [
+            _hw_info(),
+            _move_completed(2, 10),
+            _move_completed(1, 20),
+            _move_completed(2, 30)
+        ],
+        sep=""
+    ) as apt:
+        first = apt.channel[1].move(10, wait=False)
+        apt.channel[0].move(20)
+        # The completion of the first move was read while waiting for the
+        # second, and completes the first rather than the third.
+        third = apt.channel[1].move(30, wait=False)
+        eq_(first.done(), True)
+        eq_(first.cancelled(), False)
+        eq_(first.result(), 10 * pq.counts)
+        eq_(third.done(), False)
+        eq_(third.result(), 30 * pq.counts)
+
+
+def test_apt_motor_move_cancels_superseded_move():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _move_absolute(2, 10),
+            _move_absolute(2, 30)
+        ],
+        [
+            _hw_info(),
+            _move_completed(2, 30)
+        ],
+        sep=""
+    ) as apt:
+        first = apt.channel[1].move(10, wait=False)
+        second = apt.channel[1].move(30, wait=False)
+        eq_(first.done(), True)
+        eq_(first.cancelled(), True)
+        eq_(second.result(), 30 * pq.counts)
+        try:
+            first.result()
+        except IOError:
+            pass
+        else:
+            assert False, "Error was not raised."
+
+
+def test_apt_motor_go_home():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            ThorLabsPacket(
+                message_id=ThorLabsCommands.MOT_MOVE_HOME, param1=0x02,
+                param2=0x00
+            ).pack()
+        ],
+        [
+            _hw_info(),
+            ThorLabsPacket(
+                message_id=ThorLabsCommands.MOT_MOVE_HOMED, param1=0x02,
+                param2=0x00, dest=0x01, source=0x50
+            ).pack()
+        ],
+        sep=""
+    ) as apt:
+        move = apt.channel[1].go_home(wait=True)
+        eq_(move.done(), True)
+
+
+@raises(IOError)
+def test_apt_motor_move_timeout():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _move_absolute(1, 1000)
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        apt.channel[0].move(1000, wait=False).wait(timeout=0.01)
+
+
+@raises(IOError)
+def test_apt_motor_move_missing_completion():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _move_absolute(1, 1000)
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        apt.move_timeout = 0.01
+        apt.channel[0].move(1000)
+
+
+def _hw_packet(message_id):
+    return ThorLabsPacket(
+        message_id=message_id, param1=0x00, param2=0x00
+    ).pack()
+
+
+def _status_update(chan, pos, status_bits=0, dc=False):
+    if dc:
+        message_id = ThorLabsCommands.MOT_GET_DCSTATUSUPDATE
+        data = struct.pack('<HlHHL', chan, pos, 0, 0, status_bits)
+    else:
+        message_id = ThorLabsCommands.MOT_GET_STATUSUPDATE
+        data = struct.pack('<HllL', chan, pos, pos, status_bits)
+    return ThorLabsPacket(
+        message_id=message_id, dest=0x01, source=0x50, data=data
+    ).pack()
+
+
+def test_apt_motor_status_updates():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _hw_packet(ThorLabsCommands.HW_START_UPDATEMSGS)
+        ],
+        [
+            _hw_info(),
+            _status_update(1, 10),
+            _status_update(2, 20),
+            _status_update(1, 30, status_bits=0x10)
+        ],
+        sep=""
+    ) as apt:
+        apt.start_status_updates()
+        eq_(apt.status_updates_enabled, True)
+        apt.process_packets(0.01)
+
+        chan = apt.channel[0]
+        eq_(chan.position, 30 * pq.counts)
+        eq_(chan.status_bits['CW_MOVE_IN_MOTION'], True)
+        times, positions, status_bits = chan.status_history
+        eq_(len(times), 2)
+        eq_(times.units, pq.s)
+        eq_(list(positions.magnitude), [10, 30])
+        eq_(list(status_bits), [0, 0x10])
+        eq_(list(apt.channel[1].status_history[1].magnitude), [20])
+
+
+def test_apt_motor_stop_status_updates():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _hw_packet(ThorLabsCommands.HW_START_UPDATEMSGS),
+            _hw_packet(ThorLabsCommands.HW_STOP_UPDATEMSGS),
+            ThorLabsPacket(
+                message_id=ThorLabsCommands.MOT_REQ_POSCOUNTER, param1=0x01,
+                param2=0x00
+            ).pack()
+        ],
+        [
+            _hw_info(),
+            ThorLabsPacket(
+                message_id=ThorLabsCommands.MOT_GET_POSCOUNTER, dest=0x01,
+                source=0x50, data=struct.pack('<Hl', 1, 40)
+            ).pack()
+        ],
+        sep=""
+    ) as apt:
+        apt.start_status_updates()
+        apt.stop_status_updates()
+        eq_(apt.status_updates_enabled, False)
+        eq_(apt._packet_callbacks, {})
+        eq_(apt.channel[0].position, 40 * pq.counts)
+        eq_(len(apt.channel[0].status_history[0]), 0)
+
+
+def test_apt_motor_status_waits_for_update():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _hw_packet(ThorLabsCommands.HW_START_UPDATEMSGS)
+        ],
+        [
+            _hw_info(),
+            _status_update(2, 20),
+            _status_update(1, 10)
+        ],
+        sep=""
+    ) as apt:
+        apt.start_status_updates()
+        apt.status_max_age = -1
+        eq_(apt.channel[0].position, 10 * pq.counts)
+        eq_(len(apt.channel[1].status_history[0]), 1)
+
+
+def test_apt_motor_status_buffer_wraps():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO,
+            _hw_packet(ThorLabsCommands.HW_START_UPDATEMSGS),
+            _hw_packet(ThorLabsCommands.MOT_ACK_DCSTATUSUPDATE)
+        ],
+        [
+            _hw_info(),
+            _status_update(1, 10, dc=True),
+            _status_update(1, 20, dc=True),
+            _status_update(1, 30, dc=True)
+        ],
+        sep=""
+    ) as apt:
+        apt._status_ack_interval = 2
+        apt.start_status_updates(buffer_size=2)
+        apt.process_packets(0.01)
+        times, positions, _ = apt.channel[0].status_history
+        eq_(list(positions.magnitude), [20, 30])
+        assert times[0] <= times[1]
+
+
+@raises(ValueError)
+def test_apt_motor_status_history_not_started():
+    with expected_protocol(
+        ik.thorlabs.APTMotorController,
+        [
+            REQ_INFO
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        _ = apt.channel[0].status_history
+
+
+def _set_output_pos(chan, pos):
+    return ThorLabsPacket(
+        message_id=ThorLabsCommands.PZ_SET_OUTPUTPOS,
+        data=struct.pack('<HH', chan, pos)
+    ).pack()
+
+
+def test_apt_piezo_stream_output_positions():
+    with expected_protocol(
+        ik.thorlabs.APTPiezoStage,
+        [
+            REQ_INFO,
+            _set_output_pos(1, 0),
+            _set_output_pos(1, 100),
+            _set_output_pos(1, 32767),
+            _set_output_pos(2, 5),
+            _set_output_pos(2, 6)
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        apt.channel[0].stream_output_positions(
+            np.array([0, 100, 32767])
+        )
+        apt.channel[1].stream_output_positions([5, 6], rate=1 * pq.kHz)
+        eq_(apt.channel[1].apt_index, 2)
+
+
+def test_apt_piezo_stream_output_positions_rounded():
+    with expected_protocol(
+        ik.thorlabs.APTPiezoStage,
+        [
+            REQ_INFO,
+            _set_output_pos(1, 100),
+            _set_output_pos(1, 0)
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        apt.channel[0].stream_output_positions([99.6, 0.4])
+
+
+@raises(ValueError)
+def test_apt_piezo_stream_output_positions_not_finite():
+    with expected_protocol(
+        ik.thorlabs.APTPiezoStage,
+        [
+            REQ_INFO
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        apt.channel[0].stream_output_positions([0, float('nan')])
+
+
+@raises(ValueError)
+def test_apt_piezo_stream_output_positions_out_of_range():
+    with expected_protocol(
+        ik.thorlabs.APTPiezoStage,
+        [
+            REQ_INFO
+        ],
+        [
+            _hw_info()
+        ],
+        sep=""
+    ) as apt:
+        apt.channel[0].stream_output_positions([0, 40000])
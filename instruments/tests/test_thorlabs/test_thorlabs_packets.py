@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing tests for Thorlabs APT packets
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+
+import struct
+
+from nose.tools import eq_, raises
+import numpy as np
+
+from instruments.thorlabs._cmds import ThorLabsCommands
+from instruments.thorlabs._packets import ThorLabsPacket
+
+# TESTS ######################################################################
+
+# pylint: disable=protected-access
+
+POS_DTYPE = np.dtype([('chan', '<u2'), ('pos', '<u2')])
+
+
+def test_packet_has_no_dict():
+    pkt = ThorLabsPacket(message_id=0x0005, param1=0x00, param2=0x00)
+    assert not hasattr(pkt, '__dict__')
+
+
+def test_packet_pack_unpack_roundtrip():
+    pkt = ThorLabsPacket(
+        message_id=ThorLabsCommands.MOD_SET_CHANENABLESTATE, param1=0x01,
+        param2=0x02
+    )
+    eq_(pkt.pack(), b"\x10\x02\x01\x02\x50\x01")
+    unpacked = ThorLabsPacket.unpack(pkt.pack())
+    eq_(unpacked.message_id, ThorLabsCommands.MOD_SET_CHANENABLESTATE)
+    eq_(unpacked.parameters, (1, 2))
+    eq_(unpacked.destination, 0x50)
+    eq_(unpacked.data, None)
+
+    pkt = ThorLabsPacket(
+        message_id=ThorLabsCommands.PZ_SET_OUTPUTPOS,
+        data=struct.pack('<HH', 1, 100)
+    )
+    unpacked = ThorLabsPacket.unpack(pkt.pack())
+    eq_(unpacked.destination, 0x50)
+    eq_(unpacked.data, struct.pack('<HH', 1, 100))
+
+
+def test_packet_parameters_setter():
+    pkt = ThorLabsPacket(message_id=0x0005, param1=0x00, param2=0x00)
+    pkt.parameters = (3, 4)
+    eq_(pkt.parameters, (3, 4))
+    eq_(pkt.message_id, 0x0005)
+
+
+def test_packet_str():
+    pkt = ThorLabsPacket(message_id=0x0646, data=b"\x01\x00\x64\x00")
+    assert "01006400" in str(pkt)
+    assert "Parameter 1     None" in str(pkt)
+
+
+@raises(ValueError)
+def test_packet_unpack_truncated():
+    pkt = ThorLabsPacket(message_id=0x0646, data=b"\x01\x00\x64\x00")
+    ThorLabsPacket.unpack(pkt.pack()[:-1])
+
+
+def test_pack_many_unpack_many():
+    packets = [
+        ThorLabsPacket(message_id=0x0005, param1=0x00, param2=0x00),
+        ThorLabsPacket(message_id=0x0646, data=struct.pack('<HH', 1, 100)),
+        ThorLabsPacket(message_id=0x0646, data=struct.pack('<HH', 2, 200))
+    ]
+    buf = ThorLabsPacket.pack_many(packets)
+    eq_(bytes(buf), b"".join(pkt.pack() for pkt in packets))
+
+    # A trailing incomplete packet is left for later.
+    unpacked, consumed = ThorLabsPacket.unpack_many(buf + buf[:8])
+    eq_(consumed, len(buf) + 6)
+    eq_(len(unpacked), 4)
+    eq_([pkt.message_id for pkt in unpacked], [5, 0x0646, 0x0646, 5])
+    eq_(unpacked[0].parameters, (0, 0))
+
+    payload = unpacked[2].payload(POS_DTYPE)
+    eq_(payload['chan'][0], 2)
+    eq_(payload['pos'][0], 200)
+
+
+def test_unpack_many_is_zero_copy():
+    buf = bytearray(ThorLabsPacket(
+        message_id=0x0646, data=struct.pack('<HH', 1, 100)
+    ).pack())
+    unpacked, _ = ThorLabsPacket.unpack_many(buf)
+    buf[8] = 50
+    eq_(unpacked[0].payload(POS_DTYPE)['pos'][0], 50)
+
+
+def test_pack_array():
+    payload = np.zeros(3, dtype=POS_DTYPE)
+    payload['chan'] = 1
+    payload['pos'] = [0, 100, 32767]
+    buf = ThorLabsPacket.pack_array(0x0646, payload, dest=0x21)
+    eq_(buf, b"".join(
+        ThorLabsPacket(
+            message_id=0x0646, dest=0x21,
+            data=struct.pack('<HH', 1, pos)
+        ).pack()
+        for pos in [0, 100, 32767]
+    ))
+
+
+@raises(ValueError)
+def test_payload_requires_data():
+    ThorLabsPacket(message_id=0x0005, param1=0x00, param2=0x00).payload(
+        POS_DTYPE)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module containing tests for the Thorlabs PM100USB power meter
+"""
+
+# IMPORTS ####################################################################
+
+from __future__ import absolute_import
+
+from nose.tools import eq_
+import quantities as pq
+
+import instruments as ik
+from instruments.tests import expected_protocol
+
+# TESTS ######################################################################
+
+
+def test_pm100usb_read():
+    with expected_protocol(
+        ik.thorlabs.PM100USB,
+        [
+            "CONF?",
+            "READ?"
+        ],
+        [
+            "POW",
+            "0.5"
+        ]
+    ) as inst:
+        eq_(inst.read(), 0.5 * pq.W)
+
+
+def test_pm100usb_cache_units():
+    with expected_protocol(
+        ik.thorlabs.PM100USB,
+        [
+            "CONF?",
+            "READ?",
+            "CONF CURR",
+            "READ?"
+        ],
+        [
+            "POW",
+            "0.5",
+            "0.25"
+        ]
+    ) as inst:
+        inst.cache_units = True
+        eq_(inst.cache_units, True)
+        eq_(inst.read(), 0.5 * pq.W)
+        inst.measurement_configuration = inst.MeasurementConfiguration.current
+        eq_(inst.read(), 0.25 * pq.A)
+        eq_(inst.property_cache.enabled, False)
+
+
+def test_pm100usb_cache_units_disabled():
+    with expected_protocol(
+        ik.thorlabs.PM100USB,
+        [
+            "CONF?",
+            "CONF?",
+            "READ?"
+        ],
+        [
+            "POW",
+            "CURR",
+            "0.25"
+        ]
+    ) as inst:
+        inst.cache_units = True
+        inst.cache_units = False
+        eq_(inst.cache_units, False)
+        eq_(inst.read(), 0.25 * pq.A)
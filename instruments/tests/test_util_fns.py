@@ -11,13 +11,15 @@ from __future__ import absolute_import
 from builtins import range
 
 from enum import Enum
+import numpy as np
 import quantities as pq
 from nose.tools import raises, eq_
 
 from instruments.util_fns import (
     ProxyList,
-    assume_units, convert_temperature
+    assume_units, convert_temperature, lookup_units, poll_until
 )
+from instruments import util_fns
 
 # TEST CASES #################################################################
 
@@ -40,6 +42,53 @@ def test_ProxyList_basics():
     assert child._name == 0
 
 
+def test_ProxyList_not_cached_by_default():
+    class ProxyChild(object):
+
+        def __init__(self, parent, name):
+            self._parent = parent
+            self._name = name
+
+    class Parent(object):
+        pass
+
+    proxy_list = ProxyList(Parent(), ProxyChild, range(10))
+    assert proxy_list[0] is not proxy_list[0]
+
+
+def test_ProxyList_cache():
+    class ProxyChild(object):
+        cache_proxy = True
+        created = 0
+
+        def __init__(self, parent, name):
+            ProxyChild.created += 1
+            self._parent = parent
+            self._name = name
+
+    class Parent(object):
+
+        def __init__(self):
+            self.proxy_instances = {}
+
+    parent = Parent()
+    child = ProxyList(parent, ProxyChild, range(3))[0]
+    proxy_list = ProxyList(parent, ProxyChild, range(3))
+    assert proxy_list[0] is child
+    eq_([c._name for c in proxy_list], [0, 1, 2])
+    eq_(ProxyChild.created, 3)
+    assert ProxyList(parent, ProxyChild, range(3), cache=False)[0] \
+        is not child
+
+    proxy_list.invalidate(0)
+    assert proxy_list[0] is not child
+    assert proxy_list[1] is proxy_list[1]
+    proxy_list.invalidate()
+    eq_(ProxyChild.created, 5)
+    _ = proxy_list[1]
+    eq_(ProxyChild.created, 6)
+
+
 def test_ProxyList_valid_range_is_enum():
     class ProxyChild(object):
 
@@ -134,6 +183,32 @@ def test_assume_units_correct():
     eq_(assume_units(1, 'm').rescale('mm').magnitude, 1000)
 
 
+def test_assume_units_string_units():
+    eq_(assume_units(1, 'mV'), pq.Quantity(1, pq.mV))
+    eq_(assume_units(1, 'mV').units, pq.mV)
+
+
+def test_lookup_units():
+    eq_(lookup_units('mV'), pq.mV)
+    eq_(lookup_units(u'mV'), pq.mV)
+    assert lookup_units('mV') is lookup_units('mV')
+    assert lookup_units(pq.mV) is pq.mV
+
+
+@raises(LookupError)
+def test_lookup_units_unknown():
+    _ = lookup_units('foobars')
+
+
+def test_lookup_units_cache_is_bounded():
+    util_fns._unit_cache.clear()
+    for idx in range(util_fns._UNIT_CACHE_SIZE + 1):
+        lookup_units('{}*s'.format(idx + 1))
+    eq_(len(util_fns._unit_cache), util_fns._UNIT_CACHE_SIZE)
+    assert '1*s' not in util_fns._unit_cache
+    assert '2*s' in util_fns._unit_cache
+
+
 def test_temperature_conversion():
     blo = 70.0 * pq.degF
     out = convert_temperature(blo, pq.degC)
@@ -160,6 +235,20 @@ def test_temperature_conversion():
     eq_(out.magnitude, 270)
 
 
+def test_temperature_conversion_array():
+    blo = np.array([70.0, 32.0, -40.0]) * pq.degF
+    out = convert_temperature(blo, pq.degC)
+    eq_(out.units, pq.degC)
+    np.testing.assert_array_almost_equal(out.magnitude, [21.111111, 0, -40])
+
+    out = convert_temperature(np.array([0.0, 100.0]), pq.degK)
+    np.testing.assert_array_almost_equal(out.magnitude, [273.15, 373.15])
+
+    blo = np.array([270.0, 300.0]) * pq.degK
+    out = convert_temperature(blo, pq.K)
+    np.testing.assert_array_equal(out.magnitude, [270, 300])
+
+
 @raises(ValueError)
 def test_temperater_conversion_failure():
     blo = 70.0 * pq.degF
@@ -169,3 +258,24 @@ def test_temperater_conversion_failure():
 @raises(ValueError)
 def test_assume_units_failures():
     assume_units(1, 'm').rescale('s')
+
+
+def test_poll_until_returns_first_ready_value():
+    replies = iter([None, False, 0.0, 1.0])
+    eq_(poll_until(lambda: next(replies), timeout=1, interval=0), 0.0)
+
+
+def test_poll_until_no_sleep_when_ready():
+    calls = []
+
+    def ready():
+        calls.append(None)
+        return "ready"
+
+    eq_(poll_until(ready, timeout=0 * pq.second), "ready")
+    eq_(len(calls), 1)
+
+
+@raises(IOError)
+def test_poll_until_timeout():
+    poll_until(lambda: None, timeout=10 * pq.millisecond, interval=0.001)
@@ -7,7 +7,8 @@ Module containing Thorlabs instruments
 from __future__ import absolute_import
 
 from .thorlabsapt import (
-    ThorLabsAPT, APTPiezoStage, APTStrainGaugeReader, APTMotorController
+    ThorLabsAPT, APTPiezoStage, APTStrainGaugeReader, APTMotorController,
+    APTMotorMove, APTGroupMove
 )
 from .pm100usb import PM100USB
 from .lcc25 import LCC25
@@ -9,8 +9,26 @@ Defines a generic Thorlabs instrument to define some common functionality.
 from __future__ import absolute_import
 from __future__ import division
 
+from collections import deque
+import logging
+import struct
+import time
+
+import quantities as pq
+
 from instruments.thorlabs import _packets
 from instruments.abstract_instruments.instrument import Instrument
+from instruments.util_fns import assume_units
+
+# LOGGING #####################################################################
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# CONSTANTS ###################################################################
+
+# Monotonic clock used to pace streamed packets, where available.
+_monotonic = getattr(time, "monotonic", time.time)
 
 # CLASSES #####################################################################
 
@@ -20,55 +38,292 @@ class ThorLabsInstrument(Instrument):
     """
     Generic class for ThorLabs instruments which require wrapping of
     commands and queries in packets.
+
+    Packets are read from the instrument by their length-prefixed framing,
+    rather than by termination characters. Packets which are not the reply
+    to a pending request, such as status updates and motion completion
+    messages, are passed to any callbacks registered for their message ID
+    with `ThorLabsInstrument.register_packet_callback`, or are otherwise kept
+    until they are waited for.
     """
 
+    #: Maximum number of unclaimed packets kept while waiting for a reply.
+    #: Older packets are discarded first.
+    max_queued_packets = 100
+
     def __init__(self, filelike):
         super(ThorLabsInstrument, self).__init__(filelike)
         self.terminator = ''
+        self._packet_queue = deque(maxlen=self.max_queued_packets)
+        self._packet_callbacks = {}
+
+    # PACKET CALLBACKS #
+
+    def register_packet_callback(self, message_id, callback):
+        """
+        Registers a function to be called with each packet of the given
+        message ID which is read from the instrument, other than replies to
+        `ThorLabsInstrument.querypacket`. Packets handled by a callback are
+        not kept for later use.
+
+        :param int message_id: Message ID of the packets to be handled,
+            typically one of `~instruments.thorlabs._cmds.ThorLabsCommands`.
+        :param callable callback: Function taking the received
+            `ThorLabsPacket` as its only argument.
+        """
+        self._packet_callbacks.setdefault(message_id, []).append(callback)
+
+    def unregister_packet_callback(self, message_id, callback=None):
+        """
+        Removes a callback registered with
+        `ThorLabsInstrument.register_packet_callback`.
+
+        :param int message_id: Message ID the callback was registered for.
+        :param callable callback: Callback to remove. If `None`, all
+            callbacks for ``message_id`` are removed.
+        """
+        if callback is None:
+            self._packet_callbacks.pop(message_id, None)
+            return
+        callbacks = self._packet_callbacks.get(message_id, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._packet_callbacks.pop(message_id, None)
+
+    # PACKET I/O #
 
     def sendpacket(self, packet):
         """
-        Sends a packet to the connected APT instrument, and waits for a packet
-        in response. Optionally, checks whether the received packet type is
-        matches that the caller expects.
+        Sends a packet to the connected APT instrument, without waiting for
+        a response.
 
-        :param packet: The thorlabs data packet that will be queried
+        :param packet: The thorlabs data packet that will be sent
         :type packet: `ThorLabsPacket`
         """
-        self.sendcmd(packet.pack())
+        self._file.write_raw(packet.pack())
+
+    def sendpackets(self, buf, packet_size, rate=None):
+        """
+        Sends packets which have already been packed into a single buffer,
+        such as by `ThorLabsPacket.pack_array`, without waiting for a
+        response.
+
+        If a rate is given, each write sends all of the packets that are due
+        by then, so that the stream does not fall behind if the host is
+        briefly delayed.
+
+        :param buf: The packed packets, each ``packet_size`` bytes long.
+        :type buf: `bytes` or `bytearray`
+        :param int packet_size: Size of each packet in bytes.
+        :param rate: Rate at which the packets are sent. If `None`, all of
+            the packets are written at once. Assumed to be in units of Hertz
+            if not specified.
+        :type rate: `~quantities.Quantity`, `float` or `None`
+        """
+        if rate is None:
+            self._file.write_raw(buf)
+            return
+        rate = float(assume_units(rate, pq.Hz).rescale(pq.Hz).magnitude)
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+
+        view = memoryview(buf)
+        count = len(buf) // packet_size
+        sent = 0
+        start = _monotonic()
+        while sent < count:
+            elapsed = _monotonic() - start
+            due = min(count, int(elapsed * rate) + 1)
+            if due > sent:
+                self._file.write_raw(
+                    view[sent * packet_size:due * packet_size].tobytes()
+                )
+                sent = due
+            else:
+                time.sleep(sent / rate - elapsed)
+
+    def readpacket(self):
+        """
+        Reads a single packet from the connected APT instrument. The six byte
+        header is read first, followed by exactly the number of data bytes
+        that it declares.
 
-    # pylint: disable=protected-access
-    def querypacket(self, packet, expect=None):
+        :return: The packet read, or `None` if the instrument did not send
+            anything before timing out.
+        :rtype: `ThorLabsPacket` or `None`
+        """
+        header = self._file.read_raw(6)
+        if not header:
+            return None
+        if len(header) < 6:
+            header += self._read_raw_exactly(6 - len(header))
+
+        data = b""
+        if bytearray(header)[4] & 0x80:
+            length = struct.unpack('<H', header[2:4])[0]
+            if length:
+                data = self._read_raw_exactly(length)
+        return _packets.ThorLabsPacket.unpack(header + data)
+
+    @staticmethod
+    def _packet_channel(packet):
+        """
+        Returns the channel that a packet refers to, following the APT
+        convention that this is given by the first parameter of a header-only
+        packet or by the first word of the data of a longer packet.
+        """
+        if packet.data is None:
+            return packet.parameters[0]
+        if len(packet.data) < 2:
+            return None
+        return struct.unpack('<H', packet.data[:2])[0]
+
+    @classmethod
+    def _packet_matches(cls, packet, expect, channel):
+        if isinstance(expect, (tuple, list)):
+            if packet.message_id not in expect:
+                return False
+        elif expect is not None and packet.message_id != expect:
+            return False
+        return channel is None or cls._packet_channel(packet) == channel
+
+    def _dispatch_packet(self, packet):
+        """
+        Passes a packet which is not being waited for to its registered
+        callbacks, or keeps it for later if there are none.
+        """
+        callbacks = self._packet_callbacks.get(packet.message_id)
+        if callbacks:
+            for callback in list(callbacks):
+                callback(packet)
+        else:
+            if len(self._packet_queue) == self._packet_queue.maxlen:
+                logger.debug("Discarding unclaimed APT packet with message "
+                             "ID 0x%x", self._packet_queue[0].message_id)
+            self._packet_queue.append(packet)
+
+    def _take_queued_packet(self, expect, channel=None):
+        """
+        Removes and returns the oldest unclaimed packet with the given
+        message ID and channel, or returns `None` if there is none.
+        """
+        for packet in self._packet_queue:
+            if self._packet_matches(packet, expect, channel):
+                self._packet_queue.remove(packet)
+                return packet
+        return None
+
+    def _discard_queued_packets(self, expect, channel=None):
+        """
+        Discards all unclaimed packets with the given message ID and channel,
+        as is needed before making a request whose reply they would
+        otherwise be mistaken for.
+        """
+        for stale in [pkt for pkt in self._packet_queue
+                      if self._packet_matches(pkt, expect, channel)]:
+            self._packet_queue.remove(stale)
+
+    def waitpacket(self, expect=None, channel=None, timeout=None):
+        """
+        Waits for a packet from the connected APT instrument, passing any
+        other packets read in the meantime to their registered callbacks.
+        If ``expect`` is given, packets that were read earlier and not yet
+        claimed are considered first.
+
+        :param expect: The message ID of the packet to wait for, or a tuple
+            of message IDs any of which is accepted. If `None`, the first
+            packet not handled by a callback is returned.
+        :type expect: `int`, `tuple` of `int` or `None`
+        :param channel: If not `None`, only packets for this (1-based)
+            channel are returned.
+        :type channel: `int` or `None`
+        :param timeout: If not `None`, reads which time out are retried
+            until this much time has passed, so that packets may be waited
+            for longer than the timeout of the connection. Assumed to be in
+            units of seconds if not specified.
+        :type timeout: `~quantities.Quantity`, `float` or `None`
+
+        :return: The packet waited for, or `None` if no packet was received
+            and ``expect`` is `None`.
+        :rtype: `ThorLabsPacket`
+        """
+        if expect is not None:
+            packet = self._take_queued_packet(expect, channel)
+            if packet is not None:
+                return packet
+
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + float(
+                assume_units(timeout, pq.s).rescale(pq.s).magnitude
+            )
+        while True:
+            packet = self.readpacket()
+            if packet is None:
+                if deadline is not None and time.time() < deadline:
+                    continue
+                if expect is None:
+                    return None
+                raise IOError("Expected packet {}, got nothing "
+                              "instead.".format(expect))
+            if self._packet_matches(packet, expect, channel):
+                if expect is not None or \
+                        packet.message_id not in self._packet_callbacks:
+                    return packet
+            self._dispatch_packet(packet)
+
+    def querypacket(self, packet, expect=None, channel=None):
         """
         Sends a packet to the connected APT instrument, and waits for a packet
         in response. Optionally, checks whether the received packet type is
         matches that the caller expects.
 
+        When ``expect`` is given, packets with other message IDs that arrive
+        before the reply, such as status updates from other channels, are
+        passed to their registered callbacks or kept for later instead of
+        being mistaken for the reply.
+
         :param packet: The thorlabs data packet that will be queried
         :type packet: `ThorLabsPacket`
 
-        :param expect: The expected message id from the response. If an
-            an incorrect id is received then an `IOError` is raised. If left
-            with the default value of `None` then no checking occurs.
+        :param expect: The expected message id from the response. If no
+            packet with this id is received before the connection times out
+            then an `IOError` is raised. If left with the default value of
+            `None` then the next packet received is returned.
         :type expect: `str` or `None`
 
+        :param channel: If not `None`, only a reply for this (1-based)
+            channel is accepted.
+        :type channel: `int` or `None`
+
         :return: Returns the response back from the instrument wrapped up in
             a thorlabs packet
         :rtype: `ThorLabsPacket`
         """
-        resp = self.query(packet.pack())
-        if not resp:
-            if expect is None:
-                return None
-            else:
-                raise IOError("Expected packet {}, got nothing instead.".format(
-                    expect
-                ))
-        pkt = _packets.ThorLabsPacket.unpack(resp)
-        if expect is not None and pkt._message_id != expect:
-            # TODO: make specialized subclass that can record the offending
-            #       packet.
-            raise IOError("APT returned message ID {}, expected {}".format(
-                pkt._message_id, expect
-            ))
-        return pkt
+        # Replies left over from earlier requests are stale by now.
+        if expect is not None:
+            self._discard_queued_packets(expect, channel)
+
+        self.sendpacket(packet)
+        return self.waitpacket(expect=expect, channel=channel)
+
+    def process_packets(self, duration):
+        """
+        Reads packets from the connected APT instrument for the given amount
+        of time, passing each to its registered callbacks or keeping it for
+        later. This allows messages sent by the instrument without being
+        requested, such as periodic status updates, to be handled while no
+        other communication is taking place.
+
+        :param duration: Amount of time to read packets for. Assumed to be
+            in units of seconds if not specified.
+        :type duration: `~quantities.Quantity` or `float`
+        """
+        deadline = time.time() + float(
+            assume_units(duration, pq.s).rescale(pq.s).magnitude
+        )
+        while time.time() < deadline:
+            packet = self.readpacket()
+            if packet is not None:
+                self._dispatch_packet(packet)
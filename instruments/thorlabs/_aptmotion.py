@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Provides the status buffers and motion futures used by the Thorlabs APT
+motor controller.
+"""
+
+# IMPORTS #####################################################################
+
+from __future__ import absolute_import
+from __future__ import division
+
+import struct
+import time
+
+import numpy as np
+import quantities as pq
+
+from instruments.util_fns import assume_units
+
+# CLASSES #####################################################################
+
+
+class _StatusRingBuffer(object):
+
+    """
+    Fixed-size buffer of the most recent status updates of a motor channel.
+    Once full, each new update replaces the oldest one.
+    """
+
+    def __init__(self, size):
+        self._times = np.empty(size, dtype=float)
+        self._positions = np.empty(size, dtype=np.int32)
+        self._status_bits = np.empty(size, dtype=np.uint32)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, position, status_bits):
+        """
+        Adds a status update to the buffer.
+        """
+        idx = self._next
+        self._times[idx] = timestamp
+        self._positions[idx] = position
+        self._status_bits[idx] = status_bits
+        self._next = (idx + 1) % len(self._times)
+        self._count = min(self._count + 1, len(self._times))
+
+    @property
+    def latest(self):
+        """
+        Gets the most recent update as ``(timestamp, position, status_bits)``,
+        or `None` if the buffer is empty.
+        """
+        if not self._count:
+            return None
+        idx = self._next - 1
+        return (self._times[idx], int(self._positions[idx]),
+                int(self._status_bits[idx]))
+
+    def history(self):
+        """
+        Returns copies of the buffered timestamps, positions and status bits,
+        oldest first.
+        """
+        if self._count < len(self._times):
+            order = np.arange(self._count)
+        else:
+            order = np.roll(np.arange(len(self._times)), -self._next)
+        return (self._times[order], self._positions[order],
+                self._status_bits[order])
+
+
+class APTMotorMove(object):
+
+    """
+    Represents a motion of a single `APTMotorController` channel, in the
+    manner of a future. This class should not be instantiated by the user
+    directly, but is returned by `APTMotorController.MotorChannel.move` and
+    `APTMotorController.MotorChannel.go_home`.
+
+    The motion is complete once the controller reports it with a completion
+    packet for the channel. Packets for other channels that are read while
+    waiting are kept for their own moves. If another motion of the channel
+    is started before the completion of this one has been received, this
+    motion is cancelled, as it is superseded by the later one.
+    """
+
+    def __init__(self, channel, completion_id):
+        self._channel = channel
+        self._completion_id = completion_id
+        self._packet = None
+        self._cancelled = False
+
+    @property
+    def channel(self):
+        """
+        Gets the channel being moved.
+
+        :type: `APTMotorController.MotorChannel`
+        """
+        return self._channel
+
+    def cancelled(self):
+        """
+        Returns whether the motion was superseded by a later motion of the
+        same channel before its completion was received.
+
+        :rtype: `bool`
+        """
+        return self._cancelled
+
+    def _cancel(self):
+        self._cancelled = True
+
+    def done(self):
+        """
+        Returns whether the completion of the motion has been received, or
+        the motion has been cancelled. This only considers packets already
+        read from the controller, and so does not block.
+
+        :rtype: `bool`
+        """
+        if self._packet is None and not self._cancelled:
+            # pylint: disable=protected-access
+            self._packet = self._channel._apt._take_queued_packet(
+                self._completion_id, self._channel.apt_index
+            )
+        return self._packet is not None or self._cancelled
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the motion has completed or been cancelled.
+
+        :param timeout: Maximum amount of time to wait before raising an
+            `IOError`. If `None`, `APTMotorController.move_timeout` of the
+            controller is used. Assumed to be in units of seconds if not
+            specified.
+        :type timeout: `~quantities.Quantity`, `float` or `None`
+        """
+        if self.done():
+            return
+        # pylint: disable=protected-access
+        apt = self._channel._apt
+        self._packet = apt.waitpacket(
+            expect=self._completion_id,
+            channel=self._channel.apt_index,
+            timeout=apt.move_timeout if timeout is None else timeout
+        )
+
+    def result(self, timeout=None):
+        """
+        Blocks until the motion has completed, then returns the position
+        reported by the controller at its completion. An `IOError` is
+        raised if the motion was cancelled.
+
+        :param timeout: Maximum amount of time to wait before raising an
+            `IOError`. If `None`, `APTMotorController.move_timeout` of the
+            controller is used. Assumed to be in units of seconds if not
+            specified.
+        :type timeout: `~quantities.Quantity`, `float` or `None`
+        :rtype: `~quantities.Quantity`
+        """
+        self.wait(timeout)
+        if self._cancelled:
+            raise IOError("The motion was superseded by a later motion of "
+                          "channel {}.".format(self._channel.apt_index))
+        # chan, pos
+        _, pos = struct.unpack('<Hl', self._packet.data[:6])
+        return pq.Quantity(pos, 'counts') / self._channel.scale_factors[0]
+
+
+class APTGroupMove(object):
+
+    """
+    Represents motions of several APT channels, which may belong to
+    different controllers, in the manner of a future.
+
+    Example usage:
+
+    >>> import instruments as ik
+    >>> x = ik.thorlabs.APTMotorController.open_serial("/dev/ttyUSB0", 115200)
+    >>> y = ik.thorlabs.APTMotorController.open_serial("/dev/ttyUSB1", 115200)
+    >>> moves = ik.thorlabs.APTGroupMove([
+    ...     x.channel[0].move(1000, wait=False),
+    ...     y.channel[0].move(2000, wait=False)
+    ... ])
+    >>> moves.wait()
+
+    :param moves: Motions which have already been started.
+    :type moves: `list` of `APTMotorMove`
+    """
+
+    def __init__(self, moves):
+        self._moves = list(moves)
+
+    @property
+    def moves(self):
+        """
+        Gets the individual motions.
+
+        :type: `list` of `APTMotorMove`
+        """
+        return list(self._moves)
+
+    def done(self):
+        """
+        Returns whether the completion of every motion has been received,
+        without blocking.
+
+        :rtype: `bool`
+        """
+        return all(move.done() for move in self._moves)
+
+    def wait(self, timeout=None):
+        """
+        Blocks until all of the motions have completed.
+
+        :param timeout: Maximum amount of time to wait before raising an
+            `IOError`. If `None`, each motion is waited for for up to
+            `APTMotorController.move_timeout` of its controller. Assumed to
+            be in units of seconds if not specified.
+        :type timeout: `~quantities.Quantity`, `float` or `None`
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + float(
+                assume_units(timeout, pq.s).rescale(pq.s).magnitude
+            )
+        for move in self._moves:
+            move.wait(
+                None if deadline is None else max(deadline - time.time(), 0)
+            )
+
+    def result(self, timeout=None):
+        """
+        Blocks until all of the motions have completed, then returns the
+        positions reported at their completion.
+
+        :param timeout: Maximum amount of time to wait before raising an
+            `IOError`. If `None`, each motion is waited for for up to
+            `APTMotorController.move_timeout` of its controller. Assumed to
+            be in units of seconds if not specified.
+        :type timeout: `~quantities.Quantity`, `float` or `None`
+        :return: Final positions, in the same order as
+            `APTGroupMove.moves`.
+        :rtype: `list` of `~quantities.Quantity`
+        """
+        self.wait(timeout)
+        return [move.result() for move in self._moves]
@@ -9,13 +9,24 @@ Module for working with ThorLabs packets.
 from __future__ import absolute_import
 from __future__ import division
 
+import codecs
 import struct
 
+import numpy as np
+
 # STRUCTS #####################################################################
 
 message_header_nopacket = struct.Struct('<HBBBB')
 message_header_wpacket = struct.Struct('<HHBB')
 
+# Numpy equivalent of the header of a packet with data.
+message_header_dtype = np.dtype([
+    ('message_id', '<u2'),
+    ('length', '<u2'),
+    ('dest', 'u1'),
+    ('source', 'u1')
+])
+
 # CLASSES #####################################################################
 
 
@@ -25,8 +36,17 @@ class ThorLabsPacket(object):
     This class is used to wrap data to-/from- the instrument. Because of the
     command protocol for some ThorLabs instruments, this helps get all the
     data formatted and organized correctly.
+
+    Many packets can be packed into a single buffer at once with
+    `ThorLabsPacket.pack_many` or `ThorLabsPacket.pack_array`, and a buffer
+    holding many packets can be split with `ThorLabsPacket.unpack_many`.
     """
 
+    __slots__ = (
+        '_message_id', '_param1', '_param2', '_data', '_has_data', '_dest',
+        '_source'
+    )
+
     # pylint: disable=too-many-arguments
     def __init__(self, message_id, param1=None, param2=None, dest=0x50,
                  source=0x01, data=None):
@@ -56,12 +76,18 @@ class ThorLabsPacket(object):
         return """
 ThorLabs APT packet:
     Message ID      0x{0._message_id:x}
-    Parameter 1     0x{0._param1:x}
-    Parameter 2     0x{0._param2:x}
+    Parameter 1     {1}
+    Parameter 2     {2}
     Destination     0x{0._dest:x}
     Source          0x{0._source:x}
-    Data            {1}
-""".format(self, "{:x}".format(self._data) if self._has_data else "None")
+    Data            {3}
+""".format(
+    self,
+    "None" if self._param1 is None else "0x{:x}".format(self._param1),
+    "None" if self._param2 is None else "0x{:x}".format(self._param2),
+    codecs.encode(bytes(bytearray(self._data)), 'hex').decode('ascii')
+    if self._has_data else "None"
+)
 
     @property
     def message_id(self):
@@ -87,7 +113,7 @@ ThorLabs APT packet:
 
     @parameters.setter
     def parameters(self, newval):
-        self._message_id = newval
+        self._param1, self._param2 = newval
 
     @property
     def destination(self):
@@ -137,13 +163,55 @@ ThorLabs APT packet:
             return message_header_wpacket.pack(
                 self._message_id, len(
                     self._data), 0x80 | self._dest, self._source
-            ) + self._data
+            ) + bytes(bytearray(self._data))
         else:
             return message_header_nopacket.pack(
                 self._message_id, self._param1, self._param2, self._dest,
                 self._source
             )
 
+    def payload(self, dtype):
+        """
+        Returns the data of this packet as a numpy array of the given type,
+        without copying it. This is most useful with structured types
+        describing the layout of the data of a given message.
+
+        :param dtype: Type of the elements of the data.
+        :type dtype: `numpy.dtype`
+        :rtype: `numpy.ndarray`
+        """
+        if not self._has_data:
+            raise ValueError("Packet has parameters rather than data.")
+        return np.frombuffer(self._data, dtype=dtype)
+
+    @classmethod
+    def _unpack_from(cls, buf, offset=0):
+        """
+        Unpacks the packet starting at ``offset`` in ``buf``, if ``buf``
+        contains all of it. The data of the packet is a slice of ``buf``, and
+        so is a view if ``buf`` is a `memoryview`.
+
+        :return: The packet and the offset of the end of the packet, or
+            `None` if the packet is incomplete.
+        """
+        if len(buf) - offset < message_header_wpacket.size:
+            return None
+        msg_id, word, dest, source = message_header_wpacket.unpack_from(
+            buf, offset)
+        end = offset + message_header_wpacket.size
+
+        # If 0x80 is set on the destination byte, then this packet has data
+        # whose length is given by the second word of the header. Otherwise,
+        # that word holds the two parameters.
+        if dest & 0x80:
+            if len(buf) - end < word:
+                return None
+            data = buf[end:end + word]
+            return cls(message_id=msg_id, data=data, dest=dest ^ 0x80,
+                       source=source), end + word
+        return cls(message_id=msg_id, param1=word & 0xFF, param2=word >> 8,
+                   dest=dest, source=source), end
+
     @classmethod
     def unpack(cls, bytes):
         """
@@ -161,24 +229,106 @@ ThorLabs APT packet:
             raise ValueError("Expected a packet, got an empty string instead.")
         if len(bytes) < 6:
             raise ValueError("Packet must be at least 6 bytes long.")
+        result = cls._unpack_from(bytes)
+        if result is None:
+            raise ValueError("Packet is shorter than the length given in "
+                             "its header.")
+        return result[0]
 
-        header = bytes[:6]
-
-        # Check if 0x80 is set on header byte 4. If so, then this packet
-        # has data.
-        if struct.unpack("B", header[4])[0] & 0x80:
-            msg_id, length, dest, source = message_header_wpacket.unpack(
-                header)
-            dest = dest ^ 0x80  # Turn off 0x80.
-            param1 = None
-            param2 = None
-            data = bytes[6: 6 + length]  # Count on this to raise an index
-                                         # error if the length doesn't match
-                                         # up.
-        else:
-            msg_id, param1, param2, dest, source = message_header_nopacket.unpack(
-                header)
-            data = None
+    @classmethod
+    def unpack_many(cls, buf):
+        """
+        Splits a buffer received from an instrument into the packets that
+        it contains. The data of each packet is a view of ``buf`` rather than
+        a copy, and may be interpreted with `ThorLabsPacket.payload`.
+
+        A packet at the end of ``buf`` which is not yet complete is left
+        unpacked, so that it can be completed by data received later.
+
+        :param buf: Bytes received from the instrument.
+        :type buf: `memoryview`, `bytearray` or `bytes`
 
-        return cls(message_id=msg_id, param1=param1, param2=param2, data=data,
-                   dest=dest, source=source)
+        :return: The packets in ``buf``, and the number of bytes of ``buf``
+            that they occupy.
+        :rtype: `tuple` of (`list` of `ThorLabsPacket`, `int`)
+        """
+        buf = memoryview(buf)
+        packets = []
+        offset = 0
+        while True:
+            result = cls._unpack_from(buf, offset)
+            if result is None:
+                return packets, offset
+            packet, offset = result
+            packets.append(packet)
+
+    @staticmethod
+    def pack_many(packets):
+        """
+        Packs many `ThorLabsPacket` objects into a single buffer, which can
+        then be sent to the instrument with one write.
+
+        :param packets: Packets to pack.
+        :type packets: sequence of `ThorLabsPacket`
+        :rtype: `bytearray`
+        """
+        # pylint: disable=protected-access
+        sizes = [
+            message_header_wpacket.size +
+            (len(packet._data) if packet._has_data else 0)
+            for packet in packets
+        ]
+        buf = bytearray(sum(sizes))
+        offset = 0
+        for packet, size in zip(packets, sizes):
+            if packet._has_data:
+                message_header_wpacket.pack_into(
+                    buf, offset, packet._message_id, len(packet._data),
+                    0x80 | packet._dest, packet._source
+                )
+                buf[offset + message_header_wpacket.size:offset + size] = \
+                    packet._data
+            else:
+                message_header_nopacket.pack_into(
+                    buf, offset, packet._message_id, packet._param1,
+                    packet._param2, packet._dest, packet._source
+                )
+            offset += size
+        return buf
+
+    @staticmethod
+    def pack_array(message_id, payload, dest=0x50, source=0x01):
+        """
+        Packs one packet with data for each element of ``payload``, all with
+        the same message ID, into a single buffer. The packets are built as
+        one numpy array, without creating a `ThorLabsPacket` for each.
+
+        For instance, to build ``PZ_SET_OUTPUTPOS`` packets for channel 1:
+
+        >>> import numpy as np
+        >>> payload = np.zeros(3, dtype=[('chan', '<u2'), ('pos', '<u2')])
+        >>> payload['chan'] = 1
+        >>> payload['pos'] = [0, 100, 200]
+        >>> len(ThorLabsPacket.pack_array(0x0646, payload))
+        30
+
+        :param int message_id: Message ID of every packet.
+        :param payload: Data of each packet, whose type determines the
+            length of the data.
+        :type payload: `numpy.ndarray`
+        :param int dest: Destination of the packets.
+        :param int source: Source of the packets.
+        :rtype: `bytes`
+        """
+        payload = np.asarray(payload)
+        packets = np.empty(payload.shape[:1], dtype=[
+            ('header', message_header_dtype),
+            ('payload', payload.dtype, payload.shape[1:])
+        ])
+        packets['header']['message_id'] = message_id
+        packets['header']['length'] = payload.dtype.itemsize * int(
+            np.prod(payload.shape[1:]))
+        packets['header']['dest'] = 0x80 | dest
+        packets['header']['source'] = source
+        packets['payload'] = payload
+        return packets.tobytes()
@@ -144,10 +144,6 @@ class PM100USB(SCPIInstrument):
             """
             return self._flags
 
-    # PRIVATE ATTRIBUTES #
-
-    _cache_units = False
-
     # UNIT CACHING #
 
     @property
@@ -156,6 +152,11 @@ class PM100USB(SCPIInstrument):
         If enabled, then units are not checked every time a measurement is
         made, reducing by half the number of round-trips to the device.
 
+        This enables caching of `PM100USB.measurement_configuration` only,
+        in the `~instruments.Instrument.property_cache` of the instrument,
+        where it is kept up to date when it is set through InstrumentKit.
+        Other properties are unaffected.
+
         .. warning::
 
             Setting this to `True` may cause incorrect values to be returned,
@@ -164,14 +165,18 @@ class PM100USB(SCPIInstrument):
 
         :type: `bool`
         """
-        return bool(self._cache_units)
+        return "CONF" in self.property_cache.enabled_keys
 
     @cache_units.setter
     def cache_units(self, newval):
-        self._cache_units = (
-            self._READ_UNITS[self.measurement_configuration]
-            if newval else False
-        )
+        # Any configuration cached earlier may be stale by now.
+        self.property_cache.invalidate("CONF")
+        if newval:
+            self.property_cache.enabled_keys.add("CONF")
+            # Read the configuration now, so that it is cached from here on.
+            _ = self.measurement_configuration
+        else:
+            self.property_cache.enabled_keys.discard("CONF")
 
     # SENSOR PROPERTIES #
 
@@ -186,7 +191,6 @@ class PM100USB(SCPIInstrument):
 
     # SENSING CONFIGURATION PROPERTIES #
 
-    # TODO: make a setting of this refresh cache_units.
     measurement_configuration = enum_property(
         "CONF",
         MeasurementConfiguration,
@@ -234,9 +238,8 @@ class PM100USB(SCPIInstrument):
         :rtype: :class:`~quantities.Quantity`
         """
         # Get the current configuration to find out the units we need to
-        # attach.
-        units = (
+        # attach. This is served from the property cache if cache_units is
+        # enabled, and skipped in raw numeric mode.
+        units = None if self.raw_numeric else \
             self._READ_UNITS[self.measurement_configuration]
-            if not self._cache_units else self._cache_units
-        )
-        return float(self.query('READ?', size)) * units
+        return self._measured(float(self.query('READ?', size)), units)
@@ -9,20 +9,31 @@ Provides the support for the Thorlabs APT Controller.
 from __future__ import absolute_import
 from __future__ import division
 
+import codecs
 import re
 import struct
 import logging
+import time
 
 from builtins import range
+import numpy as np
 import quantities as pq
 
 from instruments.thorlabs import _abstract, _packets, _cmds
+from instruments.thorlabs._aptmotion import (
+    APTGroupMove, APTMotorMove, _StatusRingBuffer
+)
 
 # LOGGING #####################################################################
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# CONSTANTS ###################################################################
+
+# Layout of the data of a PZ_SET_OUTPUTPOS packet.
+_OUTPUTPOS_DTYPE = np.dtype([('chan', '<u2'), ('pos', '<u2')])
+
 # CLASSES #####################################################################
 
 
@@ -47,6 +58,16 @@ class ThorLabsAPT(_abstract.ThorLabsInstrument):
             # 0-based.
             self._idx_chan = idx_chan + 1
 
+        @property
+        def apt_index(self):
+            """
+            Gets the (1-based) index by which this channel is addressed in
+            the APT protocol.
+
+            :type: `int`
+            """
+            return self._idx_chan
+
         @property
         def enabled(self):
             """
@@ -109,11 +130,12 @@ class ThorLabsAPT(_abstract.ThorLabsInstrument):
             hw_info = self.querypacket(
                 req_packet, expect=_cmds.ThorLabsCommands.HW_GET_INFO)
 
-            self._serial_number = str(hw_info.data[0:4]).encode('hex')
-            self._model_number = str(
-                hw_info.data[4:12]).replace('\x00', '').strip()
+            self._serial_number = codecs.encode(
+                hw_info.data[0:4], 'hex').decode('ascii')
+            self._model_number = hw_info.data[4:12].decode(
+                'ascii', 'ignore').replace('\x00', '').strip()
 
-            hw_type_int = struct.unpack('<H', str(hw_info.data[12:14]))[0]
+            hw_type_int = struct.unpack('<H', hw_info.data[12:14])[0]
             if hw_type_int == 45:
                 self._hw_type = 'Multi-channel controller motherboard'
             elif hw_type_int == 44:
@@ -125,16 +147,17 @@ class ThorLabsAPT(_abstract.ThorLabsInstrument):
             # three bytes and format them.
             # pylint: disable=invalid-format-index
             self._fw_version = "{0[0]}.{0[1]}.{0[2]}".format(
-                str(hw_info.data[14:18]).encode('hex')
+                bytearray(hw_info.data[14:18])
             )
-            self._notes = str(hw_info.data[18:66]).replace('\x00', '').strip()
+            self._notes = hw_info.data[18:66].decode(
+                'ascii', 'ignore').replace('\x00', '').strip()
 
             self._hw_version = struct.unpack(
-                '<H', str(hw_info.data[78:80]))[0]
+                '<H', hw_info.data[78:80])[0]
             self._mod_state = struct.unpack(
-                '<H', str(hw_info.data[80:82]))[0]
+                '<H', hw_info.data[80:82])[0]
             self._n_channels = struct.unpack(
-                '<H', str(hw_info.data[82:84]))[0]
+                '<H', hw_info.data[82:84])[0]
         except IOError as e:
             logger.error("Exception occured while fetching hardware info: %s", e)
 
@@ -207,8 +230,8 @@ class ThorLabsAPT(_abstract.ThorLabsInstrument):
         # If we remove channels, remove them from the end of the list.
         if nch > self._n_channels:
             self._channel = self._channel + \
-                list(self._channel_type(self, chan_idx)
-                     for chan_idx in range(self._n_channels, nch))
+                tuple(self._channel_type(self, chan_idx)
+                      for chan_idx in range(self._n_channels, nch))
         elif nch < self._n_channels:
             self._channel = self._channel[:nch]
         self._n_channels = nch
@@ -403,6 +426,59 @@ class APTPiezoStage(APTPiezoDevice):
             )
             self._apt.sendpacket(pkt)
 
+        def stream_output_positions(self, positions, rate=None):
+            """
+            Sends a sequence of output positions to the piezo channel,
+            as is needed for scanning.
+
+            All of the packets are packed into a single buffer, as one
+            numpy array, before any are sent. They are then written at the
+            given rate, see `ThorLabsAPT.sendpackets`.
+
+            Example usage:
+
+            >>> import numpy as np
+            >>> import quantities as pq
+            >>> import instruments as ik
+            >>> stage = ik.thorlabs.APTPiezoStage.open_serial("/dev/ttyUSB0",
+            ...                                              115200)
+            >>> ramp = np.linspace(0, 32767, 1000).astype(int)
+            >>> stage.channel[0].stream_output_positions(ramp, 500 * pq.Hz)
+
+            :param positions: Output positions to send, each as for
+                `output_position`, between 0 and 32767. Positions which are
+                not whole numbers are rounded to the nearest one.
+            :type positions: `~numpy.ndarray` or sequence of `int`
+            :param rate: Rate at which the positions are sent. If `None`,
+                all of the positions are written at once. Assumed to be in
+                units of Hertz if not specified.
+            :type rate: `~quantities.Quantity`, `float` or `None`
+            """
+            positions = np.asarray(positions)
+            if positions.ndim != 1:
+                raise ValueError("Positions must be a one-dimensional "
+                                 "sequence.")
+            if not np.all(np.isfinite(positions)):
+                raise ValueError("Positions must be finite.")
+            positions = np.rint(positions)
+            if positions.size and (positions.min() < 0 or
+                                   positions.max() > 32767):
+                raise ValueError("Positions must be between 0 and 32767.")
+
+            payload = np.empty(positions.size, dtype=_OUTPUTPOS_DTYPE)
+            payload['chan'] = self._idx_chan
+            payload['pos'] = positions
+            buf = _packets.ThorLabsPacket.pack_array(
+                _cmds.ThorLabsCommands.PZ_SET_OUTPUTPOS, payload,
+                dest=self._apt.destination, source=0x01
+            )
+            self._apt.sendpackets(
+                buf,
+                _packets.message_header_wpacket.size +
+                _OUTPUTPOS_DTYPE.itemsize,
+                rate
+            )
+
     _channel_type = PiezoChannel
 
 
@@ -432,8 +508,25 @@ class APTMotorController(ThorLabsAPT):
 
     """
     Class representing a Thorlabs APT motor controller
+
+    The controller can be asked to send status updates for each of its
+    channels periodically, see `APTMotorController.start_status_updates`.
+    While these are enabled, the position and status bits of each channel
+    are read from the most recent update instead of being requested, and
+    the updates received are kept in a buffer for each channel.
     """
 
+    #: Message IDs of the periodic status updates sent by the various kinds
+    #: of APT motor controllers.
+    _STATUS_UPDATE_IDS = (
+        _cmds.ThorLabsCommands.MOT_GET_STATUSUPDATE,
+        _cmds.ThorLabsCommands.MOT_GET_DCSTATUSUPDATE
+    )
+
+    #: Number of DC status updates after which they are acknowledged, as
+    #: is required for the controller to keep sending them.
+    _status_ack_interval = 20
+
     class MotorChannel(ThorLabsAPT.APTChannel):
 
         """
@@ -526,6 +619,14 @@ class APTMotorController(ThorLabsAPT):
 
             :type: `dict`
             """
+            status = self._latest_status()
+            if status is not None:
+                status_bits = status[2]
+                return dict(
+                    (key, (status_bits & bit_mask > 0))
+                    for key, bit_mask in self.__STATUS_BIT_MASK.items()
+                )
+
             # NOTE: the difference between MOT_REQ_STATUSUPDATE and
             # MOT_REQ_DCSTATUSUPDATE confuses me
             pkt = _packets.ThorLabsPacket(
@@ -555,8 +656,15 @@ class APTMotorController(ThorLabsAPT):
             """
             Gets the current position of the specified motor channel
 
+            If status updates are enabled, the position is taken from the
+            most recent of these instead of being requested.
+
             :type: `~quantities.Quantity`
             """
+            status = self._latest_status()
+            if status is not None:
+                return pq.Quantity(status[1], 'counts') / self.scale_factors[0]
+
             pkt = _packets.ThorLabsPacket(
                 message_id=_cmds.ThorLabsCommands.MOT_REQ_POSCOUNTER,
                 param1=self._idx_chan,
@@ -566,7 +674,8 @@ class APTMotorController(ThorLabsAPT):
                 data=None
             )
             response = self._apt.querypacket(
-                pkt, expect=_cmds.ThorLabsCommands.MOT_GET_POSCOUNTER)
+                pkt, expect=_cmds.ThorLabsCommands.MOT_GET_POSCOUNTER,
+                channel=self._idx_chan)
             # chan, pos
             _, pos = struct.unpack('<Hl', response.data)
             return pq.Quantity(pos, 'counts') / self.scale_factors[0]
@@ -588,15 +697,92 @@ class APTMotorController(ThorLabsAPT):
                 data=None
             )
             response = self._apt.querypacket(
-                pkt, expect=_cmds.ThorLabsCommands.MOT_GET_ENCCOUNTER)
+                pkt, expect=_cmds.ThorLabsCommands.MOT_GET_ENCCOUNTER,
+                channel=self._idx_chan)
             # chan, pos
             _, pos = struct.unpack('<Hl', response.data)
             return pq.Quantity(pos, 'counts')
 
-        def go_home(self):
+        def _latest_status(self):
+            """
+            Returns the most recent status update of this channel, as
+            ``(timestamp, position, status_bits)``, or `None` if status
+            updates are not enabled. If the most recent update is older than
+            `APTMotorController.status_max_age`, the next one is waited for.
+            """
+            # pylint: disable=protected-access
+            apt = self._apt
+            buf = apt._status_buffers.get(self._idx_chan)
+            if not apt.status_updates_enabled or buf is None:
+                return None
+            latest = buf.latest
+            if latest is None or time.time() - latest[0] > apt.status_max_age:
+                pkt = apt.waitpacket(
+                    expect=apt._STATUS_UPDATE_IDS, channel=self._idx_chan
+                )
+                apt._record_status(pkt)
+                latest = buf.latest
+            return latest
+
+        @property
+        def status_history(self):
+            """
+            Gets the status updates received for this channel since status
+            updates were last started, oldest first. Only the most recent
+            updates are kept, up to the buffer size given to
+            `APTMotorController.start_status_updates`.
+
+            The timestamps are the times at which the updates were read by
+            the host, as returned by `time.time`.
+
+            :return: The timestamps, positions and status bits of the
+                updates.
+            :rtype: `tuple` of (`~quantities.Quantity`,
+                `~quantities.Quantity`, `numpy.ndarray`)
+            """
+            # pylint: disable=protected-access
+            buf = self._apt._status_buffers.get(self._idx_chan)
+            if buf is None:
+                raise ValueError("Status updates have not been started for "
+                                 "this controller.")
+            times, positions, status_bits = buf.history()
+            return (
+                pq.Quantity(times, pq.s),
+                pq.Quantity(positions, 'counts') / self.scale_factors[0],
+                status_bits
+            )
+
+        def _start_move(self, pkt, completion_id):
+            """
+            Sends a packet starting a motion of this channel, and returns
+            an `APTMotorMove` which completes when a packet with the given
+            message ID is received for this channel.
+            """
+            # pylint: disable=protected-access
+            # Completion messages already read are claimed by the earlier
+            # moves of this channel they belong to, and earlier moves which
+            # have not completed are superseded by this one. Any remaining
+            # completion messages must not be mistaken for the completion of
+            # this move.
+            for earlier in self._apt._moves.pop(self._idx_chan, []):
+                if not earlier.done():
+                    earlier._cancel()
+            self._apt._discard_queued_packets(completion_id, self._idx_chan)
+            self._apt.sendpacket(pkt)
+            move = APTMotorMove(self, completion_id)
+            self._apt._moves[self._idx_chan] = [move]
+            return move
+
+        def go_home(self, wait=False):
             """
             Instructs the specified motor channel to return to its home
             position
+
+            :param bool wait: If `True`, blocks until the channel reports
+                that it has been homed.
+            :return: The homing motion, which can be waited on to find
+                when it has completed.
+            :rtype: `APTMotorMove`
             """
             pkt = _packets.ThorLabsPacket(
                 message_id=_cmds.ThorLabsCommands.MOT_MOVE_HOME,
@@ -606,14 +792,22 @@ class APTMotorController(ThorLabsAPT):
                 source=0x01,
                 data=None
             )
-            self._apt.sendpacket(pkt)
+            move = self._start_move(pkt, _cmds.ThorLabsCommands.MOT_MOVE_HOMED)
+            if wait:
+                move.wait()
+            return move
 
-        def move(self, pos, absolute=True):
+        def move(self, pos, absolute=True, wait=True):
             """
             Instructs the specified motor channel to move to a specific
             location. The provided position can be either an absolute or
             relative position.
 
+            Moves of several channels, possibly of different controllers,
+            can be made at the same time by starting each with
+            ``wait=False`` and then waiting on all of the returned moves,
+            for instance with `APTGroupMove`.
+
             :param pos: The position to move to. Provided value will be
                 converted to encoder counts.
             :type pos: `~quantities.Quantity`
@@ -622,6 +816,14 @@ class APTMotorController(ThorLabsAPT):
             :param bool absolute: Specify if the position is a relative or
                 absolute position. ``True`` means absolute, while ``False``
                 is for a relative move.
+
+            :param bool wait: If `True`, blocks until the move has
+                completed. Otherwise, returns as soon as the move has been
+                started.
+
+            :return: The move, which can be waited on to find when it has
+                completed.
+            :rtype: `APTMotorMove`
             """
             # Handle units as follows:
             # 1. Treat raw numbers as encoder counts.
@@ -653,11 +855,140 @@ class APTMotorController(ThorLabsAPT):
                 data=struct.pack('<Hl', self._idx_chan, pos_ec)
             )
 
-            _ = self._apt.querypacket(
-                pkt,
-                expect=_cmds.ThorLabsCommands.MOT_MOVE_COMPLETED
+            move = self._start_move(
+                pkt, _cmds.ThorLabsCommands.MOT_MOVE_COMPLETED
             )
+            if wait:
+                move.wait()
+            return move
 
     _channel_type = MotorChannel
 
+    def __init__(self, filelike):
+        super(APTMotorController, self).__init__(filelike)
+        self._status_buffers = {}
+        self._status_updates_enabled = False
+        self._status_update_count = 0
+        self._moves = {}
+
+        #: Maximum age, in seconds, of a status update from which the
+        #: position or status bits of a channel are read. If the most recent
+        #: update is older, the next update is waited for.
+        self.status_max_age = 0.2
+
+        #: Maximum time, in seconds, that a move is waited for when no other
+        #: timeout is given, after which an `IOError` is raised. This
+        #: includes waiting in `~APTMotorController.MotorChannel.move` and
+        #: `~APTMotorController.MotorChannel.go_home`.
+        self.move_timeout = 60
+
     # CONTROLLER PROPERTIES AND METHODS #
+
+    @property
+    def status_updates_enabled(self):
+        """
+        Gets whether the controller has been asked to send periodic status
+        updates, see `APTMotorController.start_status_updates`.
+
+        :type: `bool`
+        """
+        return self._status_updates_enabled
+
+    def start_status_updates(self, buffer_size=1000):
+        """
+        Asks the controller to send status updates for each of its channels
+        periodically, and starts recording these.
+
+        The updates are decoded whenever packets are read from the
+        controller, for instance while waiting for a move to complete. To
+        record them while not otherwise communicating with the controller,
+        use `~instruments.thorlabs.ThorLabsAPT.process_packets`.
+
+        :param int buffer_size: Number of updates kept for each channel.
+        """
+        if buffer_size < 1:
+            raise ValueError("The buffer must hold at least one update.")
+        self._status_buffers = dict(
+            (chan.apt_index, _StatusRingBuffer(buffer_size))
+            for chan in self.channel
+        )
+        self._status_update_count = 0
+        for message_id in self._STATUS_UPDATE_IDS:
+            self.register_packet_callback(message_id, self._record_status)
+        self._status_updates_enabled = True
+        self.sendpacket(_packets.ThorLabsPacket(
+            message_id=_cmds.ThorLabsCommands.HW_START_UPDATEMSGS,
+            param1=0x00,
+            param2=0x00,
+            dest=self.destination,
+            source=0x01,
+            data=None
+        ))
+
+    def stop_status_updates(self):
+        """
+        Asks the controller to stop sending periodic status updates. The
+        updates already recorded remain available from
+        `APTMotorController.MotorChannel.status_history`.
+        """
+        self.sendpacket(_packets.ThorLabsPacket(
+            message_id=_cmds.ThorLabsCommands.HW_STOP_UPDATEMSGS,
+            param1=0x00,
+            param2=0x00,
+            dest=self.destination,
+            source=0x01,
+            data=None
+        ))
+        for message_id in self._STATUS_UPDATE_IDS:
+            self.unregister_packet_callback(message_id, self._record_status)
+        self._status_updates_enabled = False
+
+    def _record_status(self, packet):
+        """
+        Decodes a status update packet into the buffer of its channel.
+        """
+        # Both kinds of status update start with the channel and position,
+        # and end with the status bits.
+        chan, position = struct.unpack('<Hl', packet.data[:6])
+        status_bits = struct.unpack('<L', packet.data[10:14])[0]
+        buf = self._status_buffers.get(chan)
+        if buf is not None:
+            buf.append(time.time(), position, status_bits)
+
+        if packet.message_id == _cmds.ThorLabsCommands.MOT_GET_DCSTATUSUPDATE:
+            self._status_update_count += 1
+            if self._status_update_count % self._status_ack_interval == 0:
+                self.sendpacket(_packets.ThorLabsPacket(
+                    message_id=_cmds.ThorLabsCommands.MOT_ACK_DCSTATUSUPDATE,
+                    param1=0x00,
+                    param2=0x00,
+                    dest=self.destination,
+                    source=0x01,
+                    data=None
+                ))
+
+    def move_group(self, targets, absolute=True, wait=True):
+        """
+        Moves several channels of this controller at the same time. All of
+        the moves are started before any of them are waited on, so that
+        they take as long as the longest of them rather than their sum.
+
+        :param dict targets: Positions to move to, keyed by the channels to
+            move or by their (zero-based) indices. Positions are as for
+            `APTMotorController.MotorChannel.move`.
+        :param bool absolute: If `True`, the positions are absolute,
+            otherwise they are relative to the current positions.
+        :param bool wait: If `True`, blocks until all of the moves have
+            completed.
+        :return: The moves, which can be waited on together.
+        :rtype: `APTGroupMove`
+        """
+        moves = []
+        for chan, pos in targets.items():
+            if not isinstance(chan, ThorLabsAPT.APTChannel):
+                chan = self.channel[chan]
+            moves.append(chan.move(pos, absolute=absolute, wait=False))
+        group = APTGroupMove(moves)
+        if wait:
+            group.wait()
+        return group
@@ -9,11 +9,59 @@ Module containing various utility functions
 from __future__ import absolute_import
 from __future__ import division
 
+from collections import OrderedDict
 import re
+import time
 
 from enum import Enum, IntEnum
+from future.utils import string_types
+import numpy as np
 import quantities as pq
 
+# The property cache and error policy are used together with the property
+# factories, and so are also made available from here.
+from instruments.error_policy import (  # pylint: disable=unused-import
+    ErrorCheckMode, ErrorPolicy
+)
+from instruments.property_cache import (  # pylint: disable=unused-import
+    CacheMode, PropertyCache
+)
+
+# CONSTANTS ###################################################################
+
+# Borrowed from:
+# http://stackoverflow.com/questions/430079/how-to-split-strings-into-text-and-number
+# Reg exp tweaked on May 30, 2015 by scasagrande to match on input with
+# scientific notation. General flow borrowed from:
+# http://www.regular-expressions.info/floatingpoint.html
+_UNIT_STR_REGEX = re.compile(
+    r"([-+]?[0-9]*\.?[0-9]+)([eE][-+]?[0-9]+)?\s*([a-z]+)?", re.I
+)
+
+# Matches one value of a separated list, including surrounding whitespace.
+_UNIT_LIST_ITEM_REGEX = re.compile(
+    r"\s*([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([a-z]+)?\s*", re.I
+)
+
+# Maximum number of distinct unit strings remembered by `lookup_units`.
+_UNIT_CACHE_SIZE = 256
+
+_unit_cache = OrderedDict()
+
+# Symbols of the temperature units understood by `convert_temperature`.
+_TEMPERATURE_UNITS = ("K", "degC", "degF")
+
+# Conversions between temperature magnitudes, keyed by the symbols of the
+# units converted from and to.
+_TEMPERATURE_CONVERSIONS = {
+    ("degF", "degC"): lambda mag: (mag - 32.0) * 5.0 / 9.0,
+    ("K", "degC"): lambda mag: mag - 273.15,
+    ("K", "degF"): lambda mag: mag / 1.8 - 459 / 57,
+    ("degC", "degF"): lambda mag: mag * 9.0 / 5.0 + 32.0,
+    ("degF", "K"): lambda mag: (mag + 459.57) * 5.0 / 9.0,
+    ("degC", "K"): lambda mag: mag + 273.15,
+}
+
 # FUNCTIONS ###################################################################
 
 # pylint: disable=too-many-arguments
@@ -33,9 +81,83 @@ def assume_units(value, units):
         ``units``, depending on if ``value`` is unitful.
     :rtype: `Quantity`
     """
-    if not isinstance(value, pq.Quantity):
-        value = pq.Quantity(value, units)
-    return value
+    if isinstance(value, pq.Quantity):
+        return value
+    return pq.Quantity(value, lookup_units(units))
+
+
+def lookup_units(units):
+    """
+    Returns the unit named by the string ``units``, such as ``"mV"`` or
+    ``"degC"``. Parsing unit strings is comparatively expensive in
+    `quantities`, so the most recently used units are kept in a bounded
+    least-recently-used cache. Values which are not strings are returned
+    unchanged.
+
+    >>> lookup_units("mV")
+    UnitQuantity('millivolt', 0.001 * V, 'mV')
+
+    :param units: Name of the units to be looked up.
+    :type units: `str` or `~quantities.UnitQuantity`
+
+    :return: The units named by ``units``.
+    :rtype: `~quantities.UnitQuantity` or `~quantities.Quantity`
+    :raises LookupError: If ``units`` cannot be parsed by `quantities`.
+    """
+    if not isinstance(units, string_types):
+        return units
+    try:
+        unit = _unit_cache.pop(units)
+    except KeyError:
+        unit = pq.unit_registry[units]
+        if len(_unit_cache) >= _UNIT_CACHE_SIZE:
+            _unit_cache.popitem(last=False)
+    _unit_cache[units] = unit
+    return unit
+
+
+def poll_until(ready, timeout=5, interval=0.005, max_interval=0.25,
+               backoff=2):
+    """
+    Repeatedly calls ``ready`` until it reports that the instrument has
+    settled, sleeping between attempts with an exponentially growing
+    interval. This is used in place of fixed worst-case delays so that an
+    instrument which is ready quickly is not penalized.
+
+    Example usage:
+
+    >>> poll_until(lambda: inst.query("*OPC?") == "1", timeout=2) # doctest: +SKIP
+
+    :param callable ready: Function taking no arguments which is called to
+        poll the instrument. Any return value other than `None` or `False`
+        signals that the instrument is ready, and is returned to the caller.
+    :param timeout: Maximum amount of time to wait for the instrument
+        to settle. Assumed to be in units of seconds if not specified.
+    :type timeout: `~quantities.Quantity` or `float`
+    :param float interval: Initial delay between polling attempts, in
+        seconds.
+    :param float max_interval: Upper bound on the delay between polling
+        attempts, in seconds.
+    :param float backoff: Factor by which the delay is increased after each
+        unsuccessful polling attempt.
+
+    :return: The first ready value returned by ``ready``.
+    :raises IOError: If the instrument has not settled before ``timeout``
+        has elapsed.
+    """
+    timeout = assume_units(timeout, pq.second).rescale(pq.second).magnitude
+    deadline = time.time() + float(timeout)
+    delay = interval
+    while True:
+        result = ready()
+        if result is not None and result is not False:
+            return result
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise IOError("Instrument did not settle within "
+                          "{} seconds.".format(float(timeout)))
+        time.sleep(min(delay, remaining))
+        delay = min(delay * backoff, max_interval)
 
 
 def convert_temperature(temperature, base):
@@ -44,39 +166,32 @@ def convert_temperature(temperature, base):
     the package `quantities` does not differentiate between ``degC`` and
     ``degK``.
 
-    :param temperature: A quantity with units of Kelvin, Celsius, or Fahrenheit
-    :type temperature: `quantities.Quantity`
+    The conversion is applied to all elements of ``temperature`` at once, so
+    that arrays of temperatures, such as those logged by temperature
+    controllers, are converted efficiently.
+
+    :param temperature: A quantity with units of Kelvin, Celsius, or
+        Fahrenheit. Raw values are assumed to be in Celsius.
+    :type temperature: `quantities.Quantity`, `float` or `numpy.ndarray`
     :param base: A temperature unit to convert to
     :type base: `unitquantity.UnitTemperature`
 
     :return: The converted temperature
     :rtype: `quantities.Quantity`
     """
-    # quantities reports equivalence between degC and degK, so a string
-    # comparison is needed
     newval = assume_units(temperature, pq.degC)
-    if newval.units == pq.degF and str(base).split(" ")[1] == 'degC':
-        return_val = ((newval.magnitude - 32.0) * 5.0 / 9.0) * base
-    elif str(newval.units).split(" ")[1] == 'K' and str(base).split(" ")[1] == 'degC':
-        return_val = (newval.magnitude - 273.15) * base
-    elif str(newval.units).split(" ")[1] == 'K' and base == pq.degF:
-        return_val = (newval.magnitude / 1.8 - 459 / 57) * base
-    elif str(newval.units).split(" ")[1] == 'degC' and base == pq.degF:
-        return_val = (newval.magnitude * 9.0 / 5.0 + 32.0) * base
-    elif newval.units == pq.degF and str(base).split(" ")[1] == 'K':
-        return_val = ((newval.magnitude + 459.57) * 5.0 / 9.0) * base
-    elif str(newval.units).split(" ")[1] == 'degC' and str(base).split(" ")[1] == 'K':
-        return_val = (newval.magnitude + 273.15) * base
-    elif str(newval.units).split(" ")[1] == 'degC' and str(base).split(" ")[1] == 'degC':
-        return_val = newval
-    elif newval.units == pq.degF and base == pq.degF:
-        return_val = newval
-    elif str(newval.units).split(" ")[1] == 'K' and str(base).split(" ")[1] == 'K':
-        return_val = newval
-    else:
+    # quantities reports equivalence between degC and degK, so the units
+    # are identified by their symbols instead.
+    from_units = newval.dimensionality.string
+    to_units = lookup_units(base).dimensionality.string
+    if from_units == to_units and from_units in _TEMPERATURE_UNITS:
+        return newval
+    try:
+        conversion = _TEMPERATURE_CONVERSIONS[from_units, to_units]
+    except KeyError:
         raise ValueError(
             "Unable to convert " + str(newval.units) + " to " + str(base))
-    return return_val
+    return conversion(newval.magnitude) * base
 
 
 def split_unit_str(s, default_units=pq.dimensionless, lookup=None):
@@ -102,33 +217,104 @@ def split_unit_str(s, default_units=pq.dimensionless, lookup=None):
         Lookups are never performed on the default units.
     :rtype: `tuple` of a `float` and a `str` or `pq.Quantity`
     """
-    if lookup is None:
-        lookup = lambda x: x
-
-    # Borrowed from:
-    # http://stackoverflow.com/questions/430079/how-to-split-strings-into-text-and-number
-    # Reg exp tweaked on May 30, 2015 by scasagrande to match on input with
-    # scientific notation. General flow borrowed from:
-    # http://www.regular-expressions.info/floatingpoint.html
-    regex = r"([-+]?[0-9]*\.?[0-9]+)([eE][-+]?[0-9]+)?\s*([a-z]+)?"
-    match = re.match(regex, str(s).strip(), re.I)
-    if match:
-        if match.groups()[1] is None:
-            val, _, units = match.groups()
-        else:
-            val = float(match.groups()[0]) * 10**float(match.groups()[1][1:])
-            units = match.groups()[2]
-
-        if units is None:
-            return float(val), default_units
-        else:
-            return float(val), lookup(units)
+    try:
+        # Fast path for the common case of a bare number.
+        return float(s), default_units
+    except ValueError:
+        pass
+
+    match = _UNIT_STR_REGEX.match(str(s).strip())
+    if match is None:
+        raise ValueError("Could not split '{}' into value "
+                         "and units.".format(repr(s)))
+
+    mantissa, exponent, units = match.groups()
+    if exponent is None:
+        val = float(mantissa)
     else:
-        try:
-            return float(s), default_units
-        except ValueError:
-            raise ValueError("Could not split '{}' into value "
+        val = float(mantissa) * 10**float(exponent[1:])
+
+    if units is None:
+        return val, default_units
+    elif lookup is None:
+        return val, units
+    return val, lookup(units)
+
+
+def split_unit_str_list(s, default_units=pq.dimensionless, lookup=None,
+                        sep=","):
+    """
+    Given a string of separated values, each of the form accepted by
+    `split_unit_str`, such as "1 mV,2 mV,3.5 mV", returns a tuple of an array
+    of the numeric parts and the unit part. Where the values are given in
+    differing units, all are rescaled to the units of the first value.
+
+    Values given without units are taken to be in ``default_units``. If no
+    default units are given, they are instead taken to be in the units of
+    the first value which has units, so that "1,2 mV" is read as
+    ``[1, 2] * mV``.
+
+    Unless every value is a bare number, the string is split by a single
+    scan with a precompiled regular expression rather than by parsing each
+    value separately.
+
+    As with `split_unit_str`, the tuple can be unpacked into
+    :func:`pq.Quantity`::
+
+        >>> pq.Quantity(*split_unit_str_list("1 s, 2 s"))
+        array([1., 2.]) * s
+
+    :param str s: Input string that will be split up
+    :param default_units: If no units are specified, this argument is given
+        as the units.
+    :param callable lookup: If specified, this function is called on the
+        units part of each value. If `None`, no lookup is performed.
+    :param str sep: Separator between values in ``s``.
+    :rtype: `tuple` of a `numpy.ndarray` and a `str` or `pq.Quantity`
+    """
+    s = str(s)
+    try:
+        # Fast path for the common case of bare numbers.
+        return np.array([float(item) for item in s.split(sep)]), \
+            default_units
+    except ValueError:
+        pass
+
+    values = []
+    unit_strs = []
+    pos = 0
+    while True:
+        match = _UNIT_LIST_ITEM_REGEX.match(s, pos)
+        if match is None or (match.end() < len(s) and
+                              not s.startswith(sep, match.end())):
+            raise ValueError("Could not split '{}' into values "
                              "and units.".format(repr(s)))
+        values.append(float(match.group(1)))
+        unit_strs.append(match.group(2))
+        pos = match.end() + len(sep)
+        if match.end() == len(s):
+            break
+
+    bare_units = default_units
+    if default_units is pq.dimensionless:
+        bare_units = next(
+            (unit for unit in unit_strs if unit is not None), default_units
+        )
+        if lookup is not None and bare_units is not default_units:
+            bare_units = lookup(bare_units)
+    item_units = [
+        bare_units if unit is None else
+        unit if lookup is None else lookup(unit)
+        for unit in unit_strs
+    ]
+    units = item_units[0]
+    if any(unit != units for unit in item_units[1:]):
+        target = lookup_units(units)
+        values = [
+            pq.Quantity(value, lookup_units(unit)).rescale(target).magnitude
+            for value, unit in zip(values, item_units)
+        ]
+    return np.array(values, dtype=float), units
 
 
 def rproperty(fget=None, fset=None, doc=None, readonly=False, writeonly=False):
@@ -153,8 +339,125 @@ def rproperty(fget=None, fset=None, doc=None, readonly=False, writeonly=False):
         return property(fget=fget, fset=fset, doc=doc)
 
 
+def _identity(val):
+    return val
+
+
+def _resolve_decoration(decoration):
+    """
+    Resolves an input or output decoration passed to a property factory
+    into a plain callable once, at class creation time, rather than on every
+    access. Decorations given as `staticmethod` objects (as happens when the
+    decoration is defined in the body of the class using the factory) are
+    unwrapped, and `None` is replaced by the identity function.
+    """
+    if decoration is None:
+        return _identity
+    elif hasattr(decoration, "__get__"):
+        return decoration.__get__(None, object)
+    return decoration
+
+
+def _owning_instrument(obj):
+    """
+    Returns the instrument owning ``obj``, following the parents of proxy
+    objects created by `ProxyList`. Any other object is returned as is.
+    """
+    # pylint: disable=protected-access
+    while hasattr(obj, "_proxy_owner"):
+        obj = obj._proxy_owner
+    return obj
+
+
+def _quantity_getter(fget, units):
+    """
+    Wraps a getter returning a bare magnitude such that it returns a
+    `~quantities.Quantity` in ``units``, unless the instrument it is called on
+    (or which owns the channel it is called on) is in raw numeric mode. The
+    units are exposed as the ``units`` attribute of the returned getter.
+    """
+    def _getter(self):
+        value = fget(self)
+        if getattr(_owning_instrument(self), "_raw_numeric", False):
+            return value
+        return pq.Quantity(value, units)
+
+    _getter.units = units
+    return _getter
+
+
+def _cached_rproperty(name, fget, fset, doc, readonly, writeonly, cache,
+                      units=None):
+    """
+    Creates a property as `rproperty` does, where the getter and setter
+    generated by a property factory are wrapped to use the
+    `PropertyCache` of the instrument they are called on.
+
+    The setter ``fset`` must not send anything to the instrument. Instead,
+    it returns a tuple of the command to be sent, and the value that the
+    getter would return after that command has been sent. It is also called
+    with values read by the getter, to find the command which would set them.
+
+    If ``units`` is given, ``fget`` and ``fset`` deal in bare magnitudes in
+    those units, which are only made unitful by the getter of the returned
+    property.
+    """
+    if cache is None:
+        cache = CacheMode.volatile if readonly or writeonly \
+            else CacheMode.settable
+    cache = CacheMode(cache)
+
+    if cache is CacheMode.volatile:
+        def _volatile_setter(self, newval):
+            self.sendcmd(fset(self, newval)[0])
+
+        if units is not None:
+            fget = _quantity_getter(fget, units)
+        fget.cache_key = name
+        return rproperty(fget=fget, fset=_volatile_setter, doc=doc,
+                         readonly=readonly, writeonly=writeonly)
+
+    def _getter(self):
+        property_cache = getattr(self, "_property_cache", None)
+        if property_cache is None or not property_cache.tracks(name):
+            return fget(self)
+        if property_cache.caches(name):
+            try:
+                return property_cache.lookup(name)
+            except KeyError:
+                pass
+        value = fget(self)
+        # Record the command that would set the value read, so that writing
+        # the same value back can be suppressed.
+        try:
+            cmd = fset(self, value)[0]
+        except (TypeError, ValueError):
+            cmd = None
+        property_cache.update(name, value, cache, cmd)
+        return value
+
+    def _setter(self, newval):
+        cmd, value = fset(self, newval)
+        property_cache = getattr(self, "_property_cache", None)
+        if property_cache is None or not property_cache.tracks(name):
+            self.sendcmd(cmd)
+            return
+        if property_cache.suppress_writes and \
+                property_cache.last_command(name) == cmd:
+            property_cache.suppressed_writes += 1
+            return
+        self.sendcmd(cmd)
+        property_cache.update(name, value, cache, cmd)
+
+    if units is not None:
+        _getter = _quantity_getter(_getter, units)
+    _getter.cache_key = name
+    return rproperty(fget=_getter, fset=_setter, doc=doc, readonly=readonly,
+                     writeonly=writeonly)
+
+
 def bool_property(name, inst_true, inst_false, doc=None, readonly=False,
-                  writeonly=False, set_fmt="{} {}"):
+                  writeonly=False, set_fmt="{} {}", cache=None):
     """
     Called inside of SCPI classes to instantiate boolean properties
     of the device cleanly.
@@ -176,24 +479,32 @@ def bool_property(name, inst_true, inst_false, doc=None, readonly=False,
         non-query to the instrument. The default is "{} {}" which places a
         space between the SCPI command the associated parameter. By switching
         to "{}={}" an equals sign would instead be used as the separator.
+    :param cache: How values of this property may be cached when the
+        instrument's `PropertyCache` is enabled. The default of `None` caches
+        properties that have both a getter and a setter as
+        `CacheMode.settable`, and never caches read- or write-only
+        properties.
+    :type cache: `CacheMode` or `None`
     """
 
+    query_str = "{}?".format(name)
+
     def _getter(self):
-        return self.query(name + "?").strip() == inst_true
+        return self.query(query_str).strip() == inst_true
 
-    def _setter(self, newval):
+    def _setter(_self, newval):
         if not isinstance(newval, bool):
             raise TypeError("Bool properties must be specified with a "
                             "boolean value")
-        self.sendcmd(set_fmt.format(name, inst_true if newval else inst_false))
+        return set_fmt.format(name, inst_true if newval else inst_false), newval
 
-    return rproperty(fget=_getter, fset=_setter, doc=doc, readonly=readonly,
-                     writeonly=writeonly)
+    return _cached_rproperty(name, _getter, _setter, doc, readonly, writeonly,
+                             cache)
 
 
 def enum_property(name, enum, doc=None, input_decoration=None,
                   output_decoration=None, readonly=False, writeonly=False,
-                  set_fmt="{} {}"):
+                  set_fmt="{} {}", cache=None):
     """
     Called inside of SCPI classes to instantiate Enum properties
     of the device cleanly.
@@ -218,25 +529,21 @@ def enum_property(name, enum, doc=None, input_decoration=None,
         non-query to the instrument. The default is "{} {}" which places a
         space between the SCPI command the associated parameter. By switching
         to "{}={}" an equals sign would instead be used as the separator.
+    :param cache: How values of this property may be cached when the
+        instrument's `PropertyCache` is enabled. The default of `None` caches
+        properties that have both a getter and a setter as
+        `CacheMode.settable`, and never caches read- or write-only
+        properties.
+    :type cache: `CacheMode` or `None`
     """
-    def _in_decor_fcn(val):
-        if input_decoration is None:
-            return val
-        elif hasattr(input_decoration, "__get__"):
-            return input_decoration.__get__(None, object)(val)
-        return input_decoration(val)
-
-    def _out_decor_fcn(val):
-        if output_decoration is None:
-            return val
-        elif hasattr(output_decoration, "__get__"):
-            return output_decoration.__get__(None, object)(val)
-        return output_decoration(val)
+    _in_decor_fcn = _resolve_decoration(input_decoration)
+    _out_decor_fcn = _resolve_decoration(output_decoration)
+    query_str = "{}?".format(name)
 
     def _getter(self):
-        return enum(_in_decor_fcn(self.query("{}?".format(name)).strip()))
+        return enum(_in_decor_fcn(self.query(query_str).strip()))
 
-    def _setter(self, newval):
+    def _setter(_self, newval):
         try:  # First assume newval is Enum.value
             newval = enum[newval]
         except KeyError:  # Check if newval is Enum.name instead
@@ -244,14 +551,15 @@ def enum_property(name, enum, doc=None, input_decoration=None,
                 newval = enum(newval)
             except ValueError:
                 raise ValueError("Enum property new value not in enum.")
-        self.sendcmd(set_fmt.format(name, _out_decor_fcn(enum(newval).value)))
+        newval = enum(newval)
+        return set_fmt.format(name, _out_decor_fcn(newval.value)), newval
 
-    return rproperty(fget=_getter, fset=_setter, doc=doc, readonly=readonly,
-                     writeonly=writeonly)
+    return _cached_rproperty(name, _getter, _setter, doc, readonly, writeonly,
+                             cache)
 
 
 def unitless_property(name, format_code='{:e}', doc=None, readonly=False,
-                      writeonly=False, set_fmt="{} {}"):
+                      writeonly=False, set_fmt="{} {}", cache=None):
     """
     Called inside of SCPI classes to instantiate properties with unitless
     numeric values.
@@ -268,27 +576,33 @@ def unitless_property(name, format_code='{:e}', doc=None, readonly=False,
         non-query to the instrument. The default is "{} {}" which places a
         space between the SCPI command the associated parameter. By switching
         to "{}={}" an equals sign would instead be used as the separator.
+    :param cache: How values of this property may be cached when the
+        instrument's `PropertyCache` is enabled. The default of `None` caches
+        properties that have both a getter and a setter as
+        `CacheMode.settable`, and never caches read- or write-only
+        properties.
+    :type cache: `CacheMode` or `None`
     """
+    query_str = "{}?".format(name)
 
     def _getter(self):
-        raw = self.query("{}?".format(name))
-        return float(raw)
+        return float(self.query(query_str))
 
-    def _setter(self, newval):
+    def _setter(_self, newval):
         if isinstance(newval, pq.Quantity):
             if newval.units == pq.dimensionless:
                 newval = float(newval.magnitude)
             else:
                 raise ValueError
         strval = format_code.format(newval)
-        self.sendcmd(set_fmt.format(name, strval))
+        return set_fmt.format(name, strval), float(newval)
 
-    return rproperty(fget=_getter, fset=_setter, doc=doc, readonly=readonly,
-                     writeonly=writeonly)
+    return _cached_rproperty(name, _getter, _setter, doc, readonly, writeonly,
+                             cache)
 
 
 def int_property(name, format_code='{:d}', doc=None, readonly=False,
-                 writeonly=False, valid_set=None, set_fmt="{} {}"):
+                 writeonly=False, valid_set=None, set_fmt="{} {}", cache=None):
     """
     Called inside of SCPI classes to instantiate properties with unitless
     numeric values.
@@ -307,33 +621,40 @@ def int_property(name, format_code='{:d}', doc=None, readonly=False,
         non-query to the instrument. The default is "{} {}" which places a
         space between the SCPI command the associated parameter. By switching
         to "{}={}" an equals sign would instead be used as the separator.
+    :param cache: How values of this property may be cached when the
+        instrument's `PropertyCache` is enabled. The default of `None` caches
+        properties that have both a getter and a setter as
+        `CacheMode.settable`, and never caches read- or write-only
+        properties.
+    :type cache: `CacheMode` or `None`
     """
+    query_str = "{}?".format(name)
 
     def _getter(self):
-        raw = self.query("{}?".format(name))
-        return int(raw)
+        return int(self.query(query_str))
+
     if valid_set is None:
-        def _setter(self, newval):
+        def _setter(_self, newval):
             strval = format_code.format(newval)
-            self.sendcmd(set_fmt.format(name, strval))
+            return set_fmt.format(name, strval), newval
     else:
-        def _setter(self, newval):
+        def _setter(_self, newval):
             if newval not in valid_set:
                 raise ValueError(
                     "{} is not an allowed value for this property; "
                     "must be one of {}.".format(newval, valid_set)
                 )
             strval = format_code.format(newval)
-            self.sendcmd(set_fmt.format(name, strval))
+            return set_fmt.format(name, strval), newval
 
-    return rproperty(fget=_getter, fset=_setter, doc=doc, readonly=readonly,
-                     writeonly=writeonly)
+    return _cached_rproperty(name, _getter, _setter, doc, readonly, writeonly,
+                             cache)
 
 
 def unitful_property(name, units, format_code='{:e}', doc=None,
                      input_decoration=None, output_decoration=None,
                      readonly=False, writeonly=False, set_fmt="{} {}",
-                     valid_range=(None, None)):
+                     valid_range=(None, None), cache=None):
     """
     Called inside of SCPI classes to instantiate properties with unitful numeric
     values. This function assumes that the instrument only accepts
@@ -366,24 +687,33 @@ def unitful_property(name, units, format_code='{:e}', doc=None,
         range. The default of `(None, None)` has no min or max constraints.
         The valid set is inclusive of the values provided.
     :type valid_range: `tuple` or `list` of `int` or `float`
+    :param cache: How values of this property may be cached when the
+        instrument's `PropertyCache` is enabled. The default of `None` caches
+        properties that have both a getter and a setter as
+        `CacheMode.settable`, and never caches read- or write-only
+        properties.
+    :type cache: `CacheMode` or `None`
+
+    When the instrument is in raw numeric mode (see
+    `~instruments.Instrument.raw_numeric`), the getter returns the bare
+    magnitude in ``units`` as a `float`.
     """
-    def _in_decor_fcn(val):
-        if input_decoration is None:
-            return val
-        elif hasattr(input_decoration, "__get__"):
-            return input_decoration.__get__(None, object)(val)
-        return input_decoration(val)
-
-    def _out_decor_fcn(val):
-        if output_decoration is None:
-            return val
-        elif hasattr(output_decoration, "__get__"):
-            return output_decoration.__get__(None, object)(val)
-        return output_decoration(val)
+    _in_decor_fcn = _resolve_decoration(input_decoration)
+    _out_decor_fcn = _resolve_decoration(output_decoration)
+    query_str = "{}?".format(name)
+    units = lookup_units(units)
 
     def _getter(self):
-        raw = _in_decor_fcn(self.query("{}?".format(name)))
-        return pq.Quantity(*split_unit_str(raw, units)).rescale(units)
+        raw = _in_decor_fcn(self.query(query_str))
+        # Most instruments reply with a bare number, which can be used
+        # directly without parsing for and rescaling from other units.
+        try:
+            return float(raw)
+        except ValueError:
+            value, unit = split_unit_str(raw, units)
+            return float(
+                pq.Quantity(value, lookup_units(unit)).rescale(units)
+            )
 
     def _setter(self, newval):
         min_value, max_value = valid_range
@@ -401,12 +731,12 @@ def unitful_property(name, units, format_code='{:e}', doc=None,
                                  " value is {}".format(newval, max_value))
         # Rescale to the correct unit before printing. This will also
         # catch bad units.
-        strval = format_code.format(
-            assume_units(newval, units).rescale(units).item())
-        self.sendcmd(set_fmt.format(name, _out_decor_fcn(strval)))
+        newval = assume_units(newval, units).rescale(units).item()
+        strval = format_code.format(newval)
+        return set_fmt.format(name, _out_decor_fcn(strval)), newval
 
-    return rproperty(fget=_getter, fset=_setter, doc=doc, readonly=readonly,
-                     writeonly=writeonly)
+    return _cached_rproperty(name, _getter, _setter, doc, readonly, writeonly,
+                             cache, units)
 
 
 def bounded_unitful_property(name, units, min_fmt_str="{}:MIN?",
@@ -472,7 +802,7 @@ def bounded_unitful_property(name, units, min_fmt_str="{}:MIN?",
 
 
 def string_property(name, bookmark_symbol='"', doc=None, readonly=False,
-                    writeonly=False, set_fmt="{} {}{}{}"):
+                    writeonly=False, set_fmt="{} {}{}{}", cache=None):
     """
     Called inside of SCPI classes to instantiate properties with a string value.
 
@@ -488,21 +818,28 @@ def string_property(name, bookmark_symbol='"', doc=None, readonly=False,
         the bookmark symbols on either side of the parameter.
     :param str bookmark_symbol: The symbol that will flank both sides of the
         parameter to be sent to the instrument. By default this is ``"``.
+    :param cache: How values of this property may be cached when the
+        instrument's `PropertyCache` is enabled. The default of `None` caches
+        properties that have both a getter and a setter as
+        `CacheMode.settable`, and never caches read- or write-only
+        properties.
+    :type cache: `CacheMode` or `None`
     """
     bookmark_length = len(bookmark_symbol)
+    query_str = "{}?".format(name)
 
     def _getter(self):
-        string = self.query("{}?".format(name))
+        string = self.query(query_str)
         string = string[
             bookmark_length:-bookmark_length] if bookmark_length > 0 else string
         return string
 
-    def _setter(self, newval):
-        self.sendcmd(
-            set_fmt.format(name, bookmark_symbol, newval, bookmark_symbol))
+    def _setter(_self, newval):
+        return set_fmt.format(
+            name, bookmark_symbol, newval, bookmark_symbol), newval
 
-    return rproperty(fget=_getter, fset=_setter, doc=doc, readonly=readonly,
-                     writeonly=writeonly)
+    return _cached_rproperty(name, _getter, _setter, doc, readonly, writeonly,
+                             cache)
 
 # CLASSES #####################################################################
 
@@ -527,12 +864,25 @@ class ProxyList(object):
     :param valid_set: The set of valid keys by which the proxy class objects
         are accessed. Typically this is something like `range`, but can be
         any generator, list, enum, etc.
+    :param bool cache: If `True`, each proxy object is constructed only once
+        per parent and key, and reused on later accesses, even through other
+        `ProxyList` instances. This is useful for proxy classes which are
+        expensive to construct, such as those querying the instrument in
+        ``__init__``, or which hold state of their own. If `None`, the
+        ``cache_proxy`` attribute of ``proxy_cls`` is used, so that proxy
+        classes can declare themselves as cacheable. Proxy classes without
+        that attribute are cheap, and are constructed on every access.
+        Cached proxy objects are kept in the ``proxy_instances`` dictionary
+        of the parent, see `~instruments.Instrument.proxy_instances`.
     """
 
-    def __init__(self, parent, proxy_cls, valid_set):
+    def __init__(self, parent, proxy_cls, valid_set, cache=None):
         self._parent = parent
         self._proxy_cls = proxy_cls
         self._valid_set = valid_set
+        if cache is None:
+            cache = getattr(proxy_cls, "cache_proxy", False)
+        self._cache = cache
 
         # FIXME: This only checks the next level up the chain!
         if hasattr(valid_set, '__bases__'):
@@ -541,9 +891,46 @@ class ProxyList(object):
         else:
             self._isenum = False
 
+    def _new_proxy(self, idx):
+        proxy = self._proxy_cls(self._parent, idx)
+        # Record the parent, so that properties of the proxy can follow the
+        # settings of the instrument, such as raw numeric mode.
+        # pylint: disable=protected-access
+        proxy._proxy_owner = self._parent
+        return proxy
+
+    def _get_proxy(self, idx):
+        if not self._cache:
+            return self._new_proxy(idx)
+        proxies = self._parent.proxy_instances
+        key = (self._proxy_cls, idx.value if isinstance(idx, Enum) else idx)
+        try:
+            return proxies[key]
+        except KeyError:
+            proxy = self._new_proxy(idx)
+            proxies[key] = proxy
+            return proxy
+
+    def invalidate(self, idx=None):
+        """
+        Discards cached proxy objects, so that they are constructed again
+        the next time they are accessed.
+
+        :param idx: Key of the proxy object to discard. If `None`, all cached
+            proxy objects of this list are discarded.
+        """
+        proxies = self._parent.proxy_instances
+        if idx is None:
+            for key in [key for key in proxies if key[0] is self._proxy_cls]:
+                del proxies[key]
+        else:
+            if isinstance(idx, Enum):
+                idx = idx.value
+            proxies.pop((self._proxy_cls, idx), None)
+
     def __iter__(self):
         for idx in self._valid_set:
-            yield self._proxy_cls(self._parent, idx)
+            yield self._get_proxy(idx)
 
     def __getitem__(self, idx):
         # If we have an enum, try to normalize by using getitem. This will
@@ -565,7 +952,7 @@ class ProxyList(object):
             if idx not in self._valid_set:
                 raise IndexError("Index out of range. Must be "
                                  "in {}.".format(self._valid_set))
-        return self._proxy_cls(self._parent, idx)
+        return self._get_proxy(idx)
 
     def __len__(self):
         return len(self._valid_set)